@@ -0,0 +1,12 @@
+"""
+Benchmarks for the asm68 assembler.
+
+Run individual benchmarks as modules from the root of the repository, for example:
+
+    python -m benchmarks.dispatch
+
+The suite of end-to-end benchmarks, with results saved for comparison across
+commits, is run with:
+
+    python -m benchmarks.suite --output results.json --baseline baseline.json
+"""
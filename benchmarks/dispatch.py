@@ -0,0 +1,56 @@
+"""
+Micro-benchmark comparing precompiled opcode dispatch with dynamic dispatch,
+and with the reuse of the code of label-free instructions.
+
+Usage:
+    python -m benchmarks.dispatch [num-statements]
+"""
+import sys
+from time import perf_counter
+
+from asm68.asmdsl import statements
+from asm68.assembler import Assembler, assemble_instruction, encode_instruction, encode_instruction_dynamically
+from benchmarks.workloads import mixed
+
+DEFAULT_NUM_STATEMENTS = 0x3FEC  # Roughly the size of examples/top_16k_nopper.py
+
+
+def instructions_per_second(handler, program, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        asm = Assembler()
+        asm.assemble(program[:1])
+        start = perf_counter()
+        for statement in program:
+            handler(statement, asm)
+        best = min(best, perf_counter() - start)
+    return len(program) / best
+
+
+def assemble_instruction_dynamically(statement, asm):
+    asm._extend(encode_instruction_dynamically(statement, asm))
+
+
+def assemble_instruction_compiled(statement, asm):
+    asm._extend(encode_instruction(statement, asm))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    num_statements = int(argv[0]) if argv else DEFAULT_NUM_STATEMENTS
+    # The AsmDsl must be kept alive while its statements are assembled
+    asm = mixed(num_statements)
+    program = statements(asm)
+    before = instructions_per_second(assemble_instruction_dynamically, program)
+    after = instructions_per_second(assemble_instruction_compiled, program)
+    reused = instructions_per_second(assemble_instruction, program)
+    print(f"Statements:         {len(program)}")
+    print(f"Dynamic dispatch:   {before:12,.0f} instructions/s")
+    print(f"Compiled dispatch:  {after:12,.0f} instructions/s")
+    print(f"Speed-up:           {after / before:12.2f}x")
+    print(f"With reuse:         {reused:12,.0f} instructions/s")
+    print(f"Speed-up:           {reused / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark of the memory occupied by the statements of a large program.
+
+Usage:
+    python -m benchmarks.memory [num-statements]
+"""
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.workloads import mixed
+
+DEFAULT_NUM_STATEMENTS = 100_000
+
+
+def traced_bytes(build):
+    """The number of bytes allocated by build() which are still alive after it returns.
+
+    Returns:
+        A pair containing the result of build() and the number of bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    num_statements = int(argv[0]) if argv else DEFAULT_NUM_STATEMENTS
+    asm, num_bytes = traced_bytes(lambda: mixed(num_statements))
+    print(f"Statements:          {len(asm.program):12,}")
+    print(f"Memory:              {num_bytes:12,} bytes")
+    print(f"Memory per statement:{num_bytes / len(asm.program):12,.1f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Benchmark suite for the assembler hot paths.
+
+Each workload in benchmarks.workloads is built with AsmDsl, assembled, and its
+object code exported in each supported format, timing each stage. Results are
+saved as JSON so that they can be compared against a baseline saved from an
+earlier commit.
+
+Usage:
+    python -m benchmarks.suite [--output results.json] [--baseline baseline.json]
+                               [--repeats N] [--workload NAME ...] [--threshold FRACTION]
+                               [--backpatch]
+"""
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from statistics import median
+from time import perf_counter
+
+from asm68 import api
+from asm68.assembler import Assembler
+from asm68.version import __version__
+
+from benchmarks.workloads import WORKLOADS
+
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.10
+
+
+def timings(func, repeats):
+    """Call a function repeatedly, timing each call.
+
+    Returns:
+        A pair containing the result of the final call and a list of durations in seconds.
+    """
+    durations = []
+    result = None
+    for _ in range(repeats):
+        start = perf_counter()
+        result = func()
+        durations.append(perf_counter() - start)
+    return result, durations
+
+
+def summarise(durations):
+    return {
+        "min": min(durations),
+        "median": median(durations),
+        "repeats": len(durations),
+    }
+
+
+def assemble(program, backpatch=False):
+    asm = Assembler(backpatch=backpatch)
+    asm.assemble(program)
+    return asm
+
+
+def export(code_blocks, output_format):
+    output_file = io.BytesIO()
+    api.export_code_blocks(output_file, code_blocks, output_format, 1)
+    return output_file
+
+
+def run_workload(build, repeats, backpatch=False):
+    """Time each stage of assembling and exporting a workload.
+
+    Args:
+        build: A callable which returns an AsmDsl.
+        repeats: The number of times each stage is timed.
+        backpatch: If True, forward references are patched in place during assembly.
+
+    Returns:
+        A dictionary with the size of the workload and a summary of the timings of each stage.
+    """
+    def construct():
+        asm = build()
+        return asm, asm.program
+
+    # The AsmDsl must be kept alive while its statements are assembled
+    (dsl, program), construct_durations = timings(construct, repeats)
+    asm, assemble_durations = timings(lambda: assemble(program, backpatch), repeats)
+    code_blocks, object_code_durations = timings(asm.object_code, repeats)
+    stages = {
+        "construct": summarise(construct_durations),
+        "assemble": summarise(assemble_durations),
+        "object_code": summarise(object_code_durations),
+    }
+    for output_format in api.EXPORTERS:
+        _, export_durations = timings(lambda: export(code_blocks, output_format), repeats)
+        stages[f"export_{output_format}"] = summarise(export_durations)
+    return {
+        "statements": len(program),
+        "passes": len(asm.encoded_statement_counts),
+        "bytes": sum(len(block) for block in code_blocks.values()),
+        "blocks": len(code_blocks),
+        "stages": stages,
+    }
+
+
+def run(workload_names, repeats, backpatch=False):
+    return {
+        "metadata": metadata(),
+        "workloads": {name: run_workload(WORKLOADS[name], repeats, backpatch) for name in workload_names},
+    }
+
+
+def metadata():
+    return {
+        "asm68_version": __version__,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def git_commit():
+    """The commit hash of the working tree, or None if it cannot be determined."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def compare(results, baseline, threshold):
+    """Compare the median timings of each stage of each workload against a baseline.
+
+    Args:
+        results: Results produced by run().
+        baseline: Results produced by run() at some earlier time.
+        threshold: The fractional slow-down beyond which a stage is considered
+            to have regressed.
+
+    Returns:
+        A list of (workload, stage, baseline median, median, ratio, regressed) tuples
+        for the stages present in both results and baseline.
+    """
+    rows = []
+    for name, workload in results["workloads"].items():
+        baseline_workload = baseline["workloads"].get(name)
+        if baseline_workload is None:
+            continue
+        for stage, summary in workload["stages"].items():
+            baseline_summary = baseline_workload["stages"].get(stage)
+            if baseline_summary is None:
+                continue
+            before = baseline_summary["median"]
+            after = summary["median"]
+            ratio = after / before if before > 0 else float("inf")
+            rows.append((name, stage, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def print_results(results, file=sys.stdout):
+    for name, workload in results["workloads"].items():
+        print(
+            f"{name}: {workload['statements']} statements, {workload['passes']} passes, "
+            f"{workload['bytes']} bytes in {workload['blocks']} blocks",
+            file=file,
+        )
+        for stage, summary in workload["stages"].items():
+            print(f"  {stage:<12} {summary['median'] * 1e3:10.3f} ms", file=file)
+
+
+def print_comparison(rows, file=sys.stdout):
+    for name, stage, before, after, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:<22} {stage:<12} {before * 1e3:10.3f} ms -> {after * 1e3:10.3f} ms {ratio:6.2f}x{flag}",
+            file=file,
+        )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="Path of a JSON file to which results are saved")
+    parser.add_argument("--baseline", help="Path of a JSON file of earlier results to compare against")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Number of timings of each stage")
+    parser.add_argument(
+        "--workload",
+        action="append",
+        choices=sorted(WORKLOADS),
+        help="Workload to run. May be given more than once. Defaults to all workloads.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fractional slow-down relative to the baseline reported as a regression",
+    )
+    parser.add_argument(
+        "--backpatch",
+        action="store_true",
+        help="Patch forward references in place, rather than assembling again",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    results = run(args.workload or list(WORKLOADS), args.repeats, args.backpatch)
+    print_results(results)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare(results, baseline, args.threshold)
+        print()
+        print_comparison(rows)
+        if any(regressed for *_, regressed in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Reproducible generated programs for benchmarking the assembler.
+
+Each workload is a function which builds and returns an AsmDsl. Programs are
+generated deterministically, so timings are comparable between runs and
+across commits.
+"""
+from asm68.asmdsl import AsmDsl
+from asm68.mnemonics import (
+    NOP, LDA, STA, LDX, CMPA, BNE, LBNE, LBRA, JMP, JSR, ADDB, CLRB, RTS, ORG, FCB, FDB,
+)
+from asm68.registers import X
+
+ORG_SECTION_SPACING = 0x40
+
+
+def mixed(num_statements):
+    """Straight-line code using a mix of addressing modes, with backward branches only."""
+    asm = AsmDsl()
+    asm .BEGIN  (   LDX,    0x4000                  )
+    for i in range(1, num_statements, 8):
+        loop = getattr(asm, f"LOOP{i}")
+        shapes = (
+            (NOP,),
+            (LDA,   0x41),
+            (STA,   {0x42}),
+            (CMPA,  {0:X+1}),
+            (LBNE,  loop),
+            (ADDB,  {0x1234}),
+            (CLRB,),
+            (JMP,   {asm.BEGIN}),
+        )
+        loop(*shapes[0])
+        for shape in shapes[1:min(8, num_statements - i)]:
+            asm(*shape)
+    return asm
+
+
+def nops(num_statements=0x10000):
+    """One-byte instructions filling the address space, producing a full 64 K image."""
+    asm = AsmDsl()
+    asm .BEGIN  (   NOP     )
+    for _ in range(1, num_statements):
+        asm     (   NOP     )
+    return asm
+
+
+def repeated_nops(num_statements=0x10000):
+    """As nops(), but built with a single bulk call."""
+    asm = AsmDsl()
+    asm .BEGIN  (   NOP     )
+    asm.repeat(num_statements - 1, NOP)
+    return asm
+
+
+def forward_branches(num_statements):
+    """Branch-heavy code in which every branch, jump and label load refers forwards.
+
+    None of the targets are known on the first pass, so all the passes of the
+    assembler are exercised.
+    """
+    asm = AsmDsl()
+    num_blocks = (num_statements - 2) // 7
+    for i in range(num_blocks):
+        target = f"TARGET{i}"
+        asm     (   LDX,    getattr(asm, target)        )
+        asm     (   CMPA,   {0:X}                       )
+        asm     (   LBNE,   getattr(asm, target)        )
+        asm     (   JSR,    {getattr(asm, f"SUB{i}")}   )
+        asm     (   LBRA,   asm.END                     )
+    for i in range(num_blocks):
+        following = getattr(asm, f"TARGET{i + 1}") if i + 1 < num_blocks else asm.RETURN
+        getattr(asm, f"TARGET{i}")  (   NOP                 )
+        getattr(asm, f"SUB{i}")     (   BNE,    following   )
+    for _ in range(num_statements - 7 * num_blocks - 2):
+        asm     (   NOP     )
+    asm .RETURN (   RTS     )
+    asm .END    (   NOP     )
+    return asm
+
+
+def data_tables(num_statements, fcb_length=16, fdb_length=8):
+    """Alternating FCB byte tables and FDB word tables, the latter including label references."""
+    asm = AsmDsl()
+    for i in range(num_statements // 2):
+        getattr(asm, f"BYTES{i}")(FCB, tuple((i + j) & 0xFF for j in range(fcb_length)))
+        words = tuple((i * j) & 0xFFFF for j in range(fdb_length - 1))
+        asm(FDB, words + (getattr(asm, f"BYTES{i}"),))
+    return asm
+
+
+def lookup_tables(num_tables, fdb_length=2048, fcb_length=1024):
+    """Large label-free FDB word tables and FCB byte tables, such as ROM lookup tables."""
+    asm = AsmDsl()
+    for i in range(num_tables):
+        getattr(asm, f"WORDS{i}")(FDB, tuple((j * 37 + i) & 0xFFFF for j in range(fdb_length)))
+        getattr(asm, f"BYTES{i}")(FCB, tuple((j * 7 + i) & 0xFF for j in range(fcb_length)))
+    return asm
+
+
+def many_org(num_sections, spacing=ORG_SECTION_SPACING):
+    """Many short sections, each placed with ORG, spread across the address space."""
+    asm = AsmDsl()
+    for i in range(num_sections):
+        origin = i * spacing
+        section = getattr(asm, f"SECTION{i}")
+        asm         (   ORG,    origin                  )
+        section     (   LDA,    i & 0xFF                )
+        asm         (   STA,    {origin + 0x20}         )
+        asm         (   LBNE,   section                 )
+        asm         (   JMP,    {asm.SECTION0}          )
+    return asm
+
+
+WORKLOADS = {
+    "mixed_1k": lambda: mixed(1_000),
+    "mixed_10k": lambda: mixed(10_000),
+    "nops_64k": lambda: nops(),
+    "repeated_nops_64k": lambda: repeated_nops(),
+    "forward_branches_10k": lambda: forward_branches(10_000),
+    "data_tables_2k": lambda: data_tables(2_000),
+    "lookup_tables_8": lambda: lookup_tables(8),
+    "many_org_1k": lambda: many_org(1_000),
+}
@@ -1,5 +1,5 @@
 from asm68.asmdsl import AsmDsl
-from asm68.mnemonics import (FDB, ORG, NOP, JMP, LDA, STA, BITA, BEQ, CALL)
+from asm68.mnemonics import (FDB, ORG, NOP, JMP, LDA, STA, BITA, BEQ, CALL, FILL)
 
 asm = AsmDsl()
 
@@ -8,13 +8,13 @@ aciasr = 0xA000
 aciadr = 0xA001
 
 
+NOP_OPCODE = 0x12
+
+
 def pad_until(address):
 
     def do_pad_until(assembler):
-
-        while assembler.pos != address:
-            stmt = asm.statement(NOP)
-            assembler.assemble_statement(stmt)
+        return [asm.statement(FILL, (NOP_OPCODE, address - assembler.pos))]
 
     return do_pad_until
 
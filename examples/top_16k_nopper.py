@@ -7,10 +7,9 @@ asm         (   ORG,    0xC000,     "Bottom of the top 16 K ROM"    )
 
 asm .BEGIN  (   NOP,                "Do nothing"                   )
 
-for i in range(0xC001, 0xFFFF - 16 - 3 + 1):
-    asm     (   NOP,                "Do nothing"                   )
+asm.repeat(0xFFFF - 16 - 3 + 1 - 0xC001, NOP, "Do nothing")
     
-asm         (   JMP,   asm.BEGIN,   "Jump back to the bottom"     )
+asm         (   JMP,   {asm.BEGIN}, "Jump back to the bottom"     )
 
 # Vector table at top of memory
 asm         (   FDB,   (0xC000,     # Reserved
@@ -0,0 +1,197 @@
+from bisect import bisect_right
+from collections.abc import Mapping
+from operator import itemgetter
+
+from asm68.util import typename
+
+
+class OverlapError(ValueError):
+
+    def __init__(self, message, start, stop, existing_start, existing_stop):
+        super().__init__(message)
+        self._start = start
+        self._stop = stop
+        self._existing_start = existing_start
+        self._existing_stop = existing_stop
+
+    @property
+    def start(self):
+        """The start (inclusive) address of the offending block."""
+        return self._start
+
+    @property
+    def stop(self):
+        """The stop (exclusive) address of the offending block."""
+        return self._stop
+
+    @property
+    def existing_start(self):
+        """The start (inclusive) address of the existing block which is overlapped."""
+        return self._existing_start
+
+    @property
+    def existing_stop(self):
+        """The stop (exclusive) address of the existing block which is overlapped."""
+        return self._existing_stop
+
+
+class AddressSpace(Mapping):
+    """A mapping from start addresses to non-overlapping blocks of data.
+
+    Each block occupies the interval of addresses from its start address
+    up to, but not including, its start address plus its length. Blocks
+    are kept sorted by address so that insertion and lookup of the block
+    containing an address are logarithmic in the number of blocks, and
+    iteration is in address order.
+
+    Blocks may be mutable sequences which grow after insertion, in which
+    case the owner is responsible for not growing a block beyond the
+    limit() of its start address.
+    """
+
+    def __init__(self, blocks=()):
+        """
+        Args:
+            blocks: A mapping, or an iterable series of pairs, from block start addresses
+                to sequences representing the data within each block.
+
+        Raises:
+            OverlapError: If any of the blocks overlap.
+        """
+        self._starts = []
+        self._blocks = {}
+        items = blocks.items() if isinstance(blocks, Mapping) else blocks
+        for start, block in sorted(items, key=itemgetter(0)):
+            self.insert(start, block)
+
+    def insert(self, start, block):
+        """Insert a block.
+
+        Args:
+            start: The start address of the block.
+            block: A sequence representing the data within the block.
+
+        Raises:
+            ValueError: If the start address is negative.
+            OverlapError: If the block would overlap an existing block.
+        """
+        if start < 0:
+            raise ValueError(f"Block address {start} is not non-negative")
+        stop = start + len(block)
+        index = bisect_right(self._starts, start)
+        if index != 0:
+            previous_start = self._starts[index - 1]
+            previous_stop = previous_start + len(self._blocks[previous_start])
+            if start < previous_stop or start == previous_start:
+                raise OverlapError(
+                    f"Block with address {start} with length {len(block)} bytes overlaps with "
+                    f"another block with address {previous_start} with length "
+                    f"{previous_stop - previous_start} bytes",
+                    start, stop, previous_start, previous_stop,
+                )
+        if index != len(self._starts):
+            next_start = self._starts[index]
+            if stop > next_start:
+                next_stop = next_start + len(self._blocks[next_start])
+                raise OverlapError(
+                    f"Block with address {start} with length {len(block)} bytes overlaps with "
+                    f"another block with address {next_start} with length "
+                    f"{next_stop - next_start} bytes",
+                    start, stop, next_start, next_stop,
+                )
+        self._starts.insert(index, start)
+        self._blocks[start] = block
+
+    def block_containing(self, address):
+        """The start address of the block containing an address.
+
+        Args:
+            address: The address to locate.
+
+        Returns:
+            The start address of the block containing address, or None if no block
+            contains it.
+        """
+        index = bisect_right(self._starts, address)
+        if index == 0:
+            return None
+        start = self._starts[index - 1]
+        if address < start + len(self._blocks[start]):
+            return start
+        return None
+
+    def overlapping(self, start, stop):
+        """The start addresses of all blocks overlapping a range of addresses.
+
+        Args:
+            start: The start (inclusive) address of the range.
+            stop: The stop (exclusive) address of the range.
+
+        Returns:
+            A list of block start addresses, in address order.
+        """
+        first = self.block_containing(start)
+        index = bisect_right(self._starts, start if first is None else first - 1)
+        result = []
+        while index < len(self._starts) and self._starts[index] < stop:
+            result.append(self._starts[index])
+            index += 1
+        return result
+
+    def limit(self, address):
+        """The start address of the first block which starts after an address.
+
+        Args:
+            address: The address from which to search.
+
+        Returns:
+            The start address of the next block, or None if there are no blocks
+            starting after address.
+        """
+        index = bisect_right(self._starts, address)
+        if index == len(self._starts):
+            return None
+        return self._starts[index]
+
+    @property
+    def start(self):
+        """The start address of the first block, or None if there are no blocks."""
+        return self._starts[0] if self._starts else None
+
+    @property
+    def stop(self):
+        """The address one beyond the end of the last block, or None if there are no blocks."""
+        if not self._starts:
+            return None
+        last = self._starts[-1]
+        return last + len(self._blocks[last])
+
+    def __getitem__(self, start):
+        return self._blocks[start]
+
+    def __iter__(self):
+        return iter(self._starts)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __repr__(self):
+        blocks = ", ".join(f"0x{start:04X}: <{len(self._blocks[start])} bytes>" for start in self._starts)
+        return f"{typename(self)}({{{blocks}}})"
+
+
+def blocks_in_address_order(code_blocks):
+    """The blocks of a mapping from start addresses to blocks, in address order.
+
+    An AddressSpace is already kept in address order, so only other mappings
+    are sorted.
+
+    Args:
+        code_blocks: A mapping from start addresses to blocks of data.
+
+    Returns:
+        An iterable series of (start, block) pairs, in order of start address.
+    """
+    if isinstance(code_blocks, AddressSpace):
+        return code_blocks.items()
+    return sorted(code_blocks.items(), key=itemgetter(0))
@@ -1,3 +1,4 @@
+import os
 import reprlib
 from numbers import Integral
 
@@ -9,9 +10,22 @@ I = 0
 
 
 class Inherent:
+    """The operand of an instruction with inherent addressing.
+
+    Inherent operands have no state, so there is only a single instance.
+    """
+
+    __slots__ = ()
 
     codes = {INH}
 
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __eq__(self, rhs):
         if not isinstance(rhs, self.__class__):
             return NotImplemented
@@ -26,6 +40,8 @@ class Inherent:
 
 class Immediate:
 
+    __slots__ = ('_value', '_width', '_hash')
+
     codes = {IMM}
 
     widths = {1, 2, 4}
@@ -41,6 +57,7 @@ class Immediate:
                                                                               lower, upper - 1, width))
         self._value = value
         self._width = width
+        self._hash = hash((width, value))
 
     @property
     def value(self):
@@ -57,16 +74,20 @@ class Immediate:
         return (self._width, self._value)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return self._key() == rhs._key()
 
     def __hash__(self):
-        return hash(self._key())
+        return self._hash
 
 
 class Registers:
 
+    __slots__ = ('_registers',)
+
     codes = {IMM, INT}
 
     def __init__(self, registers):
@@ -82,6 +103,8 @@ class Registers:
         return "{}({!r})".format(self.__class__.__name__, self._registers)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return self._registers == rhs._registers
@@ -92,6 +115,8 @@ class Registers:
 
 class PageDirect:
 
+    __slots__ = ('_address', '_hash')
+
     codes = {DIR}
 
     def __init__(self, address):
@@ -99,6 +124,7 @@ class PageDirect:
             raise ValueError("Invalid page direct address 0x{:X}. "
                              "Must be one byte 0x00-0xFF.".format(address))
         self._address = address
+        self._hash = hash(address)
 
     @property
     def address(self):
@@ -108,16 +134,20 @@ class PageDirect:
         return "{}(0x{:02X})".format(self.__class__.__name__, self._address)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return self._address == rhs._address
 
     def __hash__(self):
-        return hash(self._address)
+        return self._hash
 
 
 class ExtendedDirect:
 
+    __slots__ = ('_address', '_key', '_hash')
+
     codes = {EXT}
 
     def __init__(self, address):
@@ -128,6 +158,7 @@ class ExtendedDirect:
                              "Must be one two byte 0x0000-0xFFFF.".format(address))
         self._address = address
         self._key = (self.__class__, self._address)
+        self._hash = hash(self._key)
 
     @property
     def address(self):
@@ -138,18 +169,22 @@ class ExtendedDirect:
         return "{}({})".format(self.__class__.__name__, field)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return self._key == rhs._key
 
     def __hash__(self):
-        return hash(self._key)
+        return self._hash
 
 
 
 
 class ExtendedIndirect:
 
+    __slots__ = ('_address', '_key', '_hash')
+
     codes = {EXT}
 
     def __init__(self, address):
@@ -160,6 +195,7 @@ class ExtendedIndirect:
                              "Must be 0x0000-0xFFFF.".format(address))
         self._address = address
         self._key = (self.__class__, self._address)
+        self._hash = hash(self._key)
 
     @property
     def address(self):
@@ -170,16 +206,20 @@ class ExtendedIndirect:
         return "{}({})".format(self.__class__.__name__, field)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return self._key == rhs._key
 
     def __hash__(self):
-        return hash(self._key)
+        return self._hash
 
 
 class Indexed:
 
+    __slots__ = ('_base', '_offset', '_hash')
+
     codes = {IDX}
 
     def __init__(self, base, offset):
@@ -190,6 +230,7 @@ class Indexed:
             raise ValueError(f"{offset} cannot be represented as a 16-bit signed offset")
         self._base = base
         self._offset = offset
+        self._hash = hash((base, offset))
 
     @property
     def base(self):
@@ -203,16 +244,20 @@ class Indexed:
         return "{}(base={}, offset={})".format(self.__class__.__name__, self._base, self._offset)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return (self._base == rhs._base) and (self._offset == rhs._offset)
 
     def __hash__(self):
-        return hash((self._base, self._offset))
+        return self._hash
 
 
 class Relative8:
 
+    __slots__ = ('_offset',)
+
     codes = {REL8}
 
     def __init__(self, offset):
@@ -238,6 +283,8 @@ class Relative8:
 
 class Relative16:
 
+    __slots__ = ('_offset',)
+
     codes = {REL16}
 
     def __init__(self, offset):
@@ -264,25 +311,103 @@ class Relative16:
 # TODO: This isn't really an addressing mode
 class Integers:
 
+    __slots__ = ('_items', '_has_labels', '_hash')
+
     def __init__(self, items):
         if len(items) < 1:
             raise ValueError("At least one integer must be provided")
-        if not all(isinstance(item, (Integral, Label)) for item in items):
+        # Tables are long but contain few distinct types, so check the types rather than the items
+        item_types = set(map(type, items))
+        if not all(issubclass(item_type, (Integral, Label)) for item_type in item_types):
             raise TypeError("Not all items in {} are of integral type".format(reprlib.repr(items)))
         self._items = tuple(items)
+        self._has_labels = any(issubclass(item_type, Label) for item_type in item_types)
+        self._hash = hash(self._items)
+
+    @property
+    def items(self):
+        """The items as a tuple."""
+        return self._items
+
+    @property
+    def has_labels(self):
+        """True if any of the items is a Label, otherwise False."""
+        return self._has_labels
 
     def __repr__(self):
         return "{}({!r})".format(self.__class__.__name__, self._items)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return self._items == rhs._items
 
     def __hash__(self):
-        return hash(self._items)
+        return self._hash
 
     def __getitem__(self, index):
         return self._items[index]
 
+    def __len__(self):
+        return len(self._items)
+
+
+
 
+class BinaryFile:
+    """A slice of the contents of a binary file, to be included verbatim.
+
+    The file is not read until the operand is assembled.
+    """
+
+    __slots__ = ('_path', '_offset', '_length', '_hash')
+
+    def __init__(self, path, offset=0, length=None):
+        """
+        Args:
+            path: The path of the file. Relative paths are relative to the
+                current directory at the time of assembly.
+            offset: The offset of the first byte to be included.
+            length: The number of bytes to be included, or None to include
+                all bytes from the offset to the end of the file.
+        """
+        if not isinstance(offset, Integral):
+            raise TypeError("{} offset {!r} is not an integer".format(typename(self), offset))
+        if offset < 0:
+            raise ValueError("{} offset {} is negative".format(typename(self), offset))
+        if length is not None:
+            if not isinstance(length, Integral):
+                raise TypeError("{} length {!r} is not an integer".format(typename(self), length))
+            if length < 0:
+                raise ValueError("{} length {} is negative".format(typename(self), length))
+        self._path = os.fspath(path)
+        self._offset = offset
+        self._length = length
+        self._hash = hash((self._path, offset, length))
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def offset(self):
+        return self._offset
+
+    @property
+    def length(self):
+        return self._length
+
+    def __repr__(self):
+        return "{}({!r}, offset={!r}, length={!r})".format(typename(self), self._path, self._offset, self._length)
+
+    def __eq__(self, rhs):
+        if self is rhs:
+            return True
+        if not isinstance(rhs, self.__class__):
+            return NotImplemented
+        return (self._path, self._offset, self._length) == (rhs._path, rhs._offset, rhs._length)
+
+    def __hash__(self):
+        return self._hash
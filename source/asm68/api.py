@@ -1,15 +1,28 @@
 import os
+import sys
 import importlib.util
 import logging
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from traceback import format_exception_only
 
-from asm68.assembler import TooManyPassesError, Assembler
+from asm68.addrmodes import Inherent
+from asm68.assembler import TooManyPassesError, OscillationError, Assembler, DEFAULT_MAX_PASSES
+from asm68.cache import AssemblyCache, imported_module_filepaths
 from asm68.contiguous_bytes import ContiguousBytes
+from asm68.cycles import CycleReport
+from asm68.fileutil import write_repeated
+from asm68.intel_hex import intel_hex_records
+from asm68.srecord import srecords
 
 logger = logging.getLogger(__name__)
 
+RECORDS_PER_CHUNK = 256
+
 
 assert TooManyPassesError
+assert OscillationError
 
 
 class ModuleLoadError(Exception):
@@ -20,8 +33,26 @@ class ModuleLoadError(Exception):
         self.exception = exception
 
 
+class UnresolvedAddressError(ValueError):
+    """An address given as a string is neither an integer literal nor a label name."""
+
+
 
-def asm(source_filepath, output_file, output_format, repeat):
+def asm(
+        source_filepath,
+        output_file,
+        output_format,
+        repeat,
+        *,
+        entry=None,
+        record_length=None,
+        cache_dir=None,
+        profile=False,
+        relax=False,
+        cycles=None,
+        backpatch=False,
+        max_passes=DEFAULT_MAX_PASSES,
+):
     """
     Args:
         source_filepath: A string path to the source file.
@@ -34,24 +65,67 @@ def asm(source_filepath, output_file, output_format, repeat):
             the output file. Useful for 'doubling-up' binary images for
             putting, say, a 16 K image into a 32 K EPROM.
 
+        entry: An optional entry point, either as an integer address, or as
+            a string containing an integer literal or a label name. Used by
+            formats which can record a start address.
+
+        record_length: An optional maximum number of data bytes per record,
+            for record-based formats.
+
+        cache_dir: An optional path to a directory for a persistent cache of
+            assembly results. If the source module, the modules it imports and
+            the binary files it includes are unchanged since they were cached,
+            importing and assembling the module is skipped.
+
+        profile: If True, the source module is always assembled, rather than
+            restored from the cache, and a report of where the time was spent
+            during assembly is printed to stderr.
+
+        relax: If True, short relative branches with targets out of range are
+            promoted to their long equivalents.
+
+        cycles: An optional CPU, "6809" or "6309", in which case the source
+            module is always assembled, rather than restored from the cache,
+            and a report of the cycles taken by each statement, routine and
+            loop on that CPU is printed to stderr.
+
+        backpatch: If True, forward references to labels are patched in place,
+            so that the program is assembled in a single pass unless the sizes
+            of instructions change.
+
+        max_passes: The maximum number of assembly passes, excluding those in
+            which relaxable instructions change form.
+
     Raises:
         FileNotFoundError: If the source_filepath could not be found.
         ModuleLoadError: If the module could not be loaded.
         TooManyPassesError: If too many assembly passes were required.
+        OscillationError: If the label addresses oscillated from pass to pass.
+        ValueError: If the output format does not support the repeat, entry or
+            record_length options.
+        UnresolvedAddressError: If the entry is neither an address nor a label.
     """
-    try:
-        m = import_module_from_file(source_filepath)
-    except Exception as e:
-        raise ModuleLoadError(
-            source_filepath,
-            e
-        )
-
-    asm = Assembler(0, logger=logger)
-    asm.assemble(m.asm.statements, 0)
+    check_export_options(output_format, repeat, entry=entry, record_length=record_length)
+    asm = assemble_file(
+        source_filepath,
+        cache_dir=cache_dir,
+        profile=profile,
+        relax=relax,
+        listing=cycles is not None,
+        backpatch=backpatch,
+        max_passes=max_passes,
+    )
 
     print_labels(asm)
 
+    if profile:
+        for line in format_stats(asm.stats):
+            print(line, file=sys.stderr)
+
+    if cycles is not None:
+        for line in format_cycles(CycleReport(asm.listing, asm.label_addresses, cycles)):
+            print(line, file=sys.stderr)
+
     #pprint(asm.unreferenced_labels)
 
     code_blocks = asm.object_code()
@@ -60,10 +134,133 @@ def asm(source_filepath, output_file, output_format, repeat):
         logger.debug("{:04X}: {}".format(address, hex_assembly))
         logger.info("code length: {} bytes".format(len(code)))
 
-    export_code_blocks(output_file, code_blocks, output_format, repeat)
+    export_code_blocks(
+        output_file,
+        code_blocks,
+        output_format,
+        repeat,
+        start_address=resolve_address(asm, entry),
+        record_length=record_length,
+    )
+
+
+def assemble_file(
+        source_filepath,
+        *,
+        cache_dir=None,
+        profile=False,
+        relax=False,
+        listing=False,
+        backpatch=False,
+        max_passes=DEFAULT_MAX_PASSES,
+):
+    """Assemble the program in a source module, or restore its assembly from the cache.
+
+    Args:
+        source_filepath: A string path to the source file.
+
+        cache_dir: An optional path to a directory for a persistent cache of
+            assembly results.
+
+        profile: If True, the source module is always assembled, rather than
+            restored from the cache, with profiling enabled.
+
+        relax: If True, short relative branches with targets out of range are
+            promoted to their long equivalents.
+
+        listing: If True, the source module is always assembled, rather than
+            restored from the cache, with the listing of its statements recorded.
+
+        backpatch: If True, forward references to labels are patched in place,
+            so that the program is assembled in a single pass unless the sizes
+            of instructions change.
+
+        max_passes: The maximum number of assembly passes, excluding those in
+            which relaxable instructions change form.
+
+    Returns:
+        An Assembler which has assembled the program, or an equivalent
+        CachedAssembly.
+
+    Raises:
+        FileNotFoundError: If the source_filepath could not be found.
+        ModuleLoadError: If the module could not be loaded.
+        TooManyPassesError: If too many assembly passes were required.
+        OscillationError: If the label addresses oscillated from pass to pass.
+    """
+    cache = AssemblyCache(cache_dir) if cache_dir is not None else None
+    options = {name: True for name, enabled in (("relax", relax), ("backpatch", backpatch)) if enabled}
+    if max_passes != DEFAULT_MAX_PASSES:
+        options["max_passes"] = max_passes
+    options = options or None
+    asm = cache.load(source_filepath, options) if (cache is not None and not (profile or listing)) else None
+    if asm is None:
+        try:
+            m, dependency_filepaths = import_module_and_dependencies_from_file(source_filepath)
+        except Exception as e:
+            raise ModuleLoadError(
+                source_filepath,
+                e
+            )
+
+        asm = Assembler(
+            0, logger=logger, profile=profile, relax=relax, listing=listing, backpatch=backpatch,
+            max_passes=max_passes,
+        )
+        asm.assemble(m.asm.program, 0)
+        logger.info("Assembly passes: %d", asm.num_passes)
+        for line in format_direct_page_savings(asm.stats)[1:]:
+            logger.info(line)
+
+        if cache is not None:
+            cache.store(source_filepath, asm, [*dependency_filepaths, *asm.included_filepaths], options)
+    else:
+        for label in sorted(asm.unreferenced_labels):
+            logger.warning("Unreferenced label: %s", label)
+    return asm
+
+
+def resolve_address(asm, address):
+    """Resolve an address given as an integer, an integer literal or a label name.
+
+    Args:
+        asm: An Assembler which has assembled the program.
+        address: An integer, a string containing a Python integer literal such as "0xC000",
+            a string containing a label name, or None.
+
+    Returns:
+        The integer address, or None if address is None.
+
+    Raises:
+        UnresolvedAddressError: If address is a string which is neither an integer
+            literal nor the name of a label.
+    """
+    if address is None or isinstance(address, int):
+        return address
+    try:
+        return int(address, 0)
+    except ValueError:
+        pass
+    try:
+        return asm.label_addresses[address]
+    except KeyError:
+        raise UnresolvedAddressError(f"{address!r} is neither an address nor a label")
 
 
 def print_labels(asm):
+    for line in format_labels(asm):
+        print(line)
+
+
+def format_labels(asm):
+    """Format a table of labels, their addresses and whether they are referenced.
+
+    Args:
+        asm: An Assembler which has assembled the program.
+
+    Returns:
+        A list of strings, one for each line of the table, in address order.
+    """
     addresses_to_labels = defaultdict(list)
     for label, address in asm.label_addresses.items():
         addresses_to_labels[address].append(label)
@@ -79,11 +276,322 @@ def print_labels(asm):
             rows.append(row)
     columns = list(zip(*rows))
     widths = [max(max(map(len, column)), 1) for column in columns]
-    for cells in rows:
-        text_row = " ".join("{:{}}".format(cell, width) for cell, width in zip(cells, widths))
-        print(text_row)
+    return [
+        " ".join("{:{}}".format(cell, width) for cell, width in zip(cells, widths))
+        for cells in rows
+    ]
+
+
+
+
+def format_stats(stats):
+    """Format a report of where the time was spent during assembly.
+
+    Args:
+        stats: The AssemblyStats of an Assembler.
+
+    Returns:
+        A list of strings, one for each line of the report.
+    """
+    lines = ["Pass  Time (ms)  Statements    Encoded      Bytes  Unresolved"]
+    for p in stats.passes:
+        lines.append(
+            f"{p.number:4}  {p.duration * 1e3:9.3f}  {p.num_statements:10}  {p.num_encoded:9}  "
+            f"{p.num_bytes:9}  {p.num_unresolved_labels:10}"
+        )
+    lines.append(f"Total {stats.duration * 1e3:9.3f}")
+    lines.extend(_format_durations("Statement type", stats.statement_counts, stats.statement_durations))
+    lines.extend(_format_durations("Macro", stats.macro_counts, stats.macro_durations))
+    lines.extend(format_direct_page_savings(stats))
+    return lines
+
+
+def format_direct_page_savings(stats):
+    """Format a report of the savings from direct addressing following SETDP.
+
+    Args:
+        stats: The AssemblyStats of an Assembler.
+
+    Returns:
+        A list of strings, one for each line of the report, which is empty if
+        no instructions used direct addressing in place of extended addressing.
+    """
+    if stats.num_direct_page_accesses == 0:
+        return []
+    return [
+        "",
+        f"Direct page accesses: {stats.num_direct_page_accesses}",
+        f"Bytes saved:          {stats.direct_page_bytes_saved}",
+        f"Cycles saved:         {stats.direct_page_cycles_saved}",
+    ]
+
+
+def format_cycles(report):
+    """Format a report of the cycles taken by each statement, routine and loop.
+
+    Args:
+        report: A CycleReport.
+
+    Returns:
+        A list of strings, one for each line of the report.
+    """
+    lines = [f"Address  Code                  Cycles  Statement ({report.cpu})"]
+    for entry, cycles in report.statements:
+        lines.append(
+            f"{entry.address:04X}     {_format_code(entry.code):20}  {cycles or '':>6}  "
+            f"{_format_statement(entry.statement)}"
+        )
+    lines.append(f"Total                          {report.total_cycles:>6}")
+    if report.routines:
+        width = max(len("Routine"), *(len(r.name) for r in report.routines))
+        lines.extend(["", f"{'Routine':{width}}  Address  Cycles"])
+        for routine in report.routines:
+            lines.append(f"{routine.name:{width}}  {routine.address:04X}     {routine.cycles:>6}")
+    if report.loops:
+        width = max(len("Loop"), *(len(loop.name) for loop in report.loops))
+        lines.extend(["", f"{'Loop':{width}}  From  To    Cycles"])
+        for loop in sorted(report.loops, key=lambda loop: loop.cycles, reverse=True):
+            lines.append(f"{loop.name:{width}}  {loop.start:04X}  {loop.end:04X}  {loop.cycles:>6}")
+    return lines
+
+
+# The maximum number of bytes of code shown for each statement in a cycle report
+LISTED_CODE_LENGTH = 6
+
+
+def _format_code(code):
+    text = " ".join(format(b, "02X") for b in code[:LISTED_CODE_LENGTH])
+    return text + " ..." if len(code) > LISTED_CODE_LENGTH else text
+
+
+def _format_statement(statement):
+    label = statement.label
+    prefix = f"{label.name}: " if label is not None else ""
+    operand = "" if isinstance(statement.operand, Inherent) else f" {statement.operand!r}"
+    return f"{prefix}{statement.mnemonic}{operand}"
+
+
+def _format_durations(heading, counts, durations):
+    if not durations:
+        return []
+    width = max(len(heading), *map(len, durations))
+    lines = ["", f"{heading:{width}}      Count  Time (ms)"]
+    for name, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"{name:{width}}  {counts[name]:9}  {duration * 1e3:9.3f}")
+    return lines
+
+
+class BatchResult:
+    """The outcome of assembling one source module in a batch."""
+
+    def __init__(self, source_filepath, output_filepath, label_lines=(), error=None):
+        self._source_filepath = source_filepath
+        self._output_filepath = output_filepath
+        self._label_lines = tuple(label_lines)
+        self._error = error
+
+    @property
+    def source_filepath(self):
+        return self._source_filepath
+
+    @property
+    def output_filepath(self):
+        """The path of the output file, which is only written if assembly succeeded."""
+        return self._output_filepath
+
+    @property
+    def label_lines(self):
+        """The lines of the table of labels, as produced by format_labels()."""
+        return self._label_lines
+
+    @property
+    def error(self):
+        """A description of the error which prevented assembly, or None."""
+        return self._error
+
+    @property
+    def succeeded(self):
+        return self._error is None
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(source_filepath={self._source_filepath!r}, "
+            f"output_filepath={self._output_filepath!r}, "
+            f"label_lines={self._label_lines!r}, error={self._error!r})"
+        )
+
+
+def batch(
+        source_filepaths,
+        output_dirpath,
+        output_format="bin",
+        repeat=1,
+        *,
+        entry=None,
+        record_length=None,
+        cache_dir=None,
+        jobs=None,
+        relax=False,
+        backpatch=False,
+        max_passes=DEFAULT_MAX_PASSES,
+):
+    """Assemble many independent source modules, in parallel across a pool of processes.
+
+    Each output file is written to output_dirpath and named after its source
+    module, with an extension according to the output format. Each module is
+    imported in isolation, so modules imported by one source module are not
+    shared with any other source module assembled by the same worker.
+
+    Args:
+        source_filepaths: An iterable series of string paths to source files.
+
+        output_dirpath: The path of the directory to which the output files will be
+            written. It will be created if necessary.
+
+        output_format: "bin", "hex" or "srec"
+
+        repeat: The number of times binary data will be copied into each output file.
+
+        entry: An optional entry point, applied to every source module. See asm().
+
+        record_length: An optional maximum number of data bytes per record,
+            for record-based formats.
+
+        cache_dir: An optional path to a directory for a persistent cache of
+            assembly results.
+
+        jobs: The maximum number of worker processes. If None, the number of
+            processors on the machine is used. If one, the modules are assembled
+            in turn in the current process.
+
+        relax: If True, short relative branches with targets out of range are
+            promoted to their long equivalents.
+
+        backpatch: If True, forward references to labels are patched in place,
+            so that each program is assembled in a single pass unless the sizes
+            of instructions change.
 
+        max_passes: The maximum number of assembly passes, excluding those in
+            which relaxable instructions change form.
 
+    Returns:
+        A list of BatchResults, in the same order as source_filepaths.
+
+    Raises:
+        ValueError: If the output format is not supported, or does not support
+            the repeat, entry or record_length options, or if two source modules
+            would be written to the same output file.
+    """
+    check_export_options(output_format, repeat, entry=entry, record_length=record_length)
+    source_filepaths = list(source_filepaths)
+    output_filepaths = [
+        os.path.join(output_dirpath, output_filename(source_filepath, output_format))
+        for source_filepath in source_filepaths
+    ]
+    seen = {}
+    for source_filepath, output_filepath in zip(source_filepaths, output_filepaths):
+        if output_filepath in seen:
+            raise ValueError(
+                f"Source modules {seen[output_filepath]} and {source_filepath} "
+                f"would both be written to {output_filepath}"
+            )
+        seen[output_filepath] = source_filepath
+
+    os.makedirs(output_dirpath, exist_ok=True)
+    tasks = [
+        (
+            source_filepath, output_filepath, output_format, repeat, entry, record_length, cache_dir,
+            relax, backpatch, max_passes,
+        )
+        for source_filepath, output_filepath in zip(source_filepaths, output_filepaths)
+    ]
+    if jobs == 1 or len(tasks) <= 1:
+        return [_assemble_isolated(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_assemble_isolated, tasks))
+
+
+def output_filename(source_filepath, output_format):
+    """The name of the output file for a source module in a batch."""
+    module_name, _ = os.path.splitext(os.path.basename(source_filepath))
+    return module_name + OUTPUT_EXTENSIONS[output_format]
+
+
+def read_manifest(manifest_filepath):
+    """Read the source filepaths listed in a batch manifest.
+
+    A manifest is a text file listing one source filepath per line. Blank
+    lines, and lines starting with '#', are ignored. Relative paths are
+    relative to the directory containing the manifest.
+
+    Args:
+        manifest_filepath: The path to the manifest file.
+
+    Returns:
+        A list of source filepaths.
+    """
+    manifest_dirpath = os.path.dirname(manifest_filepath)
+    source_filepaths = []
+    with open(manifest_filepath, encoding="utf-8") as manifest_file:
+        for line in manifest_file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            source_filepaths.append(os.path.join(manifest_dirpath, line))
+    return source_filepaths
+
+
+def _assemble_isolated(task):
+    """Assemble one source module of a batch, restoring sys.modules afterwards.
+
+    Exceptions are reported in the result rather than raised, so that one
+    failing module does not prevent the others from being assembled, and
+    because tracebacks cannot be returned from worker processes.
+    """
+    (
+        source_filepath, output_filepath, output_format, repeat, entry, record_length, cache_dir,
+        relax, backpatch, max_passes,
+    ) = task
+    modules_before = dict(sys.modules)
+    try:
+        asm = assemble_file(
+            source_filepath,
+            cache_dir=cache_dir,
+            relax=relax,
+            backpatch=backpatch,
+            max_passes=max_passes,
+        )
+        with open(output_filepath, "wb") as output_file:
+            export_code_blocks(
+                output_file,
+                asm.object_code(),
+                output_format,
+                repeat,
+                start_address=resolve_address(asm, entry),
+                record_length=record_length,
+            )
+    except Exception as e:
+        if os.path.exists(output_filepath):
+            os.unlink(output_filepath)
+        return BatchResult(source_filepath, output_filepath, error=describe_error(e))
+    finally:
+        for name in set(sys.modules) - set(modules_before):
+            del sys.modules[name]
+        sys.modules.update(modules_before)
+    return BatchResult(source_filepath, output_filepath, label_lines=format_labels(asm))
+
+
+def describe_error(e):
+    """A one-line description of an error raised while assembling a source module."""
+    if isinstance(e, ModuleLoadError):
+        inner = "".join(format_exception_only(type(e.exception), e.exception)).strip()
+        return f"{e}: {inner}"
+    if isinstance(e, TooManyPassesError):
+        return (
+            f"{e}. Unresolved labels: {', '.join(e.unresolved_label_names)}. "
+            f"Unreferenced labels: {', '.join(e.unreferenced_label_names)}"
+        )
+    return "".join(format_exception_only(type(e), e)).strip()
 
 
 def import_module_from_file(module_filepath):
@@ -108,29 +616,132 @@ def import_module_from_file(module_filepath):
     return m
 
 
-def export_code_blocks(output_file, code_blocks, output_format, multiplicity):
+def import_module_and_dependencies_from_file(module_filepath):
+    """Import a module given a filepath, noting which other source files it imports.
+
+    Args:
+        module_filepath: The filepath to a Python module.
+
+    Returns:
+        A 2-tuple containing the module object and a list of the filepaths of the
+        modules newly imported by it, excluding asm68 and installed packages.
+    """
+    module_names_before = set(sys.modules)
+    m = import_module_from_file(module_filepath)
+    dependency_filepaths = imported_module_filepaths(set(sys.modules) - module_names_before)
+    return m, dependency_filepaths
+
+
+def check_export_options(output_format, repeat=1, *, entry=None, record_length=None):
+    """Check that an output format supports the options with which it is to be exported.
+
+    Binary images can be repeated, but have no entry point or records. Record-based
+    formats can have an entry point and a record length, but cannot be repeated.
+
+    Raises:
+        ValueError: If the output format is not supported, or does not support
+            one of the options.
+    """
+    if output_format not in EXPORTERS:
+        raise ValueError(f"Unsupported export format {output_format}")
+    if output_format == "bin":
+        if repeat < 1:
+            raise ValueError(f"Repeat {repeat} is less than one")
+        if entry is not None:
+            raise ValueError(f"An entry point is not supported for {output_format} output")
+        if record_length is not None:
+            raise ValueError(f"A record length is not supported for {output_format} output")
+    elif repeat != 1:
+        raise ValueError(f"Repeat {repeat} is not supported for {output_format} output")
+
+
+def export_code_blocks(output_file, code_blocks, output_format, multiplicity, **options):
+    """Export code blocks to a file.
+
+    Args:
+        output_file: A binary file-like object to which the output will be written.
+        code_blocks: A mapping from block origin addresses to the code within each block.
+        output_format: One of the keys of EXPORTERS.
+        multiplicity: The number of copies of the image to be written.
+        **options: Format-specific options. Options with a value of None are omitted.
+    """
     try:
         exporter = EXPORTERS[output_format]
     except KeyError:
         raise ValueError(f"Unsupported export format {output_format}")
 
-    exporter(output_file, code_blocks, multiplicity)
+    options = {name: value for name, value in options.items() if value is not None}
+    exporter(output_file, code_blocks, multiplicity, **options)
 
 
 def export_bin(output_file, code_blocks, multiplicity=1):
+    """Export code blocks as a binary image, gaps between blocks being zero-filled.
+
+    When multiplicity is greater than one and the output is a regular file, the
+    file is memory-mapped and the image is replicated within it.
+    """
     if multiplicity < 1:
         raise ValueError(f"Multiplicity {multiplicity} is less than one")
     #if len(code_blocks) != 1:
     #    raise ValueError("Can only export bin for single code block")
     code = ContiguousBytes(code_blocks, default=0x00)
     logging.info(f"Export from address 0x{code.start:04X} to 0x{code.stop - 1:04X}")
-    for _ in range(multiplicity):
-        output_file.write(code.to_bytes())
-    logging.info(f"Wrote {len(code) * multiplicity} (0x{len(code) * multiplicity:04X}) bytes")
+    num_bytes = write_repeated(output_file, code.view(), multiplicity)
+    logging.info(f"Wrote {num_bytes} (0x{num_bytes:04X}) bytes")
+
+
+def export_hex(output_file, code_blocks, multiplicity=1, *, start_address=None, record_length=16):
+    """Export code blocks as Intel HEX records.
+
+    Records are written as they are generated, so gaps between code blocks
+    are neither padded nor held in memory.
+    """
+    if multiplicity != 1:
+        raise ValueError(f"Multiplicity {multiplicity} is not supported for Intel HEX output")
+    records = intel_hex_records(code_blocks, record_length=record_length, start_address=start_address)
+    write_records(output_file, records)
+    logging.info(f"Wrote {sum(map(len, code_blocks.values()))} bytes in {len(code_blocks)} blocks")
+
+
+def export_srec(output_file, code_blocks, multiplicity=1, *, start_address=None, record_length=16):
+    """Export code blocks as Motorola S-records.
+
+    Records are written as they are generated, so gaps between code blocks
+    are neither padded nor held in memory.
+    """
+    if multiplicity != 1:
+        raise ValueError(f"Multiplicity {multiplicity} is not supported for S-record output")
+    records = srecords(code_blocks, record_length=record_length, start_address=start_address)
+    write_records(output_file, records)
+    logging.info(f"Wrote {sum(map(len, code_blocks.values()))} bytes in {len(code_blocks)} blocks")
+
+
+def write_records(output_file, records, chunk_size=RECORDS_PER_CHUNK):
+    """Write text records as lines, in chunks of many records per write.
+
+    Args:
+        output_file: A binary file-like object.
+        records: An iterable series of record strings, without line terminators.
+        chunk_size: The maximum number of records in each write.
+    """
+    records = iter(records)
+    while True:
+        chunk = "".join(f"{record}\n" for record in islice(records, chunk_size))
+        if not chunk:
+            break
+        output_file.write(chunk.encode("ascii"))
 
 
 EXPORTERS = {
     "bin": export_bin,
-    # "hex": export_hex,
-    # "srec": export_srec,
+    "hex": export_hex,
+    "srec": export_srec,
+}
+
+# Output file names are chosen before assembly, when the S-record address size
+# is not yet known, so a neutral extension is used rather than .s19, .s28 or .s37
+OUTPUT_EXTENSIONS = {
+    "bin": ".bin",
+    "hex": ".hex",
+    "srec": ".srec",
 }
@@ -1,11 +1,13 @@
+import os
 import weakref
 from collections.abc import Set, Callable
-from functools import singledispatch
+from functools import singledispatch, lru_cache
 from numbers import Integral
 
 from asm68.addrmodes import (Immediate, Inherent, PageDirect, ExtendedDirect,
-                             ExtendedIndirect, Registers, Indexed, Integers)
+                             ExtendedIndirect, Registers, Indexed, Integers, BinaryFile)
 from asm68.label import Label
+from asm68.program import Program
 from asm68.registers import Register, AutoIncrementedRegister
 from asm68.util import single
 from asm68.integers import U8, U16, U32, I8, I16, I32
@@ -13,16 +15,70 @@ from asm68.instructions import *
 
 PROGRAM_COUNTER_LABEL_NAME = "pc"
 
+# The maximum number of distinct operands of each kind retained for reuse
+OPERAND_CACHE_SIZE = 4096
+
 
 class AsmDsl:
 
     def __init__(self):
-        self._statements = []
-        self._label_statement_index = {}
+        self._program = Program()
 
     def __call__(self, mnemonic, *args, label=None):
         statement_node = self.statement(mnemonic, *args, label=label)
-        self._statements.append(statement_node)
+        self._program.append(statement_node)
+
+    def repeat(self, count, mnemonic, *args, label=None):
+        """Append several repetitions of a statement.
+
+        The operand is parsed and the statement constructed only once, however
+        many repetitions are appended.
+
+        Args:
+            count: The number of repetitions.
+            mnemonic: The mnemonic of the statement.
+            *args: The optional operand and comment, as for a single statement.
+            label: An optional label for the first repetition.
+
+        Raises:
+            ValueError: If count is negative.
+        """
+        if count < 0:
+            raise ValueError(f"Repetition count {count} is negative")
+        if count == 0:
+            return
+        if label is not None:
+            self(mnemonic, *args, label=label)
+            count -= 1
+        self._program.append_repeated(self.statement(mnemonic, *args), count)
+
+    def extend(self, shapes):
+        """Append a series of unlabelled statements.
+
+        Each distinct statement is parsed and constructed only once, however
+        many times it occurs in the series, so this is much faster than making
+        a call for each statement when generating repetitive code such as
+        unrolled loops or lookup tables.
+
+        Args:
+            shapes: An iterable series of tuples, each containing the mnemonic, and
+                the optional operand and comment, of a statement, as would be passed
+                when appending a single statement.
+        """
+        program = self._program
+        statement_nodes = {}
+        for shape in shapes:
+            try:
+                key = shape_key(shape)
+                statement_node = statement_nodes.get(key)
+            except TypeError:  # Unhashable operand, which cannot be cached
+                key = None
+                statement_node = None
+            if statement_node is None:
+                statement_node = self.statement(*shape)
+                if key is not None:
+                    statement_nodes[key] = statement_node
+            program.append(statement_node)
 
     def statement(self, mnemonic, *args, label=None):
         operand = None
@@ -40,9 +96,6 @@ class AsmDsl:
             raise TypeError("Unhandled number are assembler arguments")
         operand_node = parse_operand(operand)
         statement_node = Statement.from_mnemonic(mnemonic, operand_node, comment, label)
-        while label is not None:
-            self._label_statement_index[label.name] = len(self._statements)
-            label = label.chained_label
         return statement_node
 
     @property
@@ -54,11 +107,18 @@ class AsmDsl:
 
     @property
     def statements(self):
-        return tuple(self._statements)
+        return tuple(self._program)
+
+    @property
+    def program(self):
+        """The statements as a Program, which is not copied."""
+        return self._program
 
 
 class Labeller(Label):
 
+    __slots__ = ('_asm',)
+
     def __init__(self, asm, name, chained_label=None):
         super().__init__(name, chained_label)
         self._asm = weakref.ref(asm)
@@ -75,20 +135,74 @@ class Labeller(Label):
             raise RuntimeError("AsmDsl instance no longer available.")
         return Labeller(asm, name=name, chained_label=self)
 
+    def __reduce__(self):
+        # The AsmDsl cannot be pickled by weak reference, so pickle as a plain label
+        return Label, (self.name, self.chained_label)
+
 
 class ProgramCounterLabel(Label):
     """A special label which points to the program counter."""
 
+    __slots__ = ('_asm',)
+
     def __init__(self, asm):
         super().__init__(PROGRAM_COUNTER_LABEL_NAME)
         self._asm = weakref.ref(asm)
 
+    def __reduce__(self):
+        return Label, (self.name,)
+
+
+def shape_key(item):
+    """A key for the arguments of a statement, as passed to AsmDsl, for use in a dict.
+
+    Sets, dicts and lists, as used in the syntax for addressing modes, are
+    converted into hashable equivalents tagged with their type, and other items
+    are tagged with their type so that, for example, 1 and True are distinct.
+    The key is unhashable if some part of the shape is unhashable.
+    """
+    t = type(item)
+    if t is tuple:
+        return tuple(map(shape_key, item))
+    if t is set or t is frozenset:
+        return set, frozenset(map(shape_key, item))
+    if t is dict:
+        return dict, tuple((shape_key(k), shape_key(v)) for k, v in item.items())
+    if t is list:
+        return list, tuple(map(shape_key, item))
+    return t, item
+
 
 def statements(asm):
-    return tuple(asm._statements)
+    return tuple(asm._program)
 
 def statement_index(asm, label):
-    return asm._label_statement_index[label]
+    return asm._program.statement_index(label)
+
+
+# Operands are immutable, so operands which do not refer to labels are interned: parsing the
+# same operand repeatedly returns the same flyweight instance, which is cheaper to construct and
+# compare. Operands referring to labels are not interned, because labels refer back to the AsmDsl
+# in which they were created.
+_immediate = lru_cache(maxsize=OPERAND_CACHE_SIZE, typed=True)(Immediate)
+_registers = lru_cache(maxsize=OPERAND_CACHE_SIZE, typed=True)(Registers)
+_page_direct = lru_cache(maxsize=OPERAND_CACHE_SIZE, typed=True)(PageDirect)
+_extended_direct = lru_cache(maxsize=OPERAND_CACHE_SIZE, typed=True)(ExtendedDirect)
+_extended_indirect = lru_cache(maxsize=OPERAND_CACHE_SIZE, typed=True)(ExtendedIndirect)
+_indexed = lru_cache(maxsize=OPERAND_CACHE_SIZE, typed=True)(Indexed)
+
+
+def operand_cache_info():
+    """Statistics for the caches of interned operands.
+
+    Returns:
+        A mapping from operand type names to the functools cache_info() of the cache
+        for that operand type.
+    """
+    return {
+        cached.__wrapped__.__name__: cached.cache_info()
+        for cached in (_immediate, _registers, _page_direct, _extended_direct, _extended_indirect, _indexed)
+    }
 
 
 @singledispatch
@@ -98,7 +212,7 @@ def parse_operand(operand):
 @parse_operand.register(type(None))
 def _(operand):
     assert operand is None
-    return Inherent()
+    return Inherent()  # A singleton
 
 @parse_operand.register(Callable)
 def _(operand):
@@ -111,31 +225,31 @@ def _(operand):
     Immediate operands are simple values such as 0, 0x10, or 0b10101010, or an expression evaluating
     to such a value, such as ord("A").
     """
-    return Immediate(operand)
+    return _immediate(operand)
 
 @parse_operand.register(bytes)
 def _(operand):
-    return Immediate(int.from_bytes(operand, byteorder="big", signed=False), len(operand))
+    return _immediate(int.from_bytes(operand, byteorder="big", signed=False), len(operand))
 
 
 @parse_operand.register(U8)
 def _(operand):
-    return Immediate(operand.value, 1)
+    return _immediate(operand.value, 1)
 
 
 @parse_operand.register(U16)
 def _(operand):
-    return Immediate(operand.value, 2)
+    return _immediate(operand.value, 2)
 
 
 @parse_operand.register(U32)
 def _(operand):
-    return Immediate(operand.value, 4)
+    return _immediate(operand.value, 4)
 
 
 @parse_operand.register(I8)
 def _(operand):
-    return Immediate(int.from_bytes(
+    return _immediate(int.from_bytes(
         operand.value.to_bytes(1, byteorder="big", signed=True),
         byteorder="big",
         signed=False
@@ -145,7 +259,7 @@ def _(operand):
 @parse_operand.register(I16)
 def _(operand):
     unsigned = operand.value.to_bytes(2, byteorder="big", signed=True)
-    return Immediate(int.from_bytes(
+    return _immediate(int.from_bytes(
         unsigned,
         byteorder="big",
         signed=False
@@ -154,7 +268,7 @@ def _(operand):
 
 @parse_operand.register(I32)
 def _(operand):
-    return Immediate(int.from_bytes(
+    return _immediate(int.from_bytes(
         operand.value.to_bytes(4, byteorder="big", signed=True),
         byteorder="big",
         signed=False
@@ -169,7 +283,7 @@ def _(operand):
 @parse_operand.register(tuple)
 def _(operand):
     if all(isinstance(item, Register) for item in operand):
-        return Registers(operand)
+        return _registers(operand)
     elif all(isinstance(item, (Integral, Label)) for item in operand):
         return Integers(operand)
     else:
@@ -187,12 +301,24 @@ def _(operand):
         raise TypeError("Expected integer offset. Got {}".format(offset))
     if not isinstance(base, (Register, AutoIncrementedRegister)):
         raise TypeError("{} is not a base".format(base))
-    return Indexed(base=base, offset=offset)
+    return _indexed(base, offset)
 
 @parse_operand.register(Label)
 def _(operand):
     return operand
 
+@parse_operand.register(BinaryFile)
+def _(operand):
+    return operand
+
+@parse_operand.register(os.PathLike)
+def _(operand):
+    """Parse a path, such as a pathlib.Path, as the whole of a binary file.
+
+    Plain strings are comments, so paths given as strings must be wrapped in a BinaryFile.
+    """
+    return BinaryFile(operand)
+
 
 @singledispatch
 def parse_indirect_operand(operand):
@@ -207,7 +333,7 @@ def _(operand):
         if item < 0:
             raise ValueError("Direct address {} is negative.".format(operand))
         if item <= 0xFFFF:
-            return ExtendedIndirect(item)
+            return _extended_indirect(item)
         raise ValueError("Indirect address 0x{:X} out of range 0x0000-0xFFFF".format(item))
     else:
         raise TypeError("Expected integer address or label. Got {}".format(item))
@@ -225,16 +351,16 @@ def _(item):
     if item < 0:
         raise ValueError("Direct address {} is negative.".format(item))
     if item <= 0xFF:
-        return PageDirect(item)
+        return _page_direct(item)
     if item <= 0xFFFF:
-        return ExtendedDirect(item)
+        return _extended_direct(item)
     raise ValueError("Direct address 0x{:X} out of range 0x0000-0xFFFF".format(item))
 
 @parse_direct_operand.register(U8)
 def _(item):
-    return PageDirect(item.value)
+    return _page_direct(item.value)
 
 @parse_direct_operand.register(U16)
 def _(item):
-    return ExtendedDirect(item.value)
+    return _extended_direct(item.value)
 
@@ -1,8 +1,12 @@
-from collections import defaultdict
+import mmap
+import os
+import struct
 from collections.abc import Iterable
-from functools import singledispatch
+from functools import singledispatch, partial
 from itertools import islice
+from time import perf_counter
 
+from asm68.address_space import AddressSpace, OverlapError
 from asm68.addrmodes import (
     PageDirect,
     ExtendedDirect,
@@ -10,15 +14,19 @@ from asm68.addrmodes import (
     Immediate,
     Indexed,
     Integers,
-    Registers)
-from asm68.util import single
-from asm68.directives import Org, Fcb, Fdb, Call
-from asm68.instructions import Instruction
+    Registers,
+    BinaryFile)
+from asm68.util import single, typename
+from asm68.directives import Org, Fcb, Fdb, Call, Fill, Rmb, Align, IncludeBin, SetDp
+from asm68.instructions import Instruction, LONG_BRANCH_INSTRUCTIONS
 from asm68.label import Label
 from asm68.opcodes import OPCODES, Integral
+from asm68.addrmodecodes import INH, INT, IMM, DIR, IDX, EXT, REL8, REL16
 from asm68.registers import X, Y, U, S, A, B, D, E, F, V, W, Z, AutoIncrementedRegister, PC, CC, DP
 from asm68.twiddle import twos_complement, hi, lo
 from asm68.asmdsl import PROGRAM_COUNTER_LABEL_NAME
+from asm68.stats import AssemblyStats, PassStats, macro_name
+from asm68.cycles import direct_cycles_saved
 
 
 def assemble(statements, *, origin=0, logger=None):
@@ -33,14 +41,24 @@ def assemble(statements, *, origin=0, logger=None):
     return code
 
 
+# The size of the 16-bit address space of the 6809 and 6309
+ADDRESS_SPACE_SIZE = 0x10000
+
+# The length in bytes of a short relative branch instruction, with its 8-bit offset
+SHORT_BRANCH_LENGTH = 2
+
+# The maximum number of passes, excluding those in which relaxable instructions change form
+DEFAULT_MAX_PASSES = 3
+
+
 class TooManyPassesError(Exception):
 
-    def __init__(self, num_passes, unresolved_labels, unreferenced_labels):
+    def __init__(self, num_passes, unresolved_labels, unreferenced_labels, message=None):
         self.num_passes = num_passes
         self.unresolved_labels = unresolved_labels
         self.unreferenced_labels = unreferenced_labels
         super().__init__(
-            f"Too many passes ({self.num_passes})"
+            message or f"Too many passes ({self.num_passes})"
         )
 
     @property
@@ -52,6 +70,194 @@ class TooManyPassesError(Exception):
         return sorted(self.unreferenced_labels)
 
 
+class OscillationError(TooManyPassesError):
+    """The label addresses repeat a cycle from pass to pass, so assembly cannot reach a fixed point.
+
+    This happens when the size of a statement depends on the address of a label
+    which in turn depends on the size of the statement, for example with a CALL
+    macro which emits more code when a label is further away.
+    """
+
+    def __init__(
+            self, num_passes, unresolved_labels, unreferenced_labels, period, oscillating_labels,
+            oscillating_statements,
+    ):
+        """
+        Args:
+            num_passes: The number of passes, including those repeating the cycle
+                to find the oscillating statements.
+
+            unresolved_labels: A set of the names of unresolved labels.
+
+            unreferenced_labels: A set of the names of unreferenced labels.
+
+            period: The number of passes in the cycle.
+
+            oscillating_labels: A mapping from the names of the labels which move
+                to a tuple of their addresses, one for each pass of the cycle.
+
+            oscillating_statements: A tuple of (index, statement, sizes) triples
+                for the top-level statements whose sizes change, where sizes is a
+                tuple of the number of bytes they occupy in each pass of the cycle.
+        """
+        self.period = period
+        self.oscillating_labels = oscillating_labels
+        self.oscillating_statements = oscillating_statements
+        super().__init__(
+            num_passes, unresolved_labels, unreferenced_labels,
+            f"Assembly oscillates between {period} sets of label addresses "
+            f"after {num_passes} passes: {', '.join(self.oscillating_label_names)}",
+        )
+
+    @property
+    def oscillating_label_names(self):
+        return sorted(self.oscillating_labels)
+
+
+class StatementRecord:
+    """The outcome of assembling a single statement in one pass.
+
+    Records the label addresses consumed while encoding the statement,
+    together with the code it emitted, so that a later pass can reuse the
+    code if none of those label addresses have changed.
+    """
+
+    def __init__(self, consumed, code, num_direct_page_accesses=0, direct_page_cycles_saved=0):
+        """
+        Args:
+            consumed: A mapping from label names to the addresses which were
+                used when encoding the statement. The program counter is
+                recorded under PROGRAM_COUNTER_LABEL_NAME for statements
+                whose encoding depends on their own position.
+
+            code: The bytes emitted for the statement.
+
+            num_direct_page_accesses: The number of instructions in the code
+                which use direct addressing in place of extended addressing
+                because their addresses lie within the direct page.
+
+            direct_page_cycles_saved: The number of cycles saved by those
+                instructions using direct addressing.
+        """
+        self._consumed = consumed
+        self._code = code
+        self._num_direct_page_accesses = num_direct_page_accesses
+        self._direct_page_cycles_saved = direct_page_cycles_saved
+
+    @property
+    def consumed(self):
+        return self._consumed
+
+    @property
+    def code(self):
+        return self._code
+
+    @property
+    def num_direct_page_accesses(self):
+        return self._num_direct_page_accesses
+
+    @property
+    def direct_page_cycles_saved(self):
+        return self._direct_page_cycles_saved
+
+    def is_current(self, label_addresses):
+        """Determine whether the recorded code is still valid.
+
+        Args:
+            label_addresses: A mapping from label names to their current addresses.
+
+        Returns:
+            True if every consumed label still has the recorded address, otherwise False.
+        """
+        return all(label_addresses.get(name) == address for name, address in self._consumed.items())
+
+
+class Fixup:
+    """A forward reference to a label, to be patched in place once the label is defined.
+
+    Since the code is assembled into an image of the whole address space, the
+    location of the reference is given by its address, rather than as an offset
+    into a segment.
+    """
+
+    __slots__ = ('_address', '_width', '_label_name', '_base')
+
+    def __init__(self, address, width, label_name, base=None):
+        """
+        Args:
+            address: The address of the bytes to be patched.
+
+            width: The number of bytes to be patched, either 1 or 2.
+
+            label_name: The name of the label referred to.
+
+            base: For relative references, the address from which the offset to
+                the label is measured, which is the address following the
+                instruction. None for absolute references.
+        """
+        self._address = address
+        self._width = width
+        self._label_name = label_name
+        self._base = base
+
+    @property
+    def address(self):
+        return self._address
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def label_name(self):
+        return self._label_name
+
+    @property
+    def base(self):
+        return self._base
+
+    @property
+    def is_relative(self):
+        return self._base is not None
+
+    def __repr__(self):
+        return (
+            f"{typename(self)}(address={self._address}, width={self._width}, "
+            f"label_name={self._label_name!r}, base={self._base!r})"
+        )
+
+
+class ListingEntry:
+    """A statement in the listing of an assembled program, with its address and code."""
+
+    __slots__ = ('_address', '_statement', '_code')
+
+    def __init__(self, address, statement, code):
+        self._address = address
+        self._statement = statement
+        self._code = code
+
+    @property
+    def address(self):
+        return self._address
+
+    @property
+    def statement(self):
+        return self._statement
+
+    @property
+    def code(self):
+        """The bytes emitted for the statement, which are empty for statements which only reserve space."""
+        return self._code
+
+    def __repr__(self):
+        return f"{typename(self)}(address={self._address}, statement={self._statement!r}, code={self._code!r})"
+
+
+class BranchOutOfRangeError(ValueError):
+    """A relative branch target is beyond the range of the branch offset."""
+
+
 class InterRegisterError(Exception):
 
     def __init__(self, message, register):
@@ -66,16 +272,73 @@ class InterRegisterError(Exception):
 
 class Assembler:
 
-    def __init__(self, origin=0, logger=None):
+    def __init__(
+            self, origin=0, logger=None, profile=False, relax=False, listing=False, backpatch=False,
+            max_passes=DEFAULT_MAX_PASSES,
+    ):
+        """
+        Args:
+            origin: The start address for assembly.
+            logger: An optional logger for warnings about the program.
+            profile: If True, time the assembly of each statement by statement
+                type, and of each CALL macro, in addition to the per-pass
+                statistics which are always gathered.
+            relax: If True, short relative branches with targets out of range
+                are promoted to their long equivalents, rather than causing a
+                BranchOutOfRangeError.
+            listing: If True, record the address and code of each statement
+                assembled in the final pass, including those emitted by CALL
+                macros, as the listing.
+            backpatch: If True, forward references to labels are recorded as
+                fixups, which are patched in place at the end of the pass, so
+                that a program with forward references can be assembled in a
+                single pass. Further passes are only required when the size of
+                an instruction changes, for example when a short branch is
+                relaxed. Forward references to addresses within the direct page
+                use extended addressing.
+            max_passes: The default maximum number of passes for assemble(),
+                excluding those in which relaxable instructions change form.
+        """
         self._origin = origin
         self._pos = self.origin
-        self._code = defaultdict(list)  # A dictionary mapping addresses to code fragments represented as lists of bytes strings.
+        self._image = bytearray(ADDRESS_SPACE_SIZE)  # Code is written in place into this image
+        self._code = AddressSpace()  # Maps the origins of completed segments to views of the image
+        self._limit = self._code_limit(origin)  # The address which the current segment cannot extend beyond
         self._label_addresses = {}  # Maps label names to items in _code
         self._unreferenced_labels = set()
         self._unresolved_labels = set()
         self._more_passes_required = True
         self._logger = logger
         self._i = 0
+        self._referenced_labels = set()
+        self._referenced_in_pass = set()  # Labels referenced so far in the current pass
+        self._macro_called_in_pass = False  # Whether a CALL macro has been invoked so far in the current pass
+        self._max_passes = max_passes
+        self._consumed = None  # Label addresses read while encoding the current statement
+        # Maps each direct page to a mapping from (statement type, operand) to records of
+        # label-free instructions, since their encoding may depend on the direct page
+        self._label_free_records_by_page = {None: {}}
+        self._label_free_records = self._label_free_records_by_page[None]
+        # Maps (statement type, operand) to the bytes of label-free FCB and FDB statements,
+        # so that the data is encoded once, and retained only for the life of the Assembler
+        self._data_encodings = {}
+        self._direct_page = None  # The page declared by SETDP, or None if it is unknown
+        self._direct_page_decisions = {}  # Maps (index, ordinal) to whether a labelled address is direct
+        self._num_direct_page_accesses = 0  # In the current pass
+        self._direct_page_cycles_saved = 0  # In the current pass
+        self._encoded_statement_counts = []
+        self._profile = profile
+        self._stats = AssemblyStats()
+        self._included_filepaths = {}  # The absolute paths of included files, as an ordered set
+        self._relax = relax
+        self._index = None  # The index of the top-level statement being assembled
+        self._relaxable_index = None  # The index of the top-level statement in which _num_relaxable were counted
+        self._num_relaxable = 0  # The number of relaxable instructions so far in the top-level statement
+        self._promoted_branches = {}  # Maps (index, ordinal) to promoted long branch statements
+        self._num_relaxations = 0  # The number of changes to the forms of relaxable instructions
+        self._listing = [] if listing else None  # ListingEntry items for the current pass
+        self._backpatch = backpatch
+        self._fixups = []  # Forward references to be patched at the end of the current pass
 
     def __str__(self):
         lines = [
@@ -94,18 +357,24 @@ class Assembler:
 
     @origin.setter
     def origin(self, value):
+        self._close_segment()
         # If the origin falls within an existing fragment, reject the change
-        self._flatten()
-        if self._in_existing_fragment(value):
-            raise ValueError("Origin address 0x{:04X} lies within existing code fragment".format(value))
+        existing_origin = self._code.block_containing(value)
+        if existing_origin is not None:
+            raise OverlapError(
+                "Origin address 0x{:04X} lies within existing code fragment".format(value),
+                value, value,
+                existing_origin, existing_origin + len(self._code[existing_origin]),
+            )
         self._origin = value
         self._pos = self._origin
+        self._limit = self._code_limit(value)
 
     @property
     def unresolved_labels(self):
         """A set of unresolved labels.
         """
-        return self._unreferenced_labels
+        return self._unresolved_labels
 
     @property
     def unreferenced_labels(self):
@@ -119,44 +388,459 @@ class Assembler:
         """
         return self._label_addresses
 
-    def _in_existing_fragment(self, value):
+    @property
+    def num_passes(self):
+        """The number of passes taken by the most recent call to assemble()."""
+        return self._i
 
-        return any(value in range(address, len(code[0])) for address, code in self._code.items())
+    @property
+    def encoded_statement_counts(self):
+        """The number of statements encoded afresh in each pass.
 
-    def _flatten(self):
-        self._code = defaultdict(
-            list,
-            ((address, [b''.join(fragments)])
-             for address, fragments in self._code.items()))
+        Statements with code reused unchanged from the previous pass are not counted.
+        """
+        return tuple(self._encoded_statement_counts)
+
+    @property
+    def direct_page(self):
+        """The direct page declared by the most recent SETDP, or None if it is unknown."""
+        return self._direct_page
+
+    def _set_direct_page(self, page):
+        self._direct_page = page
+        self._label_free_records = self._label_free_records_by_page.setdefault(page, {})
+
+    @property
+    def num_promoted_branches(self):
+        """The number of short branches promoted to long branches by relaxation."""
+        return len(self._promoted_branches)
+
+    @property
+    def num_fixups(self):
+        """The number of forward references patched in place in the final pass."""
+        return len(self._fixups)
+
+    @property
+    def listing(self):
+        """A tuple of ListingEntry items, one for each statement in the final pass, or None if listing is disabled."""
+        return None if self._listing is None else tuple(self._listing)
+
+    @property
+    def included_filepaths(self):
+        """The absolute paths of the binary files included by the most recent call to assemble()."""
+        return tuple(self._included_filepaths)
+
+    @property
+    def stats(self):
+        """The AssemblyStats gathered by the most recent call to assemble()."""
+        return self._stats
+
+    def _code_limit(self, origin):
+        """The address beyond which a segment starting at origin cannot extend."""
+        limit = self._code.limit(origin)
+        return len(self._image) if limit is None else limit
+
+    def _close_segment(self):
+        """Add the current segment, if it is non-empty, to the completed segments."""
+        if self._pos > self._origin:
+            self._code.insert(self._origin, memoryview(self._image)[self._origin:self._pos])
+        self._pos = self._origin
+
+    def _discard_code(self):
+        """Discard all segments, so that code can be emitted afresh."""
+        self._code = AddressSpace()
+        self._pos = self._origin
 
     def _extend(self, code):
-        # TODO: Check that we're not extending into an existing fragment - use interval tree for this
-        c = bytes(code)
-        self._code[self.origin].append(c)
-        self._pos += len(c)
+        """Write code in place into the image at the current position."""
+        stop = self._pos + len(code)
+        if stop > self._limit:
+            self._raise_overrun(stop)
+        self._image[self._pos:stop] = code
+        self._pos = stop
+
+    def _fill(self, value, count):
+        """Write count copies of a byte value into the image at the current position."""
+        stop = self._pos + count
+        if stop > self._limit:
+            self._raise_overrun(stop)
+        self._image[self._pos:stop] = bytes((value,)) * count
+        self._pos = stop
+
+    def _include(self, path, offset, length):
+        """Write a slice of a binary file into the image at the current position.
+
+        The file is memory-mapped, so its contents are copied directly from the
+        page cache into the image.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            stop = size if length is None else offset + length
+            if stop > size or offset > size:
+                raise ValueError(
+                    "Bytes {} to {} are beyond the end of {!r} which is {} bytes long"
+                    .format(offset, stop, path, size)
+                )
+            self._included_filepaths[os.path.abspath(path)] = None
+            if stop > offset:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view, view[offset:stop] as data:
+                    self._extend(data)
+
+    def _reserve(self, num_bytes):
+        """Advance the current position without emitting code.
+
+        The reserved space is left out of the object code, by closing the current
+        segment and starting a new one beyond the reserved space.
+        """
+        if num_bytes == 0:
+            return
+        stop = self._pos + num_bytes
+        if stop > self._limit:
+            self._raise_overrun(stop)
+        self._close_segment()
+        self._origin = stop
+        self._pos = stop
+
+    def _raise_overrun(self, stop):
+        if self._limit == len(self._image):
+            raise ValueError(
+                "Code at 0x{:04X} extends beyond the end of the address space at 0x{:04X}"
+                .format(self._pos, self._limit - 1)
+            )
+        raise OverlapError(
+            "Code at 0x{:04X} to 0x{:04X} extends into existing code fragment at 0x{:04X}"
+            .format(self._pos, stop - 1, self._limit),
+            self._pos, stop,
+            self._limit, self._limit + len(self._code[self._limit]),
+        )
+
+    def _code_since(self, pos):
+        """The code emitted into the current segment from the given address onwards."""
+        return bytes(self._image[pos:self._pos])
 
     def object_code(self):
-        self._flatten()
-        return {address: fragments[0] for address, fragments in self._code.items()}
+        """The assembled code.
 
-    def assemble(self, statements, origin=0, max_passes=3):
-        # Do multi-pass assembly
+        Returns:
+            An AddressSpace mapping the origin address of each segment to a memoryview of the
+            code it contains. The views refer directly to the image into which the code was
+            assembled, so no copies are made.
+        """
+        code = AddressSpace(self._code.items())
+        if self._pos > self._origin:
+            code.insert(self._origin, memoryview(self._image)[self._origin:self._pos])
+        return code
+
+    def assemble(self, statements, origin=0, max_passes=None):
+        """Assemble statements, in as many passes as are required to reach a fixed point.
+
+        Each pass after the first re-encodes only those statements which consumed
+        labels which have since moved, or which were unresolved, reusing the
+        recorded code of the remainder. A fixed point is reached when every label
+        address read in a pass is the address at which the label is defined in
+        that pass, so labels which move between passes, but which are only read
+        after they are defined, do not require a further pass.
+
+        Args:
+            statements: The sequence of statements to be assembled.
+            origin: The start address for assembly.
+            max_passes: The maximum number of passes, excluding those in which
+                relaxable instructions change form. Defaults to the max_passes
+                given to the constructor.
+
+        Raises:
+            OscillationError: If the label addresses repeat a cycle from pass to pass.
+            TooManyPassesError: If there is no fixed point within max_passes, or the
+                label addresses stop changing while labels remain unresolved.
+        """
+        max_passes = self._max_passes if max_passes is None else max_passes
         self._i = 0
+        self._more_passes_required = True
+        self._label_addresses = {}
+        self._unresolved_labels = set()
+        self._unreferenced_labels = set()
+        self._referenced_labels = set()
+        self._encoded_statement_counts.clear()
+        self._stats = AssemblyStats()
+        self._included_filepaths.clear()
+        self._promoted_branches.clear()
+        self._direct_page_decisions.clear()
+        num_relaxation_passes = 0
+        assemble_incrementally = (
+            self._assemble_incrementally_profiled if self._profile else self._assemble_incrementally
+        )
+        if self._listing is not None:
+            assemble_incrementally = partial(self._assemble_incrementally_listed, assemble_incrementally)
+        records = {}
+        label_tables = []  # The label addresses at the end of each pass
+        passes_by_state = {}  # Maps the label addresses and number of relaxations to the pass which reached them
+        # Views returned by object_code() after any previous assembly continue to
+        # refer to the previous image
+        self._image = bytearray(ADDRESS_SPACE_SIZE)
         while self._more_passes_required:
-            self._more_passes_required = False
-            self._code.clear()
-            self.origin = origin
-            for statement in statements:
-                self.assemble_statement(statement)
-            self._i += 1
-            if self._i > max_passes:
-                raise TooManyPassesError(
-                    num_passes=self._i,
-                    unresolved_labels=self._unresolved_labels,
-                    unreferenced_labels=self._unreferenced_labels
-                )
+            num_relaxations = self._num_relaxations
+            records = self._assemble_pass(statements, origin, records, assemble_incrementally)
+            if self._num_relaxations > num_relaxations:
+                # Each relaxable instruction changes form at most twice, so passes which
+                # change forms are not counted against max_passes, and the number of
+                # passes is bounded
+                num_relaxation_passes += 1
+            if not self._more_passes_required:
+                break
+            label_table = self._label_table()
+            label_tables.append(label_table)
+            state = (frozenset(label_table.items()), self._num_relaxations)
+            previous_pass = passes_by_state.get(state)
+            if previous_pass is not None:
+                period = self._i - previous_pass
+                if period > 1:
+                    raise self._oscillation_error(
+                        statements, origin, records, assemble_incrementally, label_tables[-period:]
+                    )
+                # Nothing changed in this pass, so further passes cannot resolve any labels
+                raise self._too_many_passes_error()
+            passes_by_state[state] = self._i
+            if self._i >= max_passes + num_relaxation_passes:
+                raise self._too_many_passes_error()
+        self._stats.set_direct_page_accesses(self._num_direct_page_accesses, self._direct_page_cycles_saved)
         self._warn_about_unreferenced_labels()
 
+    def _assemble_pass(self, statements, origin, previous_records, assemble_incrementally):
+        """Assemble each of the statements once.
+
+        Returns:
+            A mapping from the indexes of statements to the StatementRecords with
+            which their code can be reused in the next pass.
+        """
+        pass_start = perf_counter()
+        self._more_passes_required = False
+        self._referenced_in_pass.clear()
+        self._macro_called_in_pass = False
+        self._discard_code()
+        self.origin = origin
+        records = {}
+        num_encoded = 0
+        self._relaxable_index = None
+        self._set_direct_page(None)
+        self._num_direct_page_accesses = 0
+        self._direct_page_cycles_saved = 0
+        if self._listing is not None:
+            self._listing.clear()
+        self._fixups.clear()
+        for index, statement in enumerate(statements):
+            self._index = index
+            record = assemble_incrementally(statement, previous_records.get(index))
+            if record is None:
+                num_encoded += 1
+            else:
+                records[index] = record
+                if record is not previous_records.get(index):
+                    num_encoded += 1
+        self._apply_fixups()
+        if self._listing is not None and self._fixups:
+            self._relist_code()
+        self._encoded_statement_counts.append(num_encoded)
+        self._i += 1
+        self._stats.add_pass(PassStats(
+            number=self._i,
+            duration=perf_counter() - pass_start,
+            num_statements=len(statements),
+            num_encoded=num_encoded,
+            num_bytes=sum(map(len, self._code.values())) + self._pos - self._origin,
+            num_unresolved_labels=len(self._unresolved_labels),
+        ))
+        return records
+
+    def _label_table(self):
+        """A copy of the label addresses, excluding the program counter."""
+        label_table = dict(self._label_addresses)
+        label_table.pop(PROGRAM_COUNTER_LABEL_NAME, None)
+        return label_table
+
+    def _too_many_passes_error(self):
+        return TooManyPassesError(
+            num_passes=self._i,
+            unresolved_labels=self._unresolved_labels,
+            unreferenced_labels=self._unreferenced_labels
+        )
+
+    def _oscillation_error(self, statements, origin, records, assemble_incrementally, label_tables):
+        """Describe an oscillation, given the label tables of each pass in its cycle.
+
+        The passes of the cycle are repeated, measuring the size of each top-level
+        statement, to find the statements whose sizes change.
+        """
+        period = len(label_tables)
+        label_names = set().union(*label_tables)
+        oscillating_labels = {
+            name: addresses
+            for name, addresses in ((name, tuple(t.get(name) for t in label_tables)) for name in label_names)
+            if len(set(addresses)) > 1
+        }
+        sizes_by_pass = []
+        for _ in range(period):
+            sizes = []
+            measured = partial(self._assemble_incrementally_measured, sizes, assemble_incrementally)
+            records = self._assemble_pass(statements, origin, records, measured)
+            sizes_by_pass.append(sizes)
+        oscillating_statements = tuple(
+            (index, statement, sizes)
+            for index, (statement, sizes) in enumerate(zip(statements, zip(*sizes_by_pass)))
+            if len(set(sizes)) > 1
+        )
+        return OscillationError(
+            num_passes=self._i,
+            unresolved_labels=self._unresolved_labels,
+            unreferenced_labels=self._unreferenced_labels,
+            period=period,
+            oscillating_labels=oscillating_labels,
+            oscillating_statements=oscillating_statements,
+        )
+
+    def _assemble_incrementally_measured(self, sizes, assemble_incrementally, statement, previous_record):
+        pos = self.pos
+        record = assemble_incrementally(statement, previous_record)
+        sizes.append(self.pos - pos)
+        return record
+
+    def _apply_fixups(self):
+        """Patch the forward references of the current pass with the addresses of their labels.
+
+        References to labels which are still undefined are left as zeros, and
+        require a further pass, as do relative references which are out of range
+        when relaxing branches, so that the branches can be promoted.
+
+        Raises:
+            BranchOutOfRangeError: If a relative reference is out of range and
+                branches are not being relaxed.
+        """
+        for fixup in self._fixups:
+            target_address = self._label_addresses.get(fixup.label_name)
+            if target_address is None:
+                self._more_passes_required = True
+                continue
+            value = target_address
+            if fixup.is_relative:
+                try:
+                    value = twos_complement(target_address - fixup.base, fixup.width * 8)
+                except ValueError as e:
+                    if self._relax:
+                        self._more_passes_required = True
+                        continue
+                    raise BranchOutOfRangeError(
+                        "Branch offset at 0x{:04X} to {} at 0x{:04X} is out of range of a {}-bit offset"
+                        .format(fixup.address, fixup.label_name, target_address, fixup.width * 8)
+                    ) from e
+            self._image[fixup.address:fixup.address + fixup.width] = self.value_to_bytes(value, fixup.width)
+
+    def _assemble_incrementally(self, statement, previous_record):
+        """Assemble a top-level statement, reusing the code from the previous pass if possible.
+
+        Args:
+            statement: The statement to be assembled.
+            previous_record: The StatementRecord for this statement from the previous pass,
+                or None.
+
+        Returns:
+            A StatementRecord which can be used to reuse the code in the next pass, or None
+            if the statement cannot be reused.
+        """
+        self._label_addresses[PROGRAM_COUNTER_LABEL_NAME] = self.pos
+        self._label_statement(statement)
+        if previous_record is not None and previous_record.is_current(self._label_addresses):
+            self._reuse(previous_record)
+            return previous_record
+
+        record = self._label_free_record(statement)
+        if record is not None:
+            self._reuse_label_free(record)
+            return record
+
+        if not isinstance(statement, INCREMENTAL_STATEMENT_TYPES):
+            assemble_statement(statement, self)
+            return None
+
+        pos = self.pos
+        num_direct_page_accesses = self._num_direct_page_accesses
+        direct_page_cycles_saved = self._direct_page_cycles_saved
+        self._consumed = {}
+        try:
+            assemble_statement(statement, self)
+            consumed = self._consumed
+        finally:
+            self._consumed = None
+        if None in consumed.values():
+            return None
+        return self._label_free_record(statement) or StatementRecord(
+            consumed,
+            self._code_since(pos),
+            self._num_direct_page_accesses - num_direct_page_accesses,
+            self._direct_page_cycles_saved - direct_page_cycles_saved,
+        )
+
+    def _label_free_record(self, statement):
+        """The record of an earlier encoding of an equal label-free instruction, or None.
+
+        Label-free instructions neither consume label addresses nor depend on their
+        own position, so they encode identically wherever, and in whichever pass,
+        they occur.
+        """
+        try:
+            return self._label_free_records.get((type(statement), statement.operand))
+        except TypeError:  # Unhashable operand
+            return None
+
+    def _assemble_incrementally_profiled(self, statement, previous_record):
+        start = perf_counter()
+        try:
+            return self._assemble_incrementally(statement, previous_record)
+        finally:
+            self._stats.add_statement(statement_type_name(statement), perf_counter() - start)
+
+    def _assemble_incrementally_listed(self, assemble_incrementally, statement, previous_record):
+        address, origin = self.pos, self.origin
+        record = assemble_incrementally(statement, previous_record)
+        self._list(statement, address, origin)
+        return record
+
+    def _list(self, statement, address, origin):
+        """Add a statement to the listing, given the position and origin before it was assembled.
+
+        CALL statements are not listed, since the statements they emit are listed instead.
+        """
+        if not isinstance(statement, Call):
+            code = bytes(self._image[address:self._pos]) if self._origin == origin else bytes()
+            self._listing.append(ListingEntry(address, statement, code))
+
+    def _relist_code(self):
+        """Replace the code of each listed statement with its code in the image, which includes any fixups."""
+        self._listing[:] = [
+            ListingEntry(entry.address, entry.statement, bytes(self._image[entry.address:entry.address + len(entry.code)]))
+            if entry.code else entry
+            for entry in self._listing
+        ]
+
+    def _macro_called(self, macro, duration):
+        self._macro_called_in_pass = True
+        if self._profile:
+            self._stats.add_macro(macro_name(macro), duration)
+
+    def _reuse_label_free(self, record):
+        if self._direct_page is not None:
+            self._num_direct_page_accesses += record.num_direct_page_accesses
+            self._direct_page_cycles_saved += record.direct_page_cycles_saved
+        self._extend(record.code)
+
+    def _reuse(self, record):
+        for name in record.consumed:
+            self._unresolved_labels.discard(name)
+            self._unreferenced_labels.discard(name)
+            self._referenced_in_pass.add(name)
+        self._num_direct_page_accesses += record.num_direct_page_accesses
+        self._direct_page_cycles_saved += record.direct_page_cycles_saved
+        self._extend(record.code)
+
     def _warn_about_unreferenced_labels(self):
         if self._logger:
             for label in self.unreferenced_labels:
@@ -177,8 +861,14 @@ class Assembler:
                     if self._i == 0:
                         raise RuntimeError("Label {} already used previously."
                                            .format(label))
+                    # The label has moved since the previous pass, so code which read
+                    # its previous address earlier in this pass, or CALL macros which
+                    # may have read it, must be assembled again
+                    if label.name in self._referenced_in_pass or self._macro_called_in_pass:
+                        self._more_passes_required = True
             self._label_addresses[label.name] = self.pos
-            self._unreferenced_labels.add(label.name)
+            if label.name not in self._referenced_labels:
+                self._unreferenced_labels.add(label.name)
             self._unresolved_labels.discard(label.name)
             label = label.chained_label
 
@@ -190,7 +880,7 @@ class Assembler:
 
     def assemble_immediate_operand(self, operand, opcode_key, statement, opcode_bytes):
         if isinstance(operand, Label):
-            result = self.assemble_label_operand(operand)
+            result = self.assemble_label_operand(operand, opcode_bytes)
         else:
             assert statement.inherent_register.width in {1, 2}  # TODO: 32-bit Q register
 
@@ -222,7 +912,7 @@ class Assembler:
 
     def assemble_extended_direct_operand(self, operand, opcode_key, statement, opcode_bytes):
         if isinstance(operand.address, Label):
-            result = self.assemble_label_operand(operand.address)
+            result = self.assemble_label_operand(operand.address, opcode_bytes)
         else:
             result = (hi(operand.address), lo(operand.address))
         return bytes(result)
@@ -277,19 +967,24 @@ class Assembler:
         return self._assemble_relative_operand(operand, operand_bytes_length=2, opcode_bytes=opcode_bytes)
 
     def _assemble_relative_operand(self, operand, operand_bytes_length, opcode_bytes):
-        if isinstance(operand.address, Label):
-            if operand.name in self._label_addresses:
-                target_address = self._label_addresses[operand.name]
+        if isinstance(operand, Label):
+            target_address = self._resolve_label(operand.name)
+            if target_address is not None:
+                self._consume_pos()
                 # TODO: Consider threading opcode_bytes through as an argument
                 offset = target_address - self.pos - len(opcode_bytes) - operand_bytes_length
-                unsigned_offset = twos_complement(offset, operand_bytes_length * 8)
+                try:
+                    unsigned_offset = twos_complement(offset, operand_bytes_length * 8)
+                except ValueError as e:
+                    raise BranchOutOfRangeError(
+                        "Branch at 0x{:04X} to {} at 0x{:04X} is out of range of a {}-bit offset"
+                        .format(self.pos, operand.name, target_address, operand_bytes_length * 8)
+                    ) from e
                 result = self.value_to_bytes(unsigned_offset, operand_bytes_length)
-                self._unresolved_labels.discard(operand.name)
             else:
-                self._more_passes_required = True
+                address = self.pos + len(opcode_bytes)
+                self._defer(operand.name, address, operand_bytes_length, base=address + operand_bytes_length)
                 result = bytes(operand_bytes_length)
-                self._unresolved_labels.add(operand.name)
-            self._unreferenced_labels.discard(operand.name)
         else:
             # TODO: What if the operand is a number?
             raise NotImplementedError
@@ -305,8 +1000,7 @@ class Assembler:
             assert False, f"Unexpected operand bytes length {operand_bytes_length}"
         return result
 
-    @staticmethod
-    def assemble_register_operand(operand, opcode_key, statement, opcode_bytes):
+    def assemble_register_operand(self, operand, opcode_key, statement, opcode_bytes):
         assert isinstance(operand, Registers)
         source, target = operand.registers
         try:
@@ -320,24 +1014,200 @@ class Assembler:
         result = (source_nybble << 4) | target_nybble
         return bytes((result,))
 
-    def assemble_label_operand(self, label):
-        if label.name in self._label_addresses:
-            target_address = self._label_addresses[label.name]
-            self._unresolved_labels.discard(label.name)
-            result = (hi(target_address), lo(target_address))
+    def assemble_label_operand(self, label, opcode_bytes=bytes()):
+        target_address = self._resolve_label(label.name)
+        if target_address is None:
+            self._defer(label.name, self.pos + len(opcode_bytes), 2)
+            return (0, 0)
+        return (hi(target_address), lo(target_address))
+
+    def _resolve_label(self, name):
+        """Look up the address of a label, noting the reference.
+
+        Args:
+            name: The name of the label.
+
+        Returns:
+            The address of the label, or None if the label has not (yet) been defined,
+            in which case a further pass is required, unless backpatching.
+        """
+        target_address = self._label_addresses.get(name)
+        if self._consumed is not None:
+            self._consumed[name] = target_address
+        if target_address is None:
+            if not self._backpatch:
+                self._more_passes_required = True
+            self._unresolved_labels.add(name)
         else:
-            self._more_passes_required = True
-            self._unresolved_labels.add(label.name)
-            result = (0, 0)
-        self._unreferenced_labels.discard(label.name)
-        return result
+            self._unresolved_labels.discard(name)
+        self._referenced_labels.add(name)
+        self._referenced_in_pass.add(name)
+        self._unreferenced_labels.discard(name)
+        return target_address
+
+    def _defer(self, name, address, width, base=None):
+        """Note a reference to an unresolved label, emitted as zeros at an address.
+
+        When backpatching, the reference is recorded as a Fixup to be patched at the
+        end of the pass. Otherwise _resolve_label() will already have required a
+        further pass.
+        """
+        if self._backpatch:
+            self._fixups.append(Fixup(address, width, name, base))
+
+    def _relaxed_branch(self, statement):
+        """The form in which to assemble a short branch when relaxing branches.
+
+        Branches are assumed to be short until their targets are found to be out
+        of range, whereupon they are promoted to their long equivalents for this
+        and all subsequent passes.
+
+        Returns:
+            The statement itself, or the equivalent long branch statement.
+        """
+        key = self._relaxable_key()
+        long_statement = self._promoted_branches.get(key)
+        if long_statement is not None:
+            return long_statement
+        operand = statement.operand
+        target_address = self._label_addresses.get(operand.name) if isinstance(operand, Label) else None
+        if target_address is None or -128 <= target_address - self.pos - SHORT_BRANCH_LENGTH <= 127:
+            return statement
+        long_statement = LONG_BRANCH_INSTRUCTIONS[type(statement)](operand, statement.comment)
+        self._promoted_branches[key] = long_statement
+        self._num_relaxations += 1
+        return long_statement
+
+    def _direct_page_form(self, statement):
+        """The form in which to assemble an instruction with an extended address when the direct page is known.
+
+        Numeric addresses within the direct page always use direct addressing, except
+        those in page zero, which can only have been given explicitly as extended
+        addresses, for example with U16. Labelled addresses use direct addressing once
+        they are found to be within the direct page, and revert to extended addressing
+        for this and all subsequent passes should they move out of it.
+
+        Returns:
+            The statement itself, or an equivalent statement with direct addressing.
+        """
+        address = statement.operand.address
+        if isinstance(address, Label):
+            key = self._relaxable_key()
+            is_direct = self._direct_page_decisions.get(key)
+            if is_direct is False:
+                return statement
+            address = self._resolve_label(address.name)
+            if address is None:
+                if self._backpatch:
+                    # Forward references are patched in place, so keep the size of
+                    # extended addressing
+                    self._direct_page_decisions[key] = False
+                return statement
+            in_page = (address >> 8) == self._direct_page
+            if is_direct is None or not in_page:
+                self._direct_page_decisions[key] = in_page
+                if in_page != bool(is_direct):
+                    self._num_relaxations += 1
+            if not in_page:
+                return statement
+        elif (address >> 8) != self._direct_page or address <= 0xFF:
+            return statement
+        self._num_direct_page_accesses += 1
+        self._direct_page_cycles_saved += direct_cycles_saved(statement.mnemonic.key)
+        return type(statement)(PageDirect(lo(address)), statement.comment)
+
+    def _relaxable_key(self):
+        """A key identifying the current relaxable instruction from pass to pass.
+
+        Relaxable instructions are identified by the index of the top-level statement
+        in which they occur, together with their ordinal within its expansion, so those
+        emitted by CALL macros can be relaxed too.
+        """
+        if self._relaxable_index != self._index:
+            self._relaxable_index = self._index
+            self._num_relaxable = 0
+        key = (self._index, self._num_relaxable)
+        self._num_relaxable += 1
+        return key
+
+    def _consume_pos(self):
+        """Note that the encoding of the current statement depends on its own address."""
+        if self._consumed is not None:
+            self._consumed[PROGRAM_COUNTER_LABEL_NAME] = self.pos
+
 
 @singledispatch
 def assemble_statement(statement, asm):
     raise TypeError("Statement {} could not be assembled".format(statement))
 
 @assemble_statement.register(Instruction)
-def _(statement, asm):
+def assemble_instruction(statement, asm):
+    """Assemble an instruction, reusing its code if an equal instruction has been encoded before.
+
+    The code of instructions whose encoding neither consumed a label address nor
+    depended on their own position is retained by the assembler, so that equal
+    instructions, including those emitted by CALL macros and those in later
+    passes, are not encoded again.
+    """
+    record = asm._label_free_record(statement)
+    if record is not None:
+        asm._reuse_label_free(record)
+        return
+    num_direct_page_accesses = asm._num_direct_page_accesses
+    direct_page_cycles_saved = asm._direct_page_cycles_saved
+    outer_consumed = asm._consumed
+    asm._consumed = consumed = {}
+    try:
+        form = statement
+        if asm._relax and type(statement) in LONG_BRANCH_INSTRUCTIONS:
+            form = asm._relaxed_branch(statement)
+        elif asm._direct_page is not None and isinstance(statement.operand, ExtendedDirect):
+            form = asm._direct_page_form(statement)
+        code = encode_instruction(form, asm)
+    finally:
+        asm._consumed = outer_consumed
+        if outer_consumed is not None:
+            outer_consumed.update(consumed)
+    if not consumed:
+        try:
+            asm._label_free_records[(type(statement), statement.operand)] = StatementRecord(
+                consumed,
+                code,
+                asm._num_direct_page_accesses - num_direct_page_accesses,
+                asm._direct_page_cycles_saved - direct_page_cycles_saved,
+            )
+        except TypeError:  # Unhashable operand
+            pass
+    asm._extend(code)
+
+
+def encode_instruction(statement, asm):
+    """Encode an instruction using the precompiled ENCODINGS table.
+
+    Returns:
+        The bytes of the instruction.
+    """
+    operand = statement.operand
+    key = (statement.mnemonic.key, type(operand))
+    try:
+        encoding = ENCODINGS[key]
+    except KeyError:
+        encoding = ENCODINGS[key] = compile_encoding(*key)
+    if encoding is None:
+        return encode_instruction_dynamically(statement, asm)
+    opcode_key, opcode_bytes, encoder = encoding
+    return opcode_bytes + encoder(asm, operand, opcode_key, statement, opcode_bytes)
+
+
+def encode_instruction_dynamically(statement, asm):
+    """Encode an instruction without using the precompiled ENCODINGS table.
+
+    This is the general path, which determines the opcode and the operand encoder
+    afresh for each instruction.
+
+    Returns:
+        The bytes of the instruction.
+    """
     operand = statement.operand
 
     operating_addressing_modes = set(operand.codes)
@@ -349,7 +1219,7 @@ def _(statement, asm):
     #       Maybe assemble_with_operand instead of assembling
     #       the opcode separately here
     operand_bytes = statement.assemble_operand(operand, opcode_key, asm, opcode_bytes)
-    asm._extend(opcode_bytes + operand_bytes)
+    return opcode_bytes + operand_bytes
 
 
 @assemble_statement.register(Org)
@@ -363,15 +1233,9 @@ def _(statement, asm):
 @assemble_statement.register(Fcb)
 def _(statement, asm):
     operand = statement.operand
-    if not isinstance(operand, Integers):
+    if not isinstance(operand, Integers) or operand.has_labels:
         raise TypeError("FCB value must be integers")
-    try:
-        b = bytes(operand)
-    except ValueError as e:
-        g = ((i, v) for i, v in enumerate(operand) if not v in range(0, 256))
-        i, v = next(islice(g, 1))
-        raise ValueError("FCB value {} at index {} not in range(0, 256)".format(v, i)) from e
-    asm._extend(b)
+    asm._extend(encoded_data(statement, asm, fcb_bytes))
 
 
 @assemble_statement.register(Fdb)
@@ -379,31 +1243,160 @@ def _(statement, asm):
     operand = statement.operand
     if not isinstance(operand, Integers):
         raise TypeError("FDB value must be integers")
-    b = bytearray()
-    for i, v in enumerate(operand):
-        hi, lo = fdb_value(v, asm)
-        b.append(hi)
-        b.append(lo)
-    asm._extend(b)
-
-
-def fdb_value(v, asm):
-    if isinstance(v, Label):
-        if v.name in asm._label_addresses:
-            value = asm._label_addresses[v.name]
-            asm._unresolved_labels.discard(v.name)
-        else:
-            value = 0
-            asm._more_passes_required = True
-            asm._unresolved_labels.add(v.name)
-        asm._unreferenced_labels.discard(v.name)
+    if operand.has_labels:
+        # Only the labels need resolving, and the result cannot be cached
+        # since the label addresses may change from pass to pass
+        values = [
+            fdb_label_value(v, asm, asm.pos + 2 * i) if isinstance(v, Label) else v
+            for i, v in enumerate(operand.items)
+        ]
+        asm._extend(pack_words(values))
+    else:
+        asm._extend(encoded_data(statement, asm, fdb_bytes))
+
+
+def encoded_data(statement, asm, encoder):
+    """The bytes of a label-free data statement, encoded once per Assembler.
+
+    Args:
+        statement: An FCB or FDB statement with a label-free operand.
+        asm: The Assembler.
+        encoder: A function which encodes the operand as bytes.
+
+    Returns:
+        The bytes of the statement.
+    """
+    key = (type(statement), statement.operand)
+    try:
+        return asm._data_encodings[key]
+    except KeyError:
+        code = asm._data_encodings[key] = encoder(statement.operand)
+        return code
+
+
+def fcb_bytes(operand):
+    """Encode label-free FCB Integers as bytes.
+
+    Raises:
+        ValueError: If any of the integers is not in range(0, 256).
+    """
+    try:
+        return bytes(operand.items)
+    except ValueError as e:
+        i, v = first_out_of_range(operand.items, 256)
+        raise ValueError("FCB value {} at index {} not in range(0, 256)".format(v, i)) from e
+
+
+def fdb_bytes(operand):
+    """Encode label-free FDB Integers as big-endian 16-bit words.
+
+    Raises:
+        ValueError: If any of the integers is not in range(0, 65536).
+    """
+    return pack_words(operand.items)
+
+
+def pack_words(values):
+    """Pack a sequence of integers as big-endian 16-bit words.
+
+    Raises:
+        ValueError: If any of the values is not in range(0, 65536).
+    """
+    try:
+        return struct.pack(">{}H".format(len(values)), *values)
+    except struct.error as e:
+        _, value = first_out_of_range(values, 65536)
+        raise ValueError(f"FDB value {value} (0x{value:04x}) not in 0–65535 (0x0000-0xFFFF)") from e
+
+
+def first_out_of_range(values, stop):
+    """The index and value of the first of some values not in range(0, stop)."""
+    g = ((i, v) for i, v in enumerate(values) if v not in range(0, stop))
+    return next(islice(g, 1))
+
+
+@assemble_statement.register(Fill)
+def _(statement, asm):
+    operand = statement.operand
+    if not (isinstance(operand, Integers) and len(operand) == 2 and all(isinstance(v, Integral) for v in operand)):
+        raise TypeError("FILL operand must be a (value, count) pair of integers")
+    value, count = operand
+    if value not in range(0, 256):
+        raise ValueError("FILL value {} not in range(0, 256)".format(value))
+    if count < 0:
+        raise ValueError("FILL count {} is negative".format(count))
+    asm._fill(value, count)
+
+
+@assemble_statement.register(Rmb)
+def _(statement, asm):
+    operand = statement.operand
+    if not isinstance(operand, Immediate):
+        raise TypeError("{} operand must be an immediate value".format(statement.mnemonic))
+    if operand.value < 0:
+        raise ValueError("{} size {} is negative".format(statement.mnemonic, operand.value))
+    asm._reserve(operand.value)
+
+
+@assemble_statement.register(Align)
+def _(statement, asm):
+    """Advance to the next multiple of a boundary.
+
+    With an immediate operand, the space up to the boundary is reserved. With a
+    (boundary, value) pair of integers, it is filled with the value.
+    """
+    operand = statement.operand
+    if isinstance(operand, Immediate):
+        boundary, value = operand.value, None
+    elif isinstance(operand, Integers) and len(operand) == 2 and all(isinstance(v, Integral) for v in operand):
+        boundary, value = operand
+    else:
+        raise TypeError("ALIGN operand must be an immediate boundary or a (boundary, value) pair of integers")
+    if boundary < 1:
+        raise ValueError("ALIGN boundary {} is not positive".format(boundary))
+    count = -asm.pos % boundary
+    if value is None:
+        asm._reserve(count)
+    elif value not in range(0, 256):
+        raise ValueError("ALIGN value {} not in range(0, 256)".format(value))
     else:
-        value = v
-    if value not in range(0, 65536):
-        raise ValueError(f"FDB value {value} (0x{value:04x}) not in 0–65535 (0x0000-0xFFFF)")
-    hi = (value >> 8) & 0xff
-    lo = value & 0xff
-    return hi, lo
+        asm._fill(value, count)
+
+
+@assemble_statement.register(SetDp)
+def _(statement, asm):
+    """Declare the page to which the DP register will be set when the following code runs.
+
+    SETDP emits no code. Instructions with extended addresses within the declared
+    page are assembled with direct addressing instead. SETDP with no operand
+    declares that the direct page is unknown.
+    """
+    operand = statement.operand
+    if isinstance(operand, Inherent):
+        asm._set_direct_page(None)
+        return
+    if not isinstance(operand, Immediate):
+        raise TypeError("SETDP operand must be an immediate page number")
+    if operand.value not in range(0, 256):
+        raise ValueError("SETDP page {} not in range(0, 256)".format(operand.value))
+    asm._set_direct_page(operand.value)
+
+
+@assemble_statement.register(IncludeBin)
+def _(statement, asm):
+    operand = statement.operand
+    if not isinstance(operand, BinaryFile):
+        raise TypeError("INCLUDEBIN operand must be a BinaryFile or a path")
+    asm._include(operand.path, operand.offset, operand.length)
+
+
+def fdb_label_value(label, asm, address):
+    """The address of a label for an FDB word at an address, or zero if it is not yet resolved."""
+    value = asm._resolve_label(label.name)
+    if value is None:
+        asm._defer(label.name, address, 2)
+        return 0
+    return value
 
 
 @assemble_statement.register(Call)
@@ -420,16 +1413,43 @@ def _(statement, asm):
     operand = statement.operand
     if not callable(operand):
         raise TypeError("CALL value must be a Python callable")
+    start = perf_counter()
     result = operand(asm)
     if isinstance(result, Iterable):
+        assemble = assemble_statement if asm._listing is None else assemble_statement_listed
         for stmt in result:
-            assemble_statement(stmt, asm)
+            assemble(stmt, asm)
+    asm._macro_called(operand, perf_counter() - start)
+
+
+def assemble_statement_listed(statement, asm):
+    """Assemble a statement emitted by a CALL macro, adding it to the listing."""
+    address, origin = asm.pos, asm.origin
+    assemble_statement(statement, asm)
+    asm._list(statement, address, origin)
+
+
+# The statement types by which profiled assembly time is reported.
+PROFILED_STATEMENT_TYPES = (Instruction, Org, Fcb, Fdb, Call)
+
+
+def statement_type_name(statement):
+    """The name of the kind of statement, by which profiled assembly time is reported."""
+    for statement_type in PROFILED_STATEMENT_TYPES:
+        if isinstance(statement, statement_type):
+            return statement_type.__name__
+    return typename(statement)
 
 
 class TypeMismatchError(Exception):
     pass
 
 
+# Statements whose code depends only on the label addresses they consume, and so
+# can be reused across passes.
+INCREMENTAL_STATEMENT_TYPES = (Instruction, Fcb, Fdb)
+
+
 @singledispatch
 def assemble_operand(operand, opcode_key, asm, statement, opcode_bytes):
     raise TypeError("Operand {} could not be assembled".format(operand))
@@ -540,3 +1560,56 @@ REGISTER_NYBBLES = {**REGISTER_NYBBLES_6809, **REGISTER_NYBBLES_6309}
 @assemble_operand.register(Registers)
 def _(operand, opcode_key, asm, statement, opcode_bytes):
     return statement.register_operand(operand, opcode_key, asm, opcode_bytes)
+
+
+# Maps each operand type to the assembler methods which encode it, keyed by the
+# addressing mode in which it is used.
+OPERAND_ENCODERS = {
+    Inherent: {INH: Assembler.assemble_inherent_operand},
+    Immediate: {IMM: Assembler.assemble_immediate_operand},
+    Registers: {INT: Assembler.assemble_register_operand},
+    PageDirect: {DIR: Assembler.assemble_page_direct_operand},
+    ExtendedDirect: {EXT: Assembler.assemble_extended_direct_operand},
+    Indexed: {IDX: Assembler.assemble_indexed_operand},
+    Label: {
+        REL8: Assembler.assemble_short_relative_operand,
+        REL16: Assembler.assemble_long_relative_operand,
+        IMM: Assembler.assemble_immediate_operand,
+    },
+}
+
+
+def compile_encoding(mnemonic_key, operand_type):
+    """Determine how to encode an instruction with a particular type of operand.
+
+    Args:
+        mnemonic_key: The key of the instruction in OPCODES.
+        operand_type: The type of the operand.
+
+    Returns:
+        An (opcode_key, opcode_bytes, encoder) triple, where encoder is an unbound
+        Assembler method which encodes the operand, or None if there is no unique
+        encoding, in which case the instruction must be assembled dynamically.
+    """
+    opcodes = OPCODES[mnemonic_key]
+    for base in operand_type.__mro__:
+        if base in OPERAND_ENCODERS:
+            encoders = OPERAND_ENCODERS[base]
+            break
+    else:
+        return None
+    opcode_keys = encoders.keys() & opcodes.keys()
+    if len(opcode_keys) != 1:
+        return None
+    opcode_key = single(opcode_keys)
+    return opcode_key, bytes.fromhex(opcodes[opcode_key]), encoders[opcode_key]
+
+
+# A table mapping (mnemonic key, operand type) pairs to precompiled encodings. Operand
+# types not present when the table is built, such as subclasses of Label, are compiled
+# on first use.
+ENCODINGS = {
+    (mnemonic_key, operand_type): compile_encoding(mnemonic_key, operand_type)
+    for mnemonic_key in OPCODES
+    for operand_type in OPERAND_ENCODERS
+}
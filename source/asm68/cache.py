@@ -0,0 +1,188 @@
+"""
+A persistent, content-addressed cache of assembly results.
+
+Entries are keyed by the asm68 version, the path of the source module, the
+hash of its contents and any assembler options which affect the code. Each entry also records the paths and hashes of
+the files on which the assembly depended, such as the modules imported by
+the source module and the binary files it includes, and is only used if
+none of those files has changed.
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import sysconfig
+import tempfile
+
+from asm68.address_space import AddressSpace
+from asm68.version import __version__
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENVVAR = "ASM68_CACHE_DIR"
+
+
+class CachedAssembly:
+    """The results of an assembly, as restored from the cache.
+
+    Provides the same label_addresses, unreferenced_labels and object_code()
+    interface as an Assembler which has assembled the program.
+    """
+
+    def __init__(self, label_addresses, unreferenced_labels, code_blocks, dependencies):
+        self._label_addresses = label_addresses
+        self._unreferenced_labels = unreferenced_labels
+        self._code_blocks = code_blocks
+        self._dependencies = dependencies
+
+    @property
+    def label_addresses(self):
+        """A mapping from label names to label addresses."""
+        return self._label_addresses
+
+    @property
+    def unreferenced_labels(self):
+        """A set of unreferenced labels."""
+        return self._unreferenced_labels
+
+    @property
+    def dependencies(self):
+        """A mapping from the paths of the files on which the assembly depended to their hashes."""
+        return self._dependencies
+
+    def object_code(self):
+        return self._code_blocks
+
+
+class AssemblyCache:
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: The path of the directory in which cache entries are stored. It
+                will be created if necessary.
+        """
+        self._directory = directory
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def load(self, source_filepath, options=None):
+        """Load the cached assembly of a source module.
+
+        Args:
+            source_filepath: The path to the source module.
+            options: An optional mapping of the names of assembler options which
+                affect the code to JSON-serialisable values.
+
+        Returns:
+            A CachedAssembly, or None if there is no valid cache entry for the source
+            module in its current state.
+        """
+        entry_filepath = self._entry_filepath(source_filepath, options)
+        try:
+            with open(entry_filepath, encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", entry_filepath, e)
+            return None
+
+        dependencies = entry["dependencies"]
+        for path, digest in dependencies.items():
+            try:
+                current_digest = file_digest(path)
+            except OSError:
+                return None
+            if current_digest != digest:
+                logger.info("Cache entry for %s is stale because %s has changed", source_filepath, path)
+                return None
+
+        logger.info("Using cached assembly of %s", source_filepath)
+        return CachedAssembly(
+            label_addresses=entry["label_addresses"],
+            unreferenced_labels=set(entry["unreferenced_labels"]),
+            code_blocks=AddressSpace((origin, bytes.fromhex(code)) for origin, code in entry["blocks"]),
+            dependencies=dependencies,
+        )
+
+    def store(self, source_filepath, asm, dependency_filepaths=(), options=None):
+        """Store the results of assembling a source module.
+
+        Args:
+            source_filepath: The path to the source module.
+            asm: An Assembler which has assembled the program.
+            dependency_filepaths: The paths of further files, other than the source
+                module itself, on which the assembly depended.
+            options: An optional mapping of the names of assembler options which
+                affect the code to JSON-serialisable values.
+        """
+        filepaths = [source_filepath, *dependency_filepaths]
+        entry = {
+            "version": __version__,
+            "source": os.path.abspath(source_filepath),
+            "dependencies": {os.path.abspath(path): file_digest(path) for path in filepaths},
+            "label_addresses": dict(asm.label_addresses),
+            "unreferenced_labels": sorted(asm.unreferenced_labels),
+            "blocks": [[origin, bytes(code).hex()] for origin, code in asm.object_code().items()],
+        }
+        os.makedirs(self._directory, exist_ok=True)
+        entry_filepath = self._entry_filepath(source_filepath, options)
+        fd, temp_filepath = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                json.dump(entry, temp_file)
+            os.replace(temp_filepath, entry_filepath)
+        except BaseException:
+            os.unlink(temp_filepath)
+            raise
+
+    def _entry_filepath(self, source_filepath, options=None):
+        key = hashlib.sha256()
+        key.update(__version__.encode("utf-8"))
+        key.update(b"\0")
+        key.update(os.path.abspath(source_filepath).encode("utf-8"))
+        key.update(b"\0")
+        key.update(file_digest(source_filepath).encode("ascii"))
+        if options:
+            key.update(b"\0")
+            key.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return os.path.join(self._directory, f"{key.hexdigest()}.json")
+
+
+def file_digest(filepath):
+    """The SHA-256 hex digest of the contents of a file."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def imported_module_filepaths(module_names):
+    """The paths of the source files of imported modules, excluding asm68 and installed packages.
+
+    Args:
+        module_names: The names of modules in sys.modules.
+
+    Returns:
+        A sorted list of file paths.
+    """
+    library_paths = tuple(
+        os.path.join(os.path.abspath(path), "")
+        for name, path in sysconfig.get_paths().items()
+        if name in {"stdlib", "platstdlib", "purelib", "platlib"}
+    ) + (os.path.join(os.path.dirname(os.path.abspath(__file__)), ""),)  # asm68 is covered by its version
+    filepaths = set()
+    for name in module_names:
+        filepath = getattr(sys.modules.get(name), "__file__", None)
+        if filepath is None:
+            continue
+        filepath = os.path.abspath(filepath)
+        if filepath.startswith(library_paths) or not os.path.isfile(filepath):
+            continue
+        filepaths.add(filepath)
+    return sorted(filepaths)
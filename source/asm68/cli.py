@@ -16,6 +16,8 @@ from exit_codes import ExitCode
 
 from asm68.version import __version__, program_name
 from asm68 import api
+from asm68.cache import CACHE_DIR_ENVVAR
+from asm68.cycles import CPUS
 from asm68.util import take_after
 
 
@@ -40,21 +42,70 @@ def cli(verbosity):
     logging.basicConfig(level=logging_level)
 
 
+def check_export_options(format, repeat, entry, record_length):
+    try:
+        api.check_export_options(format, repeat, entry=entry, record_length=record_length)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+
 @cli.command(name="asm")
 @click.argument("source", type=click.Path(exists=True, path_type=str))
 @click.option("--output", type=click.File('wb'))
 @click.option("--format", type=click.Choice(["hex", "srec", "bin"]), help="Output file format", default="bin")
 @click.option("--repeat", type=int, help="Number of copies in the binary output file", default=1)
-def asm(source, output, format, repeat):
+@click.option("--entry", help="Entry point address or label, for hex and srec output")
+@click.option("--record-length", type=click.IntRange(1, 255), help="Maximum data bytes per record, for hex and srec output")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=str),
+    envvar=CACHE_DIR_ENVVAR,
+    help=f"Directory for caching assembly results between runs. Defaults to ${CACHE_DIR_ENVVAR}.",
+)
+@click.option("--profile", is_flag=True, help="Report where the time was spent during assembly, on stderr")
+@click.option("--relax", is_flag=True, help="Promote short branches with targets out of range to long branches")
+@click.option("--cycles", type=click.Choice(CPUS), help="Report the cycles of each statement, routine and loop on a CPU, on stderr")
+@click.option("--backpatch", is_flag=True, help="Patch forward references in place, rather than assembling again")
+@click.option(
+    "--max-passes",
+    type=click.IntRange(min=1),
+    default=api.DEFAULT_MAX_PASSES,
+    help="Maximum number of assembly passes, excluding those which relax branches",
+)
+def asm(source, output, format, repeat, entry, record_length, cache_dir, profile, relax, cycles, backpatch, max_passes):
+    check_export_options(format, repeat, entry, record_length)
     try:
-        api.asm(source, output, output_format=format, repeat=repeat)
+        api.asm(
+            source,
+            output,
+            output_format=format,
+            repeat=repeat,
+            entry=entry,
+            record_length=record_length,
+            cache_dir=cache_dir,
+            profile=profile,
+            relax=relax,
+            cycles=cycles,
+            backpatch=backpatch,
+            max_passes=max_passes,
+        )
     except FileNotFoundError as e:
         print(e, file=sys.stderr)
         return ExitCode.OS_FILE
+    except api.UnresolvedAddressError as e:
+        click.secho(f"Invalid --entry: {e}", fg="red")
+        sys.exit(ExitCode.USAGE)
     except api.TooManyPassesError as too_many_passes_error:
         click.secho("Too many assembler passes required", fg="red")
         click.secho("Unresolved labels: {}".format(", ".join(too_many_passes_error.unresolved_label_names))),
         click.secho("Unreferenced labels: {}".format(", ".join(too_many_passes_error.unreferenced_label_names)))
+        if isinstance(too_many_passes_error, api.OscillationError):
+            for name, addresses in sorted(too_many_passes_error.oscillating_labels.items()):
+                click.secho("Oscillating label {}: {}".format(
+                    name, ", ".join("?" if a is None else "{:04X}".format(a) for a in addresses)))
+            for index, statement, sizes in too_many_passes_error.oscillating_statements:
+                click.secho("Oscillating statement {} {}: {} bytes".format(
+                    index, statement.mnemonic, ", ".join(map(str, sizes))))
         sys.exit(ExitCode.DATA_ERR)
     except api.ModuleLoadError as module_load_error:
         e = module_load_error.exception
@@ -70,5 +121,81 @@ def asm(source, output, format, repeat):
     sys.exit(ExitCode.OK)
 
 
+@cli.command(name="batch")
+@click.argument("sources", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=str))
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False, path_type=str),
+    help="File listing further source files, one per line",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, path_type=str),
+    required=True,
+    help="Directory to which output files are written",
+)
+@click.option("--format", type=click.Choice(["hex", "srec", "bin"]), help="Output file format", default="bin")
+@click.option("--repeat", type=int, help="Number of copies in each binary output file", default=1)
+@click.option("--entry", help="Entry point address or label, for hex and srec output")
+@click.option("--record-length", type=click.IntRange(1, 255), help="Maximum data bytes per record, for hex and srec output")
+@click.option("--jobs", type=click.IntRange(min=1), help="Number of worker processes. Defaults to the number of processors.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=str),
+    envvar=CACHE_DIR_ENVVAR,
+    help=f"Directory for caching assembly results between runs. Defaults to ${CACHE_DIR_ENVVAR}.",
+)
+@click.option("--relax", is_flag=True, help="Promote short branches with targets out of range to long branches")
+@click.option("--backpatch", is_flag=True, help="Patch forward references in place, rather than assembling again")
+@click.option(
+    "--max-passes",
+    type=click.IntRange(min=1),
+    default=api.DEFAULT_MAX_PASSES,
+    help="Maximum number of assembly passes, excluding those which relax branches",
+)
+def batch(sources, manifest, output_dir, format, repeat, entry, record_length, jobs, cache_dir, relax, backpatch,
+          max_passes):
+    check_export_options(format, repeat, entry, record_length)
+    source_filepaths = list(sources)
+    if manifest is not None:
+        source_filepaths.extend(api.read_manifest(manifest))
+    if not source_filepaths:
+        click.secho("No source files to assemble", fg="red")
+        sys.exit(ExitCode.USAGE)
+
+    try:
+        results = api.batch(
+            source_filepaths,
+            output_dir,
+            output_format=format,
+            repeat=repeat,
+            entry=entry,
+            record_length=record_length,
+            cache_dir=cache_dir,
+            jobs=jobs,
+            relax=relax,
+            backpatch=backpatch,
+            max_passes=max_passes,
+        )
+    except ValueError as e:
+        click.secho(str(e), fg="red")
+        sys.exit(ExitCode.USAGE)
+
+    for result in results:
+        if result.succeeded:
+            click.echo("{} -> {}".format(result.source_filepath, result.output_filepath))
+            for line in result.label_lines:
+                click.echo("  " + line)
+        else:
+            click.secho("Error in module to be assembled: {}".format(result.source_filepath), fg="red")
+            click.echo("  " + result.error, err=True)
+
+    num_failed = sum(1 for result in results if not result.succeeded)
+    if num_failed:
+        click.secho("{} of {} modules failed to assemble".format(num_failed, len(results)), fg="red")
+        sys.exit(ExitCode.DATA_ERR)
+    sys.exit(ExitCode.OK)
+
+
 if __name__ == "__main__":
     cli(prog_name=program_name)
@@ -1,5 +1,6 @@
-from bisect import bisect_right
 from collections.abc import Sequence, Set, Mapping
+
+from asm68.address_space import AddressSpace
 from asm68.util import typename
 
 
@@ -45,9 +46,9 @@ class ContiguousBytes(Mapping):
     def __init__(self, blocks=(), *, start=None, stop=None, default=0x00):
         """
         Args:
-            blocks: An iterable series of pairs with the first of each tuple being a block origin
-                address, and the second being a sequence of representing the data within that block.
-                The provided blocks must not overlap.
+            blocks: A mapping from block origin addresses to sequences representing the data
+                within each block, such as an AddressSpace, which will be used directly rather
+                than copied. The provided blocks must not overlap.
 
             start: The start (inclusive) address of the range of addresses in the mapping. If not
                 specified the start of the block with the lowest origin address will be used.
@@ -58,25 +59,11 @@ class ContiguousBytes(Mapping):
 
             default: The value of any bytes not supplied in blocks.
         """
-        self._addresses = []
-        self._blocks = []
-        for address in sorted(blocks):
-            if self._addresses:
-                start_of_previous_block = self._addresses[-1]
-                length_of_previous_block = len(self._blocks[-1])
-                stop_of_previous_block = start_of_previous_block + length_of_previous_block
-                if address < stop_of_previous_block:
-                    raise ValueError(
-                        f"Block with address {start_of_previous_block} with length "
-                        f"{length_of_previous_block} bytes overlaps with another block with "
-                        f"address {address}"
-                    )
-            self._addresses.append(address)
-            self._blocks.append(blocks[address])
-
-        if len(self._addresses) != 0:
-            start_of_first_block = self._addresses[0]
-            stop_of_last_block = self._addresses[-1] + len(self._blocks[-1])
+        self._blocks = blocks if isinstance(blocks, AddressSpace) else AddressSpace(blocks)
+
+        if len(self._blocks) != 0:
+            start_of_first_block = self._blocks.start
+            stop_of_last_block = self._blocks.stop
             self._start = start if (start is not None) else start_of_first_block
             self._stop = stop if (stop is not None) else stop_of_last_block
 
@@ -97,6 +84,7 @@ class ContiguousBytes(Mapping):
 
         self._default = default
         self._keys = RangeSet(self.start, self.stop)
+        self._image = None
 
     @property
     def start(self):
@@ -118,17 +106,45 @@ class ContiguousBytes(Mapping):
     def __getitem__(self, k):
         if k not in self.keys():
             raise KeyError(f"Key {k} not in {self!r}")
-        index_after = bisect_right(self._addresses, k)
-        if index_after != 0:
-            index = index_after - 1
-            address = self._addresses[index]
-            block = self._blocks[index]
-            if address <= k < address + len(block):
-                return block[k - address]
+        address = self._blocks.block_containing(k)
+        if address is not None:
+            return self._blocks[address][k - address]
         return self._default
 
     def __repr__(self):
         return f"{typename(self)}(start={self.start}, stop={self.stop})"
 
     def to_bytes(self):
-        return bytes(self.values())
\ No newline at end of file
+        """The contents of the whole address range as a bytes object.
+
+        The image is built once, by filling it with the default value and copying
+        in each block whole, and is cached thereafter.
+        """
+        if self._image is None:
+            image = bytearray(bytes((self._default,)) * len(self))
+            for address, block in self._blocks.items():
+                offset = address - self._start
+                image[offset:offset + len(block)] = block
+            self._image = bytes(image)
+        return self._image
+
+    def __bytes__(self):
+        return self.to_bytes()
+
+    def view(self):
+        """A read-only memoryview of the contents of the whole address range."""
+        return memoryview(self.to_bytes())
+
+    def __buffer__(self, flags):
+        return self.view()
+
+    def write_to(self, file):
+        """Write the contents of the whole address range to a binary file.
+
+        Args:
+            file: A binary file-like object.
+
+        Returns:
+            The number of bytes written.
+        """
+        return file.write(self.view())
\ No newline at end of file
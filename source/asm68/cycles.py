@@ -0,0 +1,503 @@
+"""
+Instruction cycle counts for the 6809 and for the 6309 in native mode.
+
+The counts are those given by the Motorola MC6809 datasheet and the Hitachi
+HD6309 technical reference. Where a count depends on run-time conditions,
+the larger is given: long conditional branches are counted as taken, and RTI
+as restoring the entire machine state. The cycles added by the post byte of
+indexed instructions, and by each byte pushed or pulled by PSH and PUL, are
+counted separately, since they depend on the operand.
+"""
+from asm68.addrmodes import ExtendedDirect
+from asm68.addrmodecodes import INH, INT, IMM, DIR, IDX, EXT, REL8, REL16
+from asm68.instructions import Instruction
+from asm68.label import Label
+from asm68.opcodes import OPCODES, LONG_BRANCHES
+from asm68.util import single
+
+MC6809 = "6809"
+HD6309 = "6309"  # In native mode. In emulation mode the 6309 takes the 6809 counts.
+
+CPUS = (MC6809, HD6309)
+
+# Maps opcode keys, as in OPCODES, to a mapping from addressing mode to a pair of the
+# 6809 and 6309 native cycle counts. The 6809 count is None for 6309 instructions.
+CYCLES_6809 = {
+    "abX":   { INH: (3, 1),                                                                                 },
+    "adcA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "adcB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "addA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "addB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "addD":  {                IMM: (4, 3),   DIR: (6, 4),   IDX: (6, 5),   EXT: (7, 5),                     },
+    "andA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "andB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "andCC": {                IMM: (3, 3),                                                                  },
+    "aslA":  { INH: (2, 1),                                                                                 },
+    "aslB":  { INH: (2, 1),                                                                                 },
+    "asl":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "asrA":  { INH: (2, 1),                                                                                 },
+    "asrB":  { INH: (2, 1),                                                                                 },
+    "asr":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "bcc":   {                                                                             REL8: (3, 3)     },
+    "bcs":   {                                                                             REL8: (3, 3)     },
+    "beq":   {                                                                             REL8: (3, 3)     },
+    "bge":   {                                                                             REL8: (3, 3)     },
+    "bgt":   {                                                                             REL8: (3, 3)     },
+    "bhi":   {                                                                             REL8: (3, 3)     },
+    "bitA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "bitB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "bhs":   {                                                                             REL8: (3, 3)     },
+    "ble":   {                                                                             REL8: (3, 3)     },
+    "blo":   {                                                                             REL8: (3, 3)     },
+    "bls":   {                                                                             REL8: (3, 3)     },
+    "blt":   {                                                                             REL8: (3, 3)     },
+    "bmi":   {                                                                             REL8: (3, 3)     },
+    "bne":   {                                                                             REL8: (3, 3)     },
+    "bpl":   {                                                                             REL8: (3, 3)     },
+    "bra":   {                                                                             REL8: (3, 3)     },
+    "brn":   {                                                                             REL8: (3, 3)     },
+    "bsr":   {                                                                             REL8: (7, 6)     },
+    "bvc":   {                                                                             REL8: (3, 3)     },
+    "bvs":   {                                                                             REL8: (3, 3)     },
+    "clrA":  { INH: (2, 1),                                                                                 },
+    "clrB":  { INH: (2, 1),                                                                                 },
+    "clr":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "cmpA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "cmpB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "cmpD":  {                IMM: (5, 4),   DIR: (7, 5),   IDX: (7, 6),   EXT: (8, 6),                     },
+    "cmpS":  {                IMM: (5, 4),   DIR: (7, 5),   IDX: (7, 6),   EXT: (8, 6),                     },
+    "cmpU":  {                IMM: (5, 4),   DIR: (7, 5),   IDX: (7, 6),   EXT: (8, 6),                     },
+    "cmpX":  {                IMM: (4, 3),   DIR: (6, 4),   IDX: (6, 5),   EXT: (7, 5),                     },
+    "cmpY":  {                IMM: (5, 4),   DIR: (7, 5),   IDX: (7, 6),   EXT: (8, 6),                     },
+    "comA":  { INH: (2, 1),                                                                                 },
+    "comB":  { INH: (2, 1),                                                                                 },
+    "com":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "cwai":  {                IMM: (20, 22),                                                                },
+    "daa":   { INH: (2, 1),                                                                                 },
+    "decA":  { INH: (2, 1),                                                                                 },
+    "decB":  { INH: (2, 1),                                                                                 },
+    "dec":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "eorA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "eorB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "exg":   {                INT: (8, 5),                                                                  },
+    "incA":  { INH: (2, 1),                                                                                 },
+    "incB":  { INH: (2, 1),                                                                                 },
+    "inc":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "jmp":   {                               DIR: (3, 2),   IDX: (3, 3),   EXT: (4, 3),                     },
+    "jsr":   {                               DIR: (7, 6),   IDX: (7, 6),   EXT: (8, 7),                     },
+    "lbcc":  {                                                                             REL16: (6, 6)    },
+    "lbcs":  {                                                                             REL16: (6, 6)    },
+    "lbeq":  {                                                                             REL16: (6, 6)    },
+    "lbge":  {                                                                             REL16: (6, 6)    },
+    "lbgt":  {                                                                             REL16: (6, 6)    },
+    "lbhi":  {                                                                             REL16: (6, 6)    },
+    "lbhs":  {                                                                             REL16: (6, 6)    },
+    "lble":  {                                                                             REL16: (6, 6)    },
+    "lblo":  {                                                                             REL16: (6, 6)    },
+    "lbls":  {                                                                             REL16: (6, 6)    },
+    "lblt":  {                                                                             REL16: (6, 6)    },
+    "lbmi":  {                                                                             REL16: (6, 6)    },
+    "lbpl":  {                                                                             REL16: (6, 6)    },
+    "lbra":  {                                                                             REL16: (5, 4)    },
+    "lbne":  {                                                                             REL16: (6, 6)    },
+    "lbrn":  {                                                                             REL16: (5, 5)    },
+    "lbsr":  {                                                                             REL16: (9, 7)    },
+    "lbvc":  {                                                                             REL16: (6, 6)    },
+    "lbvs":  {                                                                             REL16: (6, 6)    },
+    "ldA":   {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "ldB":   {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "ldD":   {                IMM: (3, 3),   DIR: (5, 4),   IDX: (5, 5),   EXT: (6, 5),                     },
+    "ldS":   {                IMM: (4, 4),   DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "ldU":   {                IMM: (3, 3),   DIR: (5, 4),   IDX: (5, 5),   EXT: (6, 5),                     },
+    "ldX":   {                IMM: (3, 3),   DIR: (5, 4),   IDX: (5, 5),   EXT: (6, 5),                     },
+    "ldY":   {                IMM: (4, 4),   DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "leaS":  {                                              IDX: (4, 4),                                    },
+    "leaU":  {                                              IDX: (4, 4),                                    },
+    "leaX":  {                                              IDX: (4, 4),                                    },
+    "leaY":  {                                              IDX: (4, 4),                                    },
+    "lslA":  { INH: (2, 1),                                                                                 },
+    "lslB":  { INH: (2, 1),                                                                                 },
+    "lsl":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "lsrA":  { INH: (2, 1),                                                                                 },
+    "lsrB":  { INH: (2, 1),                                                                                 },
+    "lsr":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "mul":   { INH: (11, 10),                                                                               },
+    "negA":  { INH: (2, 1),                                                                                 },
+    "negB":  { INH: (2, 1),                                                                                 },
+    "neg":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "nop":   { INH: (2, 1),                                                                                 },
+    "orA":   {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "orB":   {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "orCC":  {                IMM: (3, 2),                                                                  },
+    "pshS":  {                IMM: (5, 4),                                                                  },
+    "pshU":  {                IMM: (5, 4),                                                                  },
+    "pulS":  {                IMM: (5, 4),                                                                  },
+    "pulU":  {                IMM: (5, 4),                                                                  },
+    "rolA":  { INH: (2, 1),                                                                                 },
+    "rolB":  { INH: (2, 1),                                                                                 },
+    "rol":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "rorA":  { INH: (2, 1),                                                                                 },
+    "rorB":  { INH: (2, 1),                                                                                 },
+    "ror":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "rti":   { INH: (15, 17),                                                                               },
+    "rts":   { INH: (5, 4),                                                                                 },
+    "sbcA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "sbcB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "sex":   { INH: (2, 1),                                                                                 },
+    "stA":   {                               DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "stB":   {                               DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "stD":   {                               DIR: (5, 4),   IDX: (5, 5),   EXT: (6, 5),                     },
+    "stS":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "stU":   {                               DIR: (5, 4),   IDX: (5, 5),   EXT: (6, 5),                     },
+    "stX":   {                               DIR: (5, 4),   IDX: (5, 5),   EXT: (6, 5),                     },
+    "stY":   {                               DIR: (6, 5),   IDX: (6, 6),   EXT: (7, 6),                     },
+    "subA":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "subB":  {                IMM: (2, 2),   DIR: (4, 3),   IDX: (4, 4),   EXT: (5, 4),                     },
+    "subD":  {                IMM: (4, 3),   DIR: (6, 4),   IDX: (6, 5),   EXT: (7, 5),                     },
+    "swi":   { INH: (19, 21),                                                                               },
+    "swi2":  { INH: (20, 22),                                                                               },
+    "swi3":  { INH: (20, 22),                                                                               },
+    "sync":  { INH: (4, 3),                                                                                 },
+    "tfr":   {                INT: (6, 4),                                                                  },
+    "tstA":  { INH: (2, 1),                                                                                 },
+    "tstB":  { INH: (2, 1),                                                                                 },
+    "tst":   {                               DIR: (6, 4),   IDX: (6, 5),   EXT: (7, 5),                     },
+}
+
+
+CYCLES_6309 = {
+    "bitMD": {                IMM: (None, 4),                                                               },
+    "cmpr":  {                INT: (None, 4),                                                               },
+    "decD":  { INH: (None, 2),                                                                              },
+    "decE":  { INH: (None, 2),                                                                              },
+    "decF":  { INH: (None, 2),                                                                              },
+    "decW":  { INH: (None, 2),                                                                              },
+    "incD":  { INH: (None, 2),                                                                              },
+    "incE":  { INH: (None, 2),                                                                              },
+    "incF":  { INH: (None, 2),                                                                              },
+    "incW":  { INH: (None, 2),                                                                              },
+    "ldE":   {                IMM: (None, 3), DIR: (None, 4), IDX: (None, 5), EXT: (None, 5),               },
+    "ldF":   {                IMM: (None, 3), DIR: (None, 4), IDX: (None, 5), EXT: (None, 5),               },
+    "ldQ":   {                IMM: (None, 5), DIR: (None, 7), IDX: (None, 8), EXT: (None, 8),               },
+    "ldW":   {                IMM: (None, 4), DIR: (None, 5), IDX: (None, 6), EXT: (None, 6),               },
+    "ldMD":  {                IMM: (None, 5),                                                               },
+    "stE":   {                                DIR: (None, 4), IDX: (None, 5), EXT: (None, 5),               },
+    "stF":   {                                DIR: (None, 4), IDX: (None, 5), EXT: (None, 5),               },
+    "stQ":   {                                DIR: (None, 7), IDX: (None, 8), EXT: (None, 8),               },
+    "stW":   {                                DIR: (None, 5), IDX: (None, 6), EXT: (None, 6),               },
+}
+
+CYCLES = {**CYCLES_6809, **CYCLES_6309}
+
+# Maps the low five bits of an indexed post byte, which select the indexing mode
+# and whether it is indirect, to a pair of the 6809 and 6309 native extra cycles.
+# The 6809 count is None for the modes of the 6309 only. Post bytes with the top bit
+# clear have a 5-bit offset and are not included.
+INDEXED_CYCLES = {
+    0b00000: (2, 1),        # ,R+
+    0b00001: (3, 2),        # ,R++
+    0b00010: (2, 1),        # ,-R
+    0b00011: (3, 2),        # ,--R
+    0b00100: (0, 0),        # ,R
+    0b00101: (1, 1),        # B,R
+    0b00110: (1, 1),        # A,R
+    0b00111: (None, 1),     # E,R
+    0b01000: (1, 1),        # n8,R
+    0b01001: (4, 3),        # n16,R
+    0b01010: (None, 1),     # F,R
+    0b01011: (4, 2),        # D,R
+    0b01100: (1, 1),        # n8,PCR
+    0b01101: (5, 3),        # n16,PCR
+    0b01110: (None, 2),     # W,R
+    0b10001: (6, 5),        # [,R++]
+    0b10011: (6, 5),        # [,--R]
+    0b10100: (3, 3),        # [,R]
+    0b10101: (4, 4),        # [B,R]
+    0b10110: (4, 4),        # [A,R]
+    0b10111: (None, 4),     # [E,R]
+    0b11000: (4, 4),        # [n8,R]
+    0b11001: (7, 6),        # [n16,R]
+    0b11010: (None, 4),     # [F,R]
+    0b11011: (7, 5),        # [D,R]
+    0b11100: (4, 4),        # [n8,PCR]
+    0b11101: (8, 7),        # [n16,PCR]
+    0b11110: (None, 5),     # [W,R]
+}
+
+# The extra cycles of post bytes whose bits which would otherwise select the
+# index register instead select the W register, or extended indirect addressing.
+INDEXED_CYCLES_BY_POST_BYTE = {
+    0x8F: (None, 0),        # ,W
+    0xAF: (None, 2),        # n16,W
+    0xCF: (None, 1),        # ,W++
+    0xEF: (None, 1),        # ,--W
+    0x90: (None, 3),        # [,W]
+    0xB0: (None, 5),        # [n16,W]
+    0xD0: (None, 4),        # [,W++]
+    0xF0: (None, 4),        # [,--W]
+    0x9F: (5, 4),           # [n16]
+}
+
+# The extra cycles of a 5-bit offset, n5,R
+FIVE_BIT_OFFSET_CYCLES = (1, 1)
+
+# The keys of the instructions which take one extra cycle per byte pushed or pulled,
+# according to the register mask in their post byte
+STACK_KEYS = {"pshS", "pshU", "pulS", "pulU"}
+
+# The number of bytes pushed or pulled for each bit of a register mask, from bit 0
+# (CC) to bit 7 (PC)
+STACK_BYTES = (1, 1, 1, 1, 2, 2, 2, 2)
+
+# The keys of instructions which may end a loop body by transferring control
+# back to an earlier label
+LOOP_KEYS = (
+    {key for key, modes in OPCODES.items() if modes.keys() & {REL8, REL16}} - {"bsr", "lbsr", "brn", "lbrn"}
+) | {"jmp"}
+
+
+def _cpu_index(cpu):
+    try:
+        return CPUS.index(cpu)
+    except ValueError:
+        raise ValueError("Unknown CPU {!r}. Expected one of {}".format(cpu, ", ".join(CPUS))) from None
+
+
+def indexed_cycles(post_byte, cpu=MC6809):
+    """The number of cycles added to an indexed instruction by its post byte.
+
+    Args:
+        post_byte: The indexed addressing post byte.
+        cpu: MC6809 or HD6309.
+
+    Raises:
+        ValueError: If the post byte is not valid for the CPU.
+    """
+    i = _cpu_index(cpu)
+    if not post_byte & 0x80:
+        counts = FIVE_BIT_OFFSET_CYCLES
+    else:
+        counts = INDEXED_CYCLES_BY_POST_BYTE.get(post_byte) or INDEXED_CYCLES.get(post_byte & 0b11111)
+    if counts is None or counts[i] is None:
+        raise ValueError("Invalid {} indexed post byte 0x{:02X}".format(cpu, post_byte))
+    return counts[i]
+
+
+def stack_cycles(mask):
+    """The number of cycles added to PSH and PUL instructions by their register mask."""
+    return sum(n for bit, n in enumerate(STACK_BYTES) if mask & (1 << bit))
+
+
+def direct_cycles_saved(key):
+    """The number of cycles saved by executing an instruction with direct rather than extended addressing.
+
+    The saving is that on the 6809, or on the 6309 in native mode for instructions
+    which are only available on the 6309.
+
+    Args:
+        key: The opcode key, as in OPCODES, of an instruction with both direct and
+            extended addressing modes.
+    """
+    extended, direct = CYCLES[key][EXT], CYCLES[key][DIR]
+    i = _cpu_index(MC6809 if extended[_cpu_index(MC6809)] is not None else HD6309)
+    return extended[i] - direct[i]
+
+
+def instruction_form(statement, code):
+    """The opcode key and addressing mode with which an instruction was assembled.
+
+    The form is determined from the statement, and from the length of its code,
+    since instructions with extended addresses in the direct page are assembled
+    with direct addressing, and short branches may be relaxed to long branches.
+
+    Args:
+        statement: An Instruction.
+        code: The bytes emitted for the instruction.
+
+    Returns:
+        An (opcode key, addressing mode) pair.
+    """
+    key = statement.mnemonic.key
+    mode = single(set(statement.operand.codes) & OPCODES[key].keys())
+    opcode_length = len(OPCODES[key][mode]) // 2
+    if mode == EXT and len(code) == opcode_length + 1:
+        mode = DIR
+    elif mode == REL8 and len(code) > opcode_length + 1:
+        key, mode = LONG_BRANCHES[key], REL16
+    return key, mode
+
+
+def instruction_cycles(statement, code, cpu=MC6809):
+    """The number of cycles taken to execute an instruction.
+
+    Args:
+        statement: An Instruction.
+        code: The bytes emitted for the instruction.
+        cpu: MC6809 or HD6309.
+
+    Raises:
+        ValueError: If the instruction is not available on the CPU.
+    """
+    i = _cpu_index(cpu)
+    key, mode = instruction_form(statement, code)
+    cycles = CYCLES[key][mode][i]
+    if cycles is None:
+        raise ValueError("{} is not a {} instruction".format(statement.mnemonic, cpu))
+    if mode == IDX:
+        cycles += indexed_cycles(code[len(OPCODES[key][mode]) // 2], cpu)
+    elif key in STACK_KEYS:
+        cycles += stack_cycles(statement.operand.value)
+    return cycles
+
+
+def statement_cycles(statement, code, cpu=MC6809):
+    """The number of cycles taken to execute a statement, which is zero for directives."""
+    if isinstance(statement, Instruction):
+        return instruction_cycles(statement, code, cpu)
+    return 0
+
+
+class Routine:
+    """A label-delimited series of statements, with the total of their cycles."""
+
+    def __init__(self, name, address, cycles):
+        self._name = name
+        self._address = address
+        self._cycles = cycles
+
+    @property
+    def name(self):
+        """The name of the label at the start of the routine."""
+        return self._name
+
+    @property
+    def address(self):
+        return self._address
+
+    @property
+    def cycles(self):
+        """The number of cycles taken to execute each statement of the routine once."""
+        return self._cycles
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self._name!r}, address={self._address}, cycles={self._cycles})"
+
+
+class Loop:
+    """The body of a loop, from a label to a branch or jump back to it, with the total of its cycles."""
+
+    def __init__(self, name, start, end, cycles):
+        self._name = name
+        self._start = start
+        self._end = end
+        self._cycles = cycles
+
+    @property
+    def name(self):
+        """The name of the label at the start of the loop body."""
+        return self._name
+
+    @property
+    def start(self):
+        """The address of the first statement of the loop body."""
+        return self._start
+
+    @property
+    def end(self):
+        """The address of the branch or jump at the end of the loop body."""
+        return self._end
+
+    @property
+    def cycles(self):
+        """The number of cycles taken by one iteration of the loop body."""
+        return self._cycles
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(name={self._name!r}, start={self._start}, "
+            f"end={self._end}, cycles={self._cycles})"
+        )
+
+
+class CycleReport:
+    """The cycles taken by each statement of an assembled program, by routine and by loop.
+
+    Routines start at each labelled statement and extend to the next. Loop bodies
+    extend from a label to a branch or jump back to it, excluding subroutine calls.
+    Cycles are counted as if each statement were executed once, so they are the
+    cost of straight-line execution of a routine, and of one iteration of a loop.
+    """
+
+    def __init__(self, listing, label_addresses, cpu=MC6809):
+        """
+        Args:
+            listing: The ListingEntry items of an Assembler which assembled the
+                program with listing enabled.
+            label_addresses: A mapping from label names to addresses.
+            cpu: MC6809 or HD6309.
+        """
+        _cpu_index(cpu)
+        self._cpu = cpu
+        self._entries = tuple(listing)
+        self._cycles = tuple(statement_cycles(e.statement, e.code, cpu) for e in self._entries)
+        self._routines = tuple(self._find_routines())
+        self._loops = tuple(self._find_loops(label_addresses))
+
+    @property
+    def cpu(self):
+        return self._cpu
+
+    @property
+    def statements(self):
+        """A tuple of (ListingEntry, cycles) pairs, one for each statement, in order of assembly."""
+        return tuple(zip(self._entries, self._cycles))
+
+    @property
+    def routines(self):
+        """A tuple of Routines, in order of assembly."""
+        return self._routines
+
+    @property
+    def loops(self):
+        """A tuple of Loops, in order of the branches which end them."""
+        return self._loops
+
+    @property
+    def total_cycles(self):
+        return sum(self._cycles)
+
+    def _find_routines(self):
+        name = address = None
+        total = 0
+        for entry, cycles in zip(self._entries, self._cycles):
+            label = entry.statement.label
+            if label is not None:
+                if name is not None:
+                    yield Routine(name, address, total)
+                name, address, total = label.name, entry.address, 0
+            total += cycles
+        if name is not None:
+            yield Routine(name, address, total)
+
+    def _find_loops(self, label_addresses):
+        for index, entry in enumerate(self._entries):
+            target = _loop_target(entry.statement, entry.code)
+            start = label_addresses.get(target)
+            if start is None or start > entry.address:
+                continue
+            first = index
+            while first > 0 and self._entries[first - 1].address >= start:
+                first -= 1
+            if self._entries[first].address != start:
+                continue
+            yield Loop(target, start, entry.address, sum(self._cycles[first:index + 1]))
+
+
+def _loop_target(statement, code):
+    """The name of the label to which an instruction may transfer control to repeat a loop, or None."""
+    if not isinstance(statement, Instruction) or instruction_form(statement, code)[0] not in LOOP_KEYS:
+        return None
+    operand = statement.operand
+    if isinstance(operand, ExtendedDirect):
+        operand = operand.address
+    return operand.name if isinstance(operand, Label) else None
@@ -1,23 +1,57 @@
-from asm68.mnemonics import (ORG, FCB, FDB, CALL)
+from asm68.mnemonics import (ORG, FCB, FDB, CALL, FILL, RMB, DS, ALIGN, INCLUDEBIN, SETDP)
 from asm68.statement import Statement
 
 
 class Directive(Statement):
-    pass
+    __slots__ = ()
 
 
 class Org(Directive):
+    __slots__ = ()
     mnemonic = ORG
 
 
 class Fcb(Directive):
+    __slots__ = ()
     mnemonic = FCB
 
 
 class Fdb(Directive):
+    __slots__ = ()
     mnemonic = FDB
 
 
 class Call(Directive):
+    __slots__ = ()
     mnemonic = CALL
 
+
+class Fill(Directive):
+    __slots__ = ()
+    mnemonic = FILL
+
+
+class Rmb(Directive):
+    __slots__ = ()
+    mnemonic = RMB
+
+
+class Ds(Rmb):
+    __slots__ = ()
+    mnemonic = DS
+
+
+class Align(Directive):
+    __slots__ = ()
+    mnemonic = ALIGN
+
+
+
+class IncludeBin(Directive):
+    __slots__ = ()
+    mnemonic = INCLUDEBIN
+
+
+class SetDp(Directive):
+    __slots__ = ()
+    mnemonic = SETDP
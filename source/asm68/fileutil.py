@@ -0,0 +1,110 @@
+import io
+import logging
+import mmap
+import os
+import stat
+
+logger = logging.getLogger(__name__)
+
+
+def write_repeated(output_file, data, multiplicity):
+    """Write several consecutive copies of some data to a binary file.
+
+    When the output file is a regular file on disk, the file is sized up front
+    and memory-mapped, the data is copied into the map once, and then replicated
+    within the map by copying ever larger slices of what has already been written.
+    If memory-mapping is not possible, the data is written once and then
+    duplicated by the operating system with os.copy_file_range, where
+    available. Otherwise, each copy is written in turn.
+
+    Args:
+        output_file: A binary file-like object.
+        data: A bytes-like object.
+        multiplicity: The number of copies to write.
+
+    Returns:
+        The total number of bytes written.
+    """
+    if multiplicity < 1:
+        raise ValueError(f"Multiplicity {multiplicity} is less than one")
+    data = memoryview(data)
+    if multiplicity > 1 and len(data) > 0:
+        path = _regular_file_path(output_file)
+        if path is not None:
+            output_file.flush()
+            offset = output_file.tell()
+            for write in (_write_repeated_mmap, _write_repeated_copy_file_range):
+                try:
+                    stop = write(path, offset, data, multiplicity)
+                except OSError as e:
+                    logger.debug("Could not write repeated data with %s: %s", write.__name__, e)
+                    continue
+                output_file.seek(stop)
+                return stop - offset
+    for _ in range(multiplicity):
+        output_file.write(data)
+    return len(data) * multiplicity
+
+
+def _regular_file_path(output_file):
+    """The path of the regular file underlying a file object, or None."""
+    try:
+        fd = output_file.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return None
+    path = getattr(output_file, "name", None)
+    if not isinstance(path, (str, bytes, os.PathLike)):
+        return None
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        return None
+    return path
+
+
+def _write_repeated_mmap(path, offset, data, multiplicity):
+    total = len(data) * multiplicity
+    stop = offset + total
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.ftruncate(fd, stop)
+        with mmap.mmap(fd, stop) as mapped:
+            mapped[offset:offset + len(data)] = data
+            _replicate(mapped, offset, len(data), total)
+            mapped.flush()
+    finally:
+        os.close(fd)
+    return stop
+
+
+def _replicate(buffer, offset, length, total):
+    """Fill buffer[offset:offset + total] by repeatedly doubling buffer[offset:offset + length]."""
+    filled = length
+    while filled < total:
+        count = min(filled, total - filled)
+        buffer[offset + filled:offset + filled + count] = buffer[offset:offset + count]
+        filled += count
+
+
+def _write_repeated_copy_file_range(path, offset, data, multiplicity):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError("os.copy_file_range is not available")
+    total = len(data) * multiplicity
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.pwrite(fd, data, offset)
+        filled = len(data)
+        while filled < total:
+            count = min(filled, total - filled)
+            copied = 0
+            while copied < count:
+                n = os.copy_file_range(
+                    fd, fd, count - copied,
+                    offset + copied,
+                    offset + filled + copied,
+                )
+                if n == 0:
+                    raise OSError("os.copy_file_range made no progress")
+                copied += n
+            filled += count
+    finally:
+        os.close(fd)
+    return offset + total
@@ -1,13 +1,15 @@
 from asm68 import mnemonics
 from asm68 import registers
 from asm68.addrmodecodes import INT, INH, IMM, DIR, IDX, EXT, REL8, REL16
-from asm68.opcodes import OPCODES
+from asm68.opcodes import OPCODES, LONG_BRANCHES
 from asm68.statement import Statement
 from asm68.stringutil import upper_first, uppercase_ending
 
 
 class Instruction(Statement):
 
+    __slots__ = ()
+
     def __init__(self, operand, comment='', label=None):
         addressing_modes = set(operand.codes)
         if OPCODES[self.mnemonic.key].keys().isdisjoint(addressing_modes):
@@ -21,48 +23,64 @@ class Instruction(Statement):
 
 class InherentOperandAcceptable:
 
+    __slots__ = ()
+
     def inherent_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_inherent_operand(operand, opcode_key, self, opcode_bytes)
 
 
 class InterRegisterOperandAcceptable:
 
+    __slots__ = ()
+
     def register_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_register_operand(operand, opcode_key, self, opcode_bytes)
 
 
 class ImmediateOperandAcceptable:
 
+    __slots__ = ()
+
     def immediate_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_immediate_operand(operand, opcode_key, self, opcode_bytes)
 
 
 class PageDirectOperandAcceptable:
 
+    __slots__ = ()
+
     def page_direct_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_page_direct_operand(operand, opcode_key, self, opcode_bytes)
 
 
 class ExtendedDirectOperandAcceptable:
 
+    __slots__ = ()
+
     def extended_direct_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_extended_direct_operand(operand, opcode_key, self, opcode_bytes)
 
 
 class ShortRelativeOperandAcceptable:
 
+    __slots__ = ()
+
     def relative_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_short_relative_operand(operand, opcode_key, self, opcode_bytes)
 
 
 class LongRelativeOperandAcceptable:
 
+    __slots__ = ()
+
     def relative_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_long_relative_operand(operand, opcode_key, self, opcode_bytes)
 
 
 class IndexedOperandAcceptable:
 
+    __slots__ = ()
+
     def indexed_operand(self, operand, opcode_key, asm, opcode_bytes):
         return asm.assemble_indexed_operand(operand, opcode_key, self, opcode_bytes)
 
@@ -93,9 +111,17 @@ for opcode, modes in OPCODES.items():
             "inherent_register": inherent_name and getattr(registers, inherent_name),
         }.items() if v
     }
+    members["__slots__"] = ()
     cls = type(
         name,
         bases,
         members
     )
     globals()[name] = cls
+
+
+# Maps each short relative branch instruction type to the type of its long equivalent
+LONG_BRANCH_INSTRUCTIONS = {
+    globals()[upper_first(short)]: globals()[upper_first(long)]
+    for short, long in LONG_BRANCHES.items()
+}
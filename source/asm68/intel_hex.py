@@ -0,0 +1,125 @@
+"""
+Intel HEX object file records.
+
+Records are generated directly from the blocks of object code, so gaps
+between blocks are never padded or materialised in memory.
+"""
+from asm68.address_space import blocks_in_address_order
+
+DATA = 0x00
+END_OF_FILE = 0x01
+EXTENDED_SEGMENT_ADDRESS = 0x02
+START_SEGMENT_ADDRESS = 0x03
+EXTENDED_LINEAR_ADDRESS = 0x04
+START_LINEAR_ADDRESS = 0x05
+
+LINEAR = "linear"
+SEGMENT = "segment"
+
+ADDRESS_MODES = {
+    LINEAR: EXTENDED_LINEAR_ADDRESS,
+    SEGMENT: EXTENDED_SEGMENT_ADDRESS,
+}
+
+MAX_RECORD_LENGTH = 255
+
+# Records carry a 16-bit address offset, so data records must not cross
+# a 64 KiB boundary.
+BANK_SIZE = 0x10000
+
+
+def intel_hex_records(code_blocks, *, record_length=16, start_address=None, address_mode=LINEAR):
+    """Generate the records of an Intel HEX file.
+
+    Args:
+        code_blocks: A mapping from block origin addresses to the bytes-like code
+            within each block, such as that returned by Assembler.object_code().
+            The blocks must not overlap.
+
+        record_length: The maximum number of data bytes in each data record.
+
+        start_address: An optional start (entry point) address, for which a start
+            address record will be generated.
+
+        address_mode: Either "linear", in which case addresses beyond 64 KiB are
+            specified with extended linear address records and may extend to 4 GiB, or
+            "segment", in which case they are specified with extended segment address
+            records and may extend to 1 MiB.
+
+    Yields:
+        Each record as a string, without a line terminator.
+
+    Raises:
+        ValueError: If the record length or address mode is invalid, or if an
+            address cannot be represented in the address mode.
+    """
+    if not (1 <= record_length <= MAX_RECORD_LENGTH):
+        raise ValueError(f"Record length {record_length} not in range 1 to {MAX_RECORD_LENGTH}")
+    try:
+        extended_address_type = ADDRESS_MODES[address_mode]
+    except KeyError:
+        raise ValueError(f"Address mode {address_mode!r} not one of {', '.join(sorted(ADDRESS_MODES))}")
+    address_limit = _address_limit(address_mode)
+
+    bank = 0
+    for origin, block in blocks_in_address_order(code_blocks):
+        block = memoryview(block)
+        if origin + len(block) > address_limit:
+            raise ValueError(
+                f"Block at 0x{origin:X} with length {len(block)} bytes extends beyond the "
+                f"{address_mode} address limit 0x{address_limit:X}"
+            )
+        offset = 0
+        while offset < len(block):
+            address = origin + offset
+            if address // BANK_SIZE != bank:
+                bank = address // BANK_SIZE
+                yield _extended_address_record(extended_address_type, bank)
+            length = min(record_length, len(block) - offset, BANK_SIZE - address % BANK_SIZE)
+            yield record(DATA, address % BANK_SIZE, block[offset:offset + length])
+            offset += length
+
+    if start_address is not None:
+        yield _start_address_record(address_mode, start_address)
+
+    yield record(END_OF_FILE, 0, b'')
+
+
+def record(record_type, address, data):
+    """Format a single Intel HEX record.
+
+    Args:
+        record_type: The record type, such as DATA.
+        address: The 16-bit address field.
+        data: The bytes-like data field.
+
+    Returns:
+        The record as a string, without a line terminator.
+    """
+    fields = bytes((len(data), address >> 8, address & 0xFF, record_type)) + bytes(data)
+    checksum = -sum(fields) & 0xFF
+    return f":{fields.hex().upper()}{checksum:02X}"
+
+
+def _address_limit(address_mode):
+    if address_mode == SEGMENT:
+        return 0x100000
+    return 0x100000000
+
+
+def _extended_address_record(extended_address_type, bank):
+    if extended_address_type == EXTENDED_SEGMENT_ADDRESS:
+        segment = bank << 12
+        return record(EXTENDED_SEGMENT_ADDRESS, 0, segment.to_bytes(2, byteorder="big"))
+    return record(EXTENDED_LINEAR_ADDRESS, 0, bank.to_bytes(2, byteorder="big"))
+
+
+def _start_address_record(address_mode, start_address):
+    if not (0 <= start_address < _address_limit(address_mode)):
+        raise ValueError(f"Start address 0x{start_address:X} cannot be represented in {address_mode} address mode")
+    if address_mode == SEGMENT:
+        code_segment = (start_address >> 16) << 12
+        instruction_pointer = start_address & 0xFFFF
+        data = code_segment.to_bytes(2, byteorder="big") + instruction_pointer.to_bytes(2, byteorder="big")
+        return record(START_SEGMENT_ADDRESS, 0, data)
+    return record(START_LINEAR_ADDRESS, 0, start_address.to_bytes(4, byteorder="big"))
@@ -4,6 +4,8 @@ from asm68.util import is_valid_variable_name
 
 class Label:
 
+    __slots__ = ('_name', '_chained_label')
+
     CODES = frozenset({
         REL8,
         REL16,
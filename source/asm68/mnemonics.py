@@ -40,5 +40,10 @@ ORG = Mnemonic('ORG')
 FCB = Mnemonic('FCB')
 FDB = Mnemonic('FDB')
 CALL = Mnemonic('CALL')
-# TODO: Setdp
+FILL = Mnemonic('FILL')
+RMB = Mnemonic('RMB')
+DS = Mnemonic('DS')
+ALIGN = Mnemonic('ALIGN')
+INCLUDEBIN = Mnemonic('INCLUDEBIN')
+SETDP = Mnemonic('SETDP')
 
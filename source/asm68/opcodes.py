@@ -19,13 +19,24 @@ OPCODES_6809 = {
     "bcc":   {                                                                   REL8: '24'   },
     "bcs":   {                                                                   REL8: '25'   },
     "beq":   {                                                                   REL8: '27'   },
+    "bge":   {                                                                   REL8: '2C'   },
+    "bgt":   {                                                                   REL8: '2E'   },
+    "bhi":   {                                                                   REL8: '22'   },
     "bitA":  {              IMM: '85',   DIR: '95',   IDX: 'A5',   EXT: 'B5',                 },
     "bitB":  {              IMM: 'C5',   DIR: 'D5',   IDX: 'E5',   EXT: 'F5',                 },
     "bhs":   {                                                                   REL8: '24'   },
+    "ble":   {                                                                   REL8: '2F'   },
     "blo":   {                                                                   REL8: '25'   },
+    "bls":   {                                                                   REL8: '23'   },
+    "blt":   {                                                                   REL8: '2D'   },
+    "bmi":   {                                                                   REL8: '2B'   },
     "bne":   {                                                                   REL8: '26'   },
     "bpl":   {                                                                   REL8: '2A'   },
     "bra":   {                                                                   REL8: '20'   },
+    "brn":   {                                                                   REL8: '21'   },
+    "bsr":   {                                                                   REL8: '8D'   },
+    "bvc":   {                                                                   REL8: '28'   },
+    "bvs":   {                                                                   REL8: '29'   },
     "clrA":  { INH: '4F',                                                                     },
     "clrB":  { INH: '5F',                                                                     },
     "clr":   {                           DIR: '0F',   IDX: '6F',   EXT: '7F',                 },
@@ -52,8 +63,25 @@ OPCODES_6809 = {
     "inc":   {                           DIR: '0C',   IDX: '6C',   EXT: '7C',                 },
     "jmp":   {                           DIR: '0E',   IDX: '6E',   EXT: '7E',                 },
     "jsr":   {                           DIR: '9D',   IDX: 'AD',   EXT: 'BD',                 },
+    "lbcc":  {                                                                  REL16: '1024' },
+    "lbcs":  {                                                                  REL16: '1025' },
+    "lbeq":  {                                                                  REL16: '1027' },
+    "lbge":  {                                                                  REL16: '102C' },
+    "lbgt":  {                                                                  REL16: '102E' },
+    "lbhi":  {                                                                  REL16: '1022' },
+    "lbhs":  {                                                                  REL16: '1024' },
+    "lble":  {                                                                  REL16: '102F' },
+    "lblo":  {                                                                  REL16: '1025' },
+    "lbls":  {                                                                  REL16: '1023' },
+    "lblt":  {                                                                  REL16: '102D' },
+    "lbmi":  {                                                                  REL16: '102B' },
+    "lbpl":  {                                                                  REL16: '102A' },
     "lbra":  {                                                                  REL16: '16'   },
     "lbne":  {                                                                  REL16: '1026' },
+    "lbrn":  {                                                                  REL16: '1021' },
+    "lbsr":  {                                                                  REL16: '17'   },
+    "lbvc":  {                                                                  REL16: '1028' },
+    "lbvs":  {                                                                  REL16: '1029' },
     "ldA":   {              IMM: '86',   DIR: '96',   IDX: 'A6',   EXT: 'B6',                 },
     "ldB":   {              IMM: 'C6',   DIR: 'D6',   IDX: 'E6',   EXT: 'F6',                 },
     "ldD":   {              IMM: 'CC',   DIR: 'DC',   IDX: 'EC',   EXT: 'FC',                 },
@@ -139,6 +167,29 @@ OPCODES_6309 = {
 
 OPCODES = {**OPCODES_6809, **OPCODES_6309}
 
+# Maps the key of each short relative branch to the key of its long equivalent
+LONG_BRANCHES = {
+    "bcc": "lbcc",
+    "bcs": "lbcs",
+    "beq": "lbeq",
+    "bge": "lbge",
+    "bgt": "lbgt",
+    "bhi": "lbhi",
+    "bhs": "lbhs",
+    "ble": "lble",
+    "blo": "lblo",
+    "bls": "lbls",
+    "blt": "lblt",
+    "bmi": "lbmi",
+    "bne": "lbne",
+    "bpl": "lbpl",
+    "bra": "lbra",
+    "brn": "lbrn",
+    "bsr": "lbsr",
+    "bvc": "lbvc",
+    "bvs": "lbvs",
+}
+
 # Used to interpret the unusual addressing modes of these instructions.
 # From the programmers reference by Darren Atkinson:
 #
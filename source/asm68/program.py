@@ -0,0 +1,155 @@
+from array import array
+from collections.abc import Sequence
+
+from asm68.util import typename
+
+
+class Program(Sequence):
+    """A compact, column-oriented sequence of statements.
+
+    Statements are immutable, and generated programs repeat the same unlabelled
+    statements many times over, so each distinct unlabelled statement is stored
+    once in a table, and the program itself is stored as an array of indexes into
+    that table. Labelled statements are unique, so each has its own entry in the
+    table. An index from label names to the positions of the statements they
+    label is maintained as statements are appended.
+
+    Iterating over a Program yields the statements from the table, so no
+    statement objects are created. Slices are Programs which share the table of
+    the original; since the table is only ever appended to, either may be
+    extended independently. Programs can be pickled, in which case any labels
+    referring back to an AsmDsl are pickled as plain labels.
+    """
+
+    # The typecode of the array of table indexes
+    TYPECODE = 'I'
+
+    def __init__(self, statements=()):
+        """
+        Args:
+            statements: An optional iterable series of statements with which to
+                initialise the program.
+        """
+        self._table = []  # Distinct statements
+        self._table_index = {}  # Maps the keys of unlabelled statements to their indexes in _table
+        self._ids = array(self.TYPECODE)  # Indexes into _table, one per statement
+        self._label_index = {}  # Maps label names to statement positions
+        self.extend(statements)
+
+    def append(self, statement):
+        """Append a statement to the program.
+
+        Args:
+            statement: The statement to append.
+        """
+        self._ids.append(self._intern(statement, len(self._ids)))
+
+    def append_repeated(self, statement, count):
+        """Append several repetitions of an unlabelled statement to the program.
+
+        Args:
+            statement: The statement to append.
+            count: The number of repetitions.
+
+        Raises:
+            ValueError: If the statement is labelled, or count is negative.
+        """
+        if statement.label is not None:
+            raise ValueError(f"Cannot repeat labelled statement {statement!r}")
+        if count < 0:
+            raise ValueError(f"Repetition count {count} is negative")
+        table_id = self._intern(statement, len(self._ids))
+        self._ids.extend(array(self.TYPECODE, (table_id,)) * count)
+
+    def _intern(self, statement, position):
+        """Find or add the table entry for a statement at a position in the program.
+
+        Returns:
+            The index of the statement in the table.
+        """
+        label = statement.label
+        if label is None:
+            # The statement type determines the mnemonic, and operands are usually
+            # interned, so this key is cheaper to hash and compare than the statement
+            key = (type(statement), statement.operand, statement.comment)
+            try:
+                table_id = self._table_index.get(key)
+            except TypeError:  # Unhashable operand
+                table_id = self._add_to_table(statement)
+            else:
+                if table_id is None:
+                    table_id = self._add_to_table(statement)
+                    self._table_index[key] = table_id
+        else:
+            table_id = self._add_to_table(statement)
+            while label is not None:
+                self._label_index[label.name] = position
+                label = label.chained_label
+        return table_id
+
+    def extend(self, statements):
+        """Append each of an iterable series of statements to the program."""
+        for statement in statements:
+            self.append(statement)
+
+    def _add_to_table(self, statement):
+        self._table.append(statement)
+        return len(self._table) - 1
+
+    def statement_index(self, label_name):
+        """The position of the statement with a given label.
+
+        Args:
+            label_name: The name of the label.
+
+        Returns:
+            The zero-based position of the statement in the program.
+
+        Raises:
+            KeyError: If no statement has the label.
+        """
+        return self._label_index[label_name]
+
+    @property
+    def label_names(self):
+        """The names of the labels of statements in the program."""
+        return self._label_index.keys()
+
+    @property
+    def num_distinct_statements(self):
+        """The number of distinct statements stored in the table."""
+        return len(self._table)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(index)
+        return self._table[self._ids[index]]
+
+    def __iter__(self):
+        return map(self._table.__getitem__, self._ids)
+
+    def _slice(self, index):
+        positions = range(len(self._ids))[index]
+        program = Program()
+        program._table = self._table
+        program._table_index = self._table_index
+        program._ids = self._ids[index]
+        program._label_index = {
+            name: positions.index(position)
+            for name, position in self._label_index.items()
+            if position in positions
+        }
+        return program
+
+    def __eq__(self, rhs):
+        if not isinstance(rhs, Program):
+            return NotImplemented
+        return len(self) == len(rhs) and all(a == b for a, b in zip(self, rhs))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}(<{} statements, {} distinct>)".format(typename(self), len(self), len(self._table))
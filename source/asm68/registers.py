@@ -3,6 +3,8 @@ from numbers import Integral
 
 class Register:
 
+    __slots__ = ('_name', '_width', '_hash')
+
     _names_and_widths = {}
 
     def __init__(self, name, width=None):
@@ -28,6 +30,7 @@ class Register:
 
         self._name = name
         self._width = width
+        self._hash = hash((name, width))
         Register._names_and_widths[name] = width
 
     @property
@@ -46,6 +49,8 @@ class Register:
             self.__class__.__name__, self._name, self._width)
 
     def __eq__(self, rhs):
+        if self is rhs:
+            return True
         if not isinstance(rhs, self.__class__):
             return NotImplemented
         return (self._name == rhs._name) and (self._width == self._width)
@@ -56,7 +61,7 @@ class Register:
         return self.name < rhs.name
 
     def __hash__(self):
-        return hash((self._name, self._width))
+        return self._hash
 
     def __add__(self, rhs):
         if not isinstance(rhs, Integral):
@@ -74,6 +79,8 @@ CREMENTS = {-2, -1, +1, +2}
 
 class AutoIncrementedRegister:
 
+    __slots__ = ('_register', '_delta')
+
     def __init__(self, register, delta):
         if delta not in CREMENTS:
             direction = ("Null increment", "Auto post-increment", "Auto pre-decrement")[(delta > 0) - (delta < 0)]
@@ -0,0 +1,105 @@
+"""
+Motorola S-record object file records.
+
+Records are generated directly from the blocks of object code, so gaps
+between blocks are never padded or materialised in memory.
+"""
+from asm68.address_space import blocks_in_address_order
+
+# Data and termination record types, keyed by the number of address bytes.
+DATA_RECORD_TYPES = {2: 1, 3: 2, 4: 3}
+TERMINATION_RECORD_TYPES = {2: 9, 3: 8, 4: 7}
+
+HEADER = 0
+COUNT_16 = 5
+COUNT_24 = 6
+
+# The count field of a record is a single byte, which must also accommodate
+# the address and the checksum.
+MAX_COUNT = 0xFF
+CHECKSUM_SIZE = 1
+
+
+def srecords(code_blocks, *, record_length=16, start_address=None, address_size=None, header=b''):
+    """Generate the records of a Motorola S-record file.
+
+    Args:
+        code_blocks: A mapping from block origin addresses to the bytes-like code
+            within each block, such as that returned by Assembler.object_code().
+            The blocks must not overlap.
+
+        record_length: The maximum number of data bytes in each data record.
+
+        start_address: An optional start (entry point) address for the termination
+            record. If None, the start address will be zero.
+
+        address_size: The number of address bytes in data and termination records: 2 for
+            S1/S9 (S19) records, 3 for S2/S8 (S28) records or 4 for S3/S7 (S37) records.
+            If None, the smallest size which can represent all the addresses will be used.
+
+        header: The bytes-like contents of the S0 header record.
+
+    Yields:
+        Each record as a string, without a line terminator.
+
+    Raises:
+        ValueError: If the record length or address size is invalid, or if an
+            address cannot be represented in the address size.
+    """
+    blocks = list(blocks_in_address_order(code_blocks))
+    if address_size is None:
+        stop = (blocks[-1][0] + len(blocks[-1][1])) if blocks else 0
+        highest_address = max(stop - 1, start_address or 0)
+        address_size = next(size for size in DATA_RECORD_TYPES if highest_address < (1 << (8 * size)))
+    if address_size not in DATA_RECORD_TYPES:
+        raise ValueError(f"Address size {address_size} not one of {', '.join(map(str, DATA_RECORD_TYPES))}")
+    max_record_length = MAX_COUNT - address_size - CHECKSUM_SIZE
+    if not (1 <= record_length <= max_record_length):
+        raise ValueError(f"Record length {record_length} not in range 1 to {max_record_length}")
+    address_limit = 1 << (8 * address_size)
+    data_record_type = DATA_RECORD_TYPES[address_size]
+
+    yield record(HEADER, 0, 2, header)
+
+    num_data_records = 0
+    for origin, block in blocks:
+        block = memoryview(block)
+        if origin + len(block) > address_limit:
+            raise ValueError(
+                f"Block at 0x{origin:X} with length {len(block)} bytes extends beyond the "
+                f"{address_size}-byte address limit 0x{address_limit:X}"
+            )
+        for offset in range(0, len(block), record_length):
+            yield record(data_record_type, origin + offset, address_size, block[offset:offset + record_length])
+            num_data_records += 1
+
+    if num_data_records <= 0xFFFF:
+        yield record(COUNT_16, num_data_records, 2, b'')
+    elif num_data_records <= 0xFFFFFF:
+        yield record(COUNT_24, num_data_records, 3, b'')
+
+    start_address = start_address or 0
+    if not (0 <= start_address < address_limit):
+        raise ValueError(f"Start address 0x{start_address:X} cannot be represented in {address_size} bytes")
+    yield record(TERMINATION_RECORD_TYPES[address_size], start_address, address_size, b'')
+
+
+def record(record_type, address, address_size, data):
+    """Format a single S-record.
+
+    Args:
+        record_type: The record type, 0 to 9.
+        address: The address field.
+        address_size: The number of bytes in the address field.
+        data: The bytes-like data field.
+
+    Returns:
+        The record as a string, without a line terminator.
+    """
+    fields = (
+        bytes((address_size + len(data) + 1,))
+        + address.to_bytes(address_size, byteorder="big")
+        + bytes(data)
+    )
+    checksum = ~sum(fields) & 0xFF
+    return f"S{record_type}{fields.hex().upper()}{checksum:02X}"
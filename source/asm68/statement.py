@@ -5,6 +5,8 @@ from asm68.addrmodes import Inherent
 
 class Statement(ABC):
 
+    __slots__ = ('_operand', '_comment', '_label')
+
     _mnemonic_map = {}
 
     mnemonic = None
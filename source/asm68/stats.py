@@ -0,0 +1,149 @@
+"""
+Statistics describing where the time goes during assembly.
+"""
+from collections import Counter
+
+from asm68.util import typename
+
+# A direct address is one byte shorter than an extended address. The cycles saved
+# depend on the instruction, and are taken from asm68.cycles by the Assembler.
+DIRECT_PAGE_BYTES_SAVED = 1
+
+
+class PassStats:
+    """Statistics for a single assembler pass."""
+
+    def __init__(self, number, duration, num_statements, num_encoded, num_bytes, num_unresolved_labels):
+        self._number = number
+        self._duration = duration
+        self._num_statements = num_statements
+        self._num_encoded = num_encoded
+        self._num_bytes = num_bytes
+        self._num_unresolved_labels = num_unresolved_labels
+
+    @property
+    def number(self):
+        """The one-based number of the pass."""
+        return self._number
+
+    @property
+    def duration(self):
+        """The wall-clock duration of the pass in seconds."""
+        return self._duration
+
+    @property
+    def num_statements(self):
+        """The number of top-level statements processed."""
+        return self._num_statements
+
+    @property
+    def num_encoded(self):
+        """The number of statements encoded afresh, rather than reused from the previous pass."""
+        return self._num_encoded
+
+    @property
+    def num_bytes(self):
+        """The number of bytes of code emitted."""
+        return self._num_bytes
+
+    @property
+    def num_unresolved_labels(self):
+        """The number of labels which were unresolved at the end of the pass."""
+        return self._num_unresolved_labels
+
+    def __repr__(self):
+        return (
+            f"{typename(self)}(number={self._number}, duration={self._duration!r}, "
+            f"num_statements={self._num_statements}, num_encoded={self._num_encoded}, "
+            f"num_bytes={self._num_bytes}, num_unresolved_labels={self._num_unresolved_labels})"
+        )
+
+
+class AssemblyStats:
+    """Statistics gathered while assembling a program.
+
+    Per-pass statistics are always gathered. Timings by statement type and by
+    CALL macro are only gathered when the Assembler is profiling, since timing
+    each statement has a significant cost.
+    """
+
+    def __init__(self):
+        self._passes = []
+        self._statement_durations = Counter()
+        self._statement_counts = Counter()
+        self._macro_durations = Counter()
+        self._macro_counts = Counter()
+        self._num_direct_page_accesses = 0
+        self._direct_page_cycles_saved = 0
+
+    @property
+    def passes(self):
+        """A tuple of PassStats, one for each pass."""
+        return tuple(self._passes)
+
+    @property
+    def num_passes(self):
+        return len(self._passes)
+
+    @property
+    def duration(self):
+        """The total duration of all passes in seconds."""
+        return sum(p.duration for p in self._passes)
+
+    @property
+    def statement_durations(self):
+        """A mapping from statement type names to the total seconds spent assembling them."""
+        return dict(self._statement_durations)
+
+    @property
+    def statement_counts(self):
+        """A mapping from statement type names to the number of statements assembled."""
+        return dict(self._statement_counts)
+
+    @property
+    def macro_durations(self):
+        """A mapping from CALL macro names to the total seconds spent in them."""
+        return dict(self._macro_durations)
+
+    @property
+    def macro_counts(self):
+        """A mapping from CALL macro names to the number of times they were called."""
+        return dict(self._macro_counts)
+
+    @property
+    def num_direct_page_accesses(self):
+        """The number of instructions using direct addressing in place of extended addressing, following SETDP."""
+        return self._num_direct_page_accesses
+
+    @property
+    def direct_page_bytes_saved(self):
+        """The number of bytes saved by using direct addressing in place of extended addressing."""
+        return self._num_direct_page_accesses * DIRECT_PAGE_BYTES_SAVED
+
+    @property
+    def direct_page_cycles_saved(self):
+        """The number of cycles saved, per execution of each instruction, by using direct addressing.
+
+        See asm68.cycles.direct_cycles_saved() for the CPU on which the cycles are counted.
+        """
+        return self._direct_page_cycles_saved
+
+    def add_pass(self, pass_stats):
+        self._passes.append(pass_stats)
+
+    def add_statement(self, statement_type_name, duration):
+        self._statement_durations[statement_type_name] += duration
+        self._statement_counts[statement_type_name] += 1
+
+    def add_macro(self, macro_name, duration):
+        self._macro_durations[macro_name] += duration
+        self._macro_counts[macro_name] += 1
+
+    def set_direct_page_accesses(self, num_direct_page_accesses, direct_page_cycles_saved):
+        self._num_direct_page_accesses = num_direct_page_accesses
+        self._direct_page_cycles_saved = direct_page_cycles_saved
+
+
+def macro_name(macro):
+    """A name for a CALL macro, for reporting."""
+    return getattr(macro, "__qualname__", None) or getattr(macro, "__name__", None) or typename(macro)
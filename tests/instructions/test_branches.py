@@ -0,0 +1,43 @@
+from pytest import mark
+
+from asm68.asmdsl import AsmDsl, statements
+from asm68.assembler import assemble
+from asm68.mnemonics import *
+from asm68.opcodes import LONG_BRANCHES
+
+
+SHORT_BRANCHES = [
+    ('20', BRA), ('21', BRN), ('22', BHI), ('23', BLS), ('24', BCC), ('24', BHS),
+    ('25', BCS), ('25', BLO), ('26', BNE), ('27', BEQ), ('28', BVC), ('29', BVS),
+    ('2A', BPL), ('2B', BMI), ('2C', BGE), ('2D', BLT), ('2E', BGT), ('2F', BLE),
+    ('8D', BSR),
+]
+
+LONG_BRANCH_OPCODES = [
+    ('16', LBRA), ('1021', LBRN), ('1022', LBHI), ('1023', LBLS), ('1024', LBCC), ('1024', LBHS),
+    ('1025', LBCS), ('1025', LBLO), ('1026', LBNE), ('1027', LBEQ), ('1028', LBVC), ('1029', LBVS),
+    ('102A', LBPL), ('102B', LBMI), ('102C', LBGE), ('102D', LBLT), ('102E', LBGT), ('102F', LBLE),
+    ('17', LBSR),
+]
+
+
+def assemble_branch_to_self(mnemonic):
+    asm = AsmDsl()
+    asm .HERE   (   mnemonic,   asm.HERE    )
+    return assemble(statements(asm))[0]
+
+
+@mark.parametrize("opcode, mnemonic", SHORT_BRANCHES)
+def test_short_branch(opcode, mnemonic):
+    assert assemble_branch_to_self(mnemonic) == bytes.fromhex(opcode + 'FE')
+
+
+@mark.parametrize("opcode, mnemonic", LONG_BRANCH_OPCODES)
+def test_long_branch(opcode, mnemonic):
+    length = len(opcode) // 2 + 2
+    assert assemble_branch_to_self(mnemonic) == bytes.fromhex(opcode) + (-length % 0x10000).to_bytes(2, "big")
+
+
+def test_every_short_branch_has_a_long_equivalent():
+    assert {str(mnemonic).lower() for _, mnemonic in SHORT_BRANCHES} == LONG_BRANCHES.keys()
+    assert {str(mnemonic).lower() for _, mnemonic in LONG_BRANCH_OPCODES} == set(LONG_BRANCHES.values())
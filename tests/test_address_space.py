@@ -0,0 +1,114 @@
+from pytest import raises
+
+from asm68.address_space import AddressSpace, OverlapError, blocks_in_address_order
+
+
+def test_empty_address_space_has_zero_length():
+    space = AddressSpace()
+    assert len(space) == 0
+
+
+def test_empty_address_space_has_no_start_or_stop():
+    space = AddressSpace()
+    assert space.start is None
+    assert space.stop is None
+
+
+def test_iteration_is_in_address_order():
+    space = AddressSpace({
+        0x50: b'World',
+        0x10: b'Hello',
+        0x30: b'There',
+    })
+    assert list(space) == [0x10, 0x30, 0x50]
+
+
+def test_start_and_stop_span_all_blocks():
+    space = AddressSpace({
+        0x50: b'World',
+        0x10: b'Hello',
+    })
+    assert space.start == 0x10
+    assert space.stop == 0x55
+
+
+def test_compares_equal_to_dict():
+    blocks = {0x10: b'Hello', 0x50: b'World'}
+    assert AddressSpace(blocks) == blocks
+
+
+def test_overlap_with_previous_block_raises_overlap_error():
+    space = AddressSpace({0x10: b'Hello'})
+    with raises(OverlapError) as exc_info:
+        space.insert(0x14, b'World')
+    assert exc_info.value.start == 0x14
+    assert exc_info.value.stop == 0x19
+    assert exc_info.value.existing_start == 0x10
+    assert exc_info.value.existing_stop == 0x15
+
+
+def test_overlap_with_next_block_raises_overlap_error():
+    space = AddressSpace({0x10: b'Hello'})
+    with raises(OverlapError) as exc_info:
+        space.insert(0x0C, b'World')
+    assert exc_info.value.existing_start == 0x10
+
+
+def test_overlap_error_is_a_value_error():
+    with raises(ValueError):
+        AddressSpace({0x10: b'Hello', 0x11: b'World'})
+
+
+def test_adjacent_blocks_do_not_overlap():
+    space = AddressSpace({0x10: b'Hello', 0x15: b'World'})
+    assert len(space) == 2
+
+
+def test_negative_block_address_raises_value_error():
+    with raises(ValueError):
+        AddressSpace({-1: b'Hello'})
+
+
+def test_block_containing_address_within_block():
+    space = AddressSpace({0x10: b'Hello', 0x30: b'World'})
+    assert space.block_containing(0x34) == 0x30
+
+
+def test_block_containing_address_in_gap_is_none():
+    space = AddressSpace({0x10: b'Hello', 0x30: b'World'})
+    assert space.block_containing(0x15) is None
+
+
+def test_block_containing_address_before_first_block_is_none():
+    space = AddressSpace({0x10: b'Hello'})
+    assert space.block_containing(0x0F) is None
+
+
+def test_overlapping_blocks_in_range():
+    space = AddressSpace({0x10: b'Hello', 0x30: b'World', 0x50: b'Again'})
+    assert space.overlapping(0x12, 0x31) == [0x10, 0x30]
+
+
+def test_overlapping_blocks_in_gap_is_empty():
+    space = AddressSpace({0x10: b'Hello', 0x30: b'World'})
+    assert space.overlapping(0x15, 0x30) == []
+
+
+def test_limit_is_start_of_next_block():
+    space = AddressSpace({0x10: b'Hello', 0x30: b'World'})
+    assert space.limit(0x10) == 0x30
+
+
+def test_limit_after_last_block_is_none():
+    space = AddressSpace({0x10: b'Hello', 0x30: b'World'})
+    assert space.limit(0x30) is None
+
+
+def test_blocks_in_address_order_of_address_space():
+    space = AddressSpace({0x20: b'\x02', 0x10: b'\x01'})
+    assert list(blocks_in_address_order(space)) == [(0x10, b'\x01'), (0x20, b'\x02')]
+
+
+def test_blocks_in_address_order_of_dict():
+    blocks = {0x20: b'\x02', 0x10: b'\x01'}
+    assert list(blocks_in_address_order(blocks)) == [(0x10, b'\x01'), (0x20, b'\x02')]
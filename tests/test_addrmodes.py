@@ -4,6 +4,7 @@ from hypothesis.strategies import integers, sets, sampled_from, one_of, lists, j
 
 from asm68.addrmodes import (PageDirect, ExtendedDirect, ExtendedIndirect, Inherent, Immediate, Registers, Indexed,
                              Relative8, Integers, Relative16)
+from asm68.label import Label
 from asm68.registers import REGISTERS, INDEX_REGISTERS, ACCUMULATORS, X, AutoIncrementedRegister
 from helpers.predicates import check_balanced
 
@@ -316,7 +317,6 @@ def test_relative8_equal_hash(offset):
     assert hash(Relative8(offset)) == hash(Relative8(offset))
 
 
-
 @given(offset=integers(min_value=0x0000, max_value=0xFFFF))
 def test_relative16_value(offset):
     assert Relative16(offset).offset == offset
@@ -368,6 +368,16 @@ def test_items_are_integers():
     with raises(TypeError):
         Integers(["hello"])
 
+def test_items_are_integers_after_the_first():
+    with raises(TypeError):
+        Integers([1, 2, "hello"])
+
+def test_integers_without_labels():
+    assert not Integers((1, 2, 3)).has_labels
+
+def test_integers_with_labels():
+    assert Integers((1, Label("L"), 3)).has_labels
+
 @given(items=lists(elements=integers(min_value=0x0000, max_value=0xFFFF), min_size=1))
 def test_integers_repr(items):
     r = repr(Integers(items))
@@ -390,4 +400,20 @@ def test_integers_inequality_different_types(items):
 
 @given(items=lists(elements=integers(min_value=0x0000, max_value=0xFFFF), min_size=1))
 def test_integers_equal_hash(items):
-    assert hash(Integers(items)) == hash(Integers(items))
\ No newline at end of file
+    assert hash(Integers(items)) == hash(Integers(items))
+
+def test_operands_have_no_instance_dict():
+    operands = (
+        Inherent(),
+        Immediate(0x12),
+        Registers((X,)),
+        PageDirect(0x12),
+        ExtendedDirect(0x1234),
+        ExtendedIndirect(0x1234),
+        Indexed(X, 0),
+        Relative8(0x12),
+        Relative16(0x1234),
+        Integers((1, 2)),
+    )
+    for operand in operands:
+        assert not hasattr(operand, '__dict__')
@@ -4,7 +4,8 @@ from hypothesis.strategies import lists, integers, binary
 from pytest import raises
 
 from asm68.addrmodes import Immediate, Inherent, PageDirect, ExtendedDirect, ExtendedIndirect, Registers, Indexed
-from asm68.asmdsl import AsmDsl, statements, statement_index, parse_operand, parse_indirect_operand
+from asm68.asmdsl import (AsmDsl, statements, statement_index, parse_operand, parse_indirect_operand,
+                          operand_cache_info)
 from asm68.instructions import AbX, LdA, AddA, AddB, Inc, Tfr, PshS
 from asm68.label import Label
 from asm68.mnemonics import ABX, LDA, ADDB, ADDA, INC, ASLA, ASRA, LSRA, TFR, PSHS, Mnemonic
@@ -329,3 +330,91 @@ def test_i16_operand():
 def test_i32_operand():
     assert parse_operand(I32(0x45671234)) == Immediate(0x45671234, 4)
 
+
+
+def test_inherent_operand_is_a_singleton():
+    assert parse_operand(None) is Inherent()
+
+
+def test_repeated_operands_are_interned():
+    assert parse_operand(0x42) is parse_operand(0x42)
+    assert parse_operand({0x42}) is parse_operand({0x42})
+    assert parse_operand({0x4242}) is parse_operand({0x4242})
+    assert parse_operand([{0x4242}]) is parse_operand([{0x4242}])
+    assert parse_operand({0: X}) is parse_operand({0: X})
+    assert parse_operand((A, B)) is parse_operand((A, B))
+
+
+def test_interned_operands_distinguish_types():
+    assert parse_operand(True) is not parse_operand(1)
+
+
+def test_label_operands_are_not_interned():
+    asm = AsmDsl()
+    assert parse_operand({asm.START}) is not parse_operand({asm.START})
+
+
+def test_operand_cache_info_reports_hits():
+    parse_operand(0x43)
+    hits_before = operand_cache_info()["Immediate"].hits
+    parse_operand(0x43)
+    assert operand_cache_info()["Immediate"].hits == hits_before + 1
+
+
+def test_repeat_appends_repetitions_of_a_statement():
+    asm = AsmDsl()
+    asm.repeat(3, LDA, 0x42, "Load")
+    assert statements(asm) == (LdA(Immediate(0x42), "Load"),) * 3
+
+
+def test_repeat_labels_only_the_first_repetition():
+    asm = AsmDsl()
+    asm.repeat(3, ABX, label=asm.START)
+    s = statements(asm)
+    assert s[0] == AbX(Inherent(), label=Label("START"))
+    assert s[1:] == (AbX(Inherent()),) * 2
+    assert statement_index(asm, "START") == 0
+
+
+def test_repeat_zero_times_appends_nothing():
+    asm = AsmDsl()
+    asm.repeat(0, ABX, label=asm.START)
+    assert statements(asm) == ()
+
+
+def test_repeat_negative_count_raises_value_error():
+    asm = AsmDsl()
+    with raises(ValueError):
+        asm.repeat(-1, ABX)
+
+
+def test_extend_matches_individual_statements():
+    shapes = [
+        (ABX,),
+        (LDA, 0x42),
+        (LDA, {0x42}),
+        (LDA, {0x4242}, "Extended"),
+        (LDA, {0: X}),
+        (TFR, (A, B)),
+        (ABX,),
+        (LDA, 0x42),
+    ]
+    individual = AsmDsl()
+    for shape in shapes:
+        individual(*shape)
+    bulk = AsmDsl()
+    bulk.extend(shapes)
+    assert statements(bulk) == statements(individual)
+
+
+def test_extend_distinguishes_operands_of_different_types():
+    asm = AsmDsl()
+    asm.extend([(LDA, 1), (LDA, {1}), (LDA, [{1}])])
+    operands = [statement.operand for statement in statements(asm)]
+    assert [type(operand) for operand in operands] == [Immediate, PageDirect, ExtendedIndirect]
+
+
+def test_extend_does_not_reuse_statements_for_equal_operands_of_invalid_type():
+    asm = AsmDsl()
+    with raises(TypeError):
+        asm.extend([(LDA, 1), (LDA, 1.0)])
@@ -3,18 +3,27 @@ from hypothesis import given, assume, example
 from hypothesis.strategies import lists, one_of, integers, sampled_from
 from pytest import raises
 
+import asm68.assembler
+import asm68.cycles
 from asm68.asmdsl import AsmDsl, statements
 from asm68.assembler import (
     assemble,
     assemble_statement,
     assemble_operand,
     TooManyPassesError,
+    Assembler,
+    compile_encoding,
+    BranchOutOfRangeError,
+    OscillationError,
 )
 from asm68.mnemonics import *
 from asm68.registers import B, X, A, Y, INDEX_REGISTERS, U, S, E, D, F, W
 from asm68.twiddle import twos_complement
 from asm68.integers import U8, U16
 from asm68.loghandler import ListLogHandler
+from asm68.address_space import OverlapError
+from asm68.addrmodes import Immediate, ExtendedIndirect, BinaryFile
+from asm68.addrmodecodes import IMM, EXT
 
 
 def test_assemble_unsupported_statement_type_raises_type_error():
@@ -67,6 +76,66 @@ def test_fcb_operand_integers_out_of_range_raises_value_error(items):
         assemble(s)
 
 
+@given(items=lists(min_size=1, elements=integers(min_value=0, max_value=0xFFFF)))
+def test_fdb_encodes_big_endian_words(items):
+    asm = AsmDsl()
+    asm         (   FDB,    tuple(items)            )
+    code = assemble(statements(asm))
+    assert code == {0: b"".join(item.to_bytes(2, byteorder="big") for item in items)}
+
+
+@given(items=lists(min_size=1, elements=one_of(integers(max_value=-1), integers(min_value=0x10000))))
+def test_fdb_operand_integers_out_of_range_raises_value_error(items):
+    asm = AsmDsl()
+    asm         (   FDB,    (0x1234,) + tuple(items)        )
+    with raises(ValueError, match=r'FDB value -?\d+ \(0x-?[0-9a-f]+\) not in 0–65535'):
+        assemble(statements(asm))
+
+
+def test_fdb_with_labels_and_integers():
+    asm = AsmDsl()
+    asm         (   ORG,    0x1000                          )
+    asm .TABLE  (   FDB,    (0x1234, asm.END, asm.TABLE)    )
+    asm .END    (   RTS                                     )
+    assert assemble(statements(asm)) == {0x1000: bytes.fromhex('1234 1006 1000 39')}
+
+
+def test_fcb_with_labels_raises_type_error():
+    asm = AsmDsl()
+    asm .TABLE  (   FCB,    (0x12, asm.TABLE)               )
+    with raises(TypeError):
+        assemble(statements(asm))
+
+
+def counting_fdb_bytes(monkeypatch):
+    encoded = []
+
+    def fdb_bytes(operand):
+        encoded.append(operand)
+        return asm68.assembler.pack_words(operand.items)
+
+    monkeypatch.setattr(asm68.assembler, "fdb_bytes", fdb_bytes)
+    return encoded
+
+
+def test_label_free_fdb_encoding_is_reused(monkeypatch):
+    encoded = counting_fdb_bytes(monkeypatch)
+    asm = AsmDsl()
+    asm         (   FDB,    (0xFACE, 0xCAFE, 0xF00D)        )
+    asm         (   FDB,    (0xFACE, 0xCAFE, 0xF00D)        )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('FACE CAFE F00D') * 2}
+    assert len(encoded) == 1
+
+
+def test_label_free_fdb_encoding_is_not_retained_between_assemblers(monkeypatch):
+    encoded = counting_fdb_bytes(monkeypatch)
+    asm = AsmDsl()
+    asm         (   FDB,    (0xFACE, 0xCAFE, 0xF00D)        )
+    assemble(statements(asm))
+    assemble(statements(asm))
+    assert len(encoded) == 2
+
+
 def test_label_reuse_raises_runtime_error():
     asm = AsmDsl()
     asm        (   LDA,    {0x40},     "GET FIRST OPERAND"         )
@@ -847,3 +916,710 @@ def test_unreferenced_label_reports_error():
     logger.addHandler(handler)
     assemble(statements(asm), logger=logger)
     assert handler.messages[0] == 'Unreferenced label: UNUSED'
+
+
+def test_second_pass_only_reencodes_statements_with_forward_references():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm .START  (   NOP                                             )
+    for _ in range(100):
+        asm     (   NOP                                             )
+    asm         (   BRA,    asm.END                                 )
+    for _ in range(10):
+        asm     (   NOP                                             )
+    asm .END    (   JMP,    {asm.START}                             )
+
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    # The second pass re-runs the ORG and re-encodes only the forward branch
+    assert assembler.encoded_statement_counts == (114, 2)
+    code = assembler.object_code()
+    assert code[0x100][101:] == bytes.fromhex(
+        '20 0A'
+        '12 12 12 12 12 12 12 12 12 12'
+        '7E 0100'
+    )
+
+
+def test_forward_referenced_label_is_not_reported_as_unreferenced():
+    asm = AsmDsl()
+    asm         (   BRA,    asm.DONE                                )
+    asm .DONE   (   SWI                                             )
+
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    assert assembler.unreferenced_labels == set()
+
+
+def test_compile_encoding_for_immediate_operand():
+    opcode_key, opcode_bytes, encoder = compile_encoding(LDA.key, Immediate)
+    assert opcode_key == IMM
+    assert opcode_bytes == bytes.fromhex('86')
+    assert encoder == Assembler.assemble_immediate_operand
+
+
+def test_compile_encoding_for_unsupported_operand_type_is_none():
+    assert compile_encoding(INC.key, ExtendedIndirect) is None
+
+
+def test_origin_within_non_zero_based_fragment_raises_overlap_error():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   LDX,    0x1234                                  )
+    asm         (   ORG,    0x102                                   )
+    asm         (   NOP                                             )
+    with raises(OverlapError):
+        assemble(statements(asm))
+
+
+def test_code_extending_into_existing_fragment_raises_overlap_error():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   NOP                                             )
+    asm         (   ORG,    0xFE                                    )
+    asm         (   LDX,    0x1234                                  )
+    with raises(OverlapError) as exc_info:
+        assemble(statements(asm))
+    assert exc_info.value.existing_start == 0x100
+
+
+def test_adjacent_fragments_are_separate_blocks():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   NOP                                             )
+    asm         (   ORG,    0x101                                   )
+    asm         (   SWI                                             )
+    code = assemble(statements(asm))
+    assert code == {0x100: bytes.fromhex('12'), 0x101: bytes.fromhex('3F')}
+
+
+def test_object_code_blocks_are_views_of_a_single_image():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   NOP                                             )
+    asm         (   ORG,    0x200                                   )
+    asm         (   SWI                                             )
+
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    code = assembler.object_code()
+    assert isinstance(code[0x100], memoryview)
+    assert code[0x100].obj is code[0x200].obj
+
+
+def test_code_beyond_end_of_address_space_raises_value_error():
+    asm = AsmDsl()
+    asm         (   ORG,    0xFFFF                                  )
+    asm         (   LDX,    0x1234                                  )
+    with raises(ValueError):
+        assemble(statements(asm))
+
+
+def test_stats_record_each_pass():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   BRA,    asm.END                                 )
+    asm         (   NOP                                             )
+    asm .END    (   SWI                                             )
+
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    passes = assembler.stats.passes
+    assert [p.number for p in passes] == [1, 2]
+    assert [p.num_statements for p in passes] == [4, 4]
+    assert [p.num_encoded for p in passes] == [4, 2]
+    assert [p.num_bytes for p in passes] == [4, 4]
+    assert [p.num_unresolved_labels for p in passes] == [0, 0]
+    assert assembler.stats.statement_durations == {}
+
+
+def test_profiled_stats_record_statement_types_and_macros():
+    def two_nops(asm):
+        return statements_of(NOP, NOP)
+
+    def statements_of(*mnemonics):
+        body = AsmDsl()
+        for mnemonic in mnemonics:
+            body(mnemonic)
+        return statements(body)
+
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   FCB,    (1, 2, 3)                               )
+    asm         (   CALL,   two_nops                                )
+    asm         (   CALL,   two_nops                                )
+    asm         (   SWI                                             )
+
+    assembler = Assembler(profile=True)
+    assembler.assemble(statements(asm))
+    stats = assembler.stats
+    assert stats.statement_counts == {"Org": 1, "Fcb": 1, "Call": 2, "Instruction": 1}
+    assert stats.macro_counts == {two_nops.__qualname__: 2}
+    assert stats.macro_durations[two_nops.__qualname__] > 0
+
+
+def count_encodings(monkeypatch):
+    encoded = []
+    encode_instruction = asm68.assembler.encode_instruction
+
+    def counting_encode_instruction(statement, asm):
+        encoded.append(statement)
+        return encode_instruction(statement, asm)
+
+    monkeypatch.setattr(asm68.assembler, "encode_instruction", counting_encode_instruction)
+    return encoded
+
+
+def test_equal_label_free_instructions_in_macros_are_encoded_once(monkeypatch):
+    encoded = count_encodings(monkeypatch)
+    body = AsmDsl()
+    body        (   LDA,    0x41                                    )
+    body        (   STA,    {0x42}                                  )
+
+    asm = AsmDsl()
+    asm         (   BRA,    asm.END                                 )
+    asm         (   CALL,   lambda a: statements(body)              )
+    asm         (   CALL,   lambda a: statements(body)              )
+    asm .END    (   NOP                                             )
+
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    assert len(assembler.encoded_statement_counts) == 2
+    assert assembler.object_code() == {0: bytes.fromhex('20 08 86 41 97 42 86 41 97 42 12')}
+    assert [str(statement.mnemonic) for statement in encoded].count("LDA") == 1
+
+
+def test_equal_label_dependent_instructions_are_encoded_at_each_position(monkeypatch):
+    encoded = count_encodings(monkeypatch)
+    asm = AsmDsl()
+    asm .LOOP   (   BRA,    asm.LOOP                                )
+    asm         (   BRA,    asm.LOOP                                )
+    asm         (   LDX,    asm.LOOP                                )
+    asm         (   LDX,    asm.LOOP                                )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('20 FE 20 FC 8E 0000 8E 0000')}
+    assert len(encoded) == 4
+
+
+def test_fill_emits_repeated_byte():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   NOP                                             )
+    asm         (   FILL,   (0xFF, 4)                               )
+    asm         (   SWI                                             )
+    code = assemble(statements(asm))
+    assert code == {0x100: bytes.fromhex('12 FFFFFFFF 3F')}
+
+
+def test_fill_value_out_of_range_raises_value_error():
+    asm = AsmDsl()
+    asm         (   FILL,   (0x100, 4)                              )
+    with raises(ValueError):
+        assemble(statements(asm))
+
+
+def test_fill_with_single_integer_raises_type_error():
+    asm = AsmDsl()
+    asm         (   FILL,   (0xFF,)                                 )
+    with raises(TypeError):
+        assemble(statements(asm))
+
+
+def test_rmb_reserves_space_outside_the_object_code():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   NOP                                             )
+    asm         (   RMB,    0x10                                    )
+    asm .AFTER  (   LDX,    asm.AFTER                               )
+    code = assemble(statements(asm))
+    assert code == {0x100: bytes.fromhex('12'), 0x111: bytes.fromhex('8E 0111')}
+
+
+def test_ds_is_equivalent_to_rmb():
+    rmb = AsmDsl()
+    rmb         (   RMB,    0x10                                    )
+    rmb         (   NOP                                             )
+    ds = AsmDsl()
+    ds          (   DS,     0x10                                    )
+    ds          (   NOP                                             )
+    assert assemble(statements(ds)) == assemble(statements(rmb)) == {0x10: bytes.fromhex('12')}
+
+
+def test_rmb_into_existing_fragment_raises_overlap_error():
+    asm = AsmDsl()
+    asm         (   ORG,    0x200                                   )
+    asm         (   NOP                                             )
+    asm         (   ORG,    0x1F0                                   )
+    asm         (   RMB,    0x20                                    )
+    with raises(OverlapError):
+        assemble(statements(asm))
+
+
+def test_align_reserves_space_up_to_boundary():
+    asm = AsmDsl()
+    asm         (   ORG,    0x101                                   )
+    asm         (   NOP                                             )
+    asm         (   ALIGN,  0x10                                    )
+    asm         (   SWI                                             )
+    code = assemble(statements(asm))
+    assert code == {0x101: bytes.fromhex('12'), 0x110: bytes.fromhex('3F')}
+
+
+def test_align_with_value_fills_up_to_boundary():
+    asm = AsmDsl()
+    asm         (   ORG,    0x10D                                   )
+    asm         (   NOP                                             )
+    asm         (   ALIGN,  (0x10, 0x12)                            )
+    asm         (   SWI                                             )
+    code = assemble(statements(asm))
+    assert code == {0x10D: bytes.fromhex('12 1212 3F')}
+
+
+def test_align_at_boundary_does_not_split_code():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   NOP                                             )
+    asm         (   NOP                                             )
+    asm         (   ALIGN,  2                                       )
+    asm         (   SWI                                             )
+    code = assemble(statements(asm))
+    assert code == {0x100: bytes.fromhex('12 12 3F')}
+
+
+def test_align_to_non_positive_boundary_raises_value_error():
+    asm = AsmDsl()
+    asm         (   ALIGN,  0                                       )
+    with raises(ValueError):
+        assemble(statements(asm))
+
+
+def test_includebin_includes_whole_file(tmp_path):
+    path = tmp_path / "font.bin"
+    path.write_bytes(bytes(range(256)))
+    asm = AsmDsl()
+    asm         (   ORG,        0x1000                                  )
+    asm         (   INCLUDEBIN, path                                    )
+    asm .END    (   SWI                                                 )
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    assert assembler.object_code() == {0x1000: bytes(range(256)) + bytes.fromhex('3F')}
+    assert assembler.label_addresses["END"] == 0x1100
+    assert assembler.included_filepaths == (str(path),)
+
+
+def test_includebin_includes_slice_of_file(tmp_path):
+    path = tmp_path / "font.bin"
+    path.write_bytes(bytes(range(256)))
+    asm = AsmDsl()
+    asm         (   INCLUDEBIN, BinaryFile(str(path), offset=0x10, length=4)    )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('10111213')}
+
+
+def test_includebin_of_empty_file_emits_nothing(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    asm = AsmDsl()
+    asm         (   INCLUDEBIN, path                                    )
+    asm         (   NOP                                                 )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('12')}
+
+
+def test_includebin_beyond_end_of_file_raises_value_error(tmp_path):
+    path = tmp_path / "font.bin"
+    path.write_bytes(bytes(8))
+    asm = AsmDsl()
+    asm         (   INCLUDEBIN, BinaryFile(path, offset=4, length=8)    )
+    with raises(ValueError):
+        assemble(statements(asm))
+
+
+def test_includebin_of_missing_file_raises_file_not_found_error(tmp_path):
+    asm = AsmDsl()
+    asm         (   INCLUDEBIN, tmp_path / "missing.bin"                )
+    with raises(FileNotFoundError):
+        assemble(statements(asm))
+
+
+def test_includebin_with_non_file_operand_raises_type_error():
+    asm = AsmDsl()
+    asm         (   INCLUDEBIN, 0x10                                    )
+    with raises(TypeError):
+        assemble(statements(asm))
+
+
+def test_binary_file_with_negative_offset_raises_value_error():
+    with raises(ValueError):
+        BinaryFile("font.bin", offset=-1)
+
+
+def test_short_branch_out_of_range_raises_branch_out_of_range_error():
+    asm = AsmDsl()
+    asm         (   BNE,    asm.END                                 )
+    asm         (   FILL,   (0x12, 200)                             )
+    asm .END    (   RTS                                             )
+    with raises(BranchOutOfRangeError):
+        assemble(statements(asm))
+
+
+def test_branch_out_of_range_error_is_a_value_error():
+    assert issubclass(BranchOutOfRangeError, ValueError)
+
+
+def test_relaxation_promotes_only_out_of_range_branches():
+    asm = AsmDsl()
+    asm .START  (   BNE,    asm.END                                 )
+    asm         (   BEQ,    asm.NEAR                                )
+    asm .NEAR   (   FILL,   (0x12, 200)                             )
+    asm         (   BRA,    asm.START                               )
+    asm .END    (   RTS                                             )
+    assembler = Assembler(relax=True)
+    assembler.assemble(statements(asm))
+    assert assembler.num_promoted_branches == 2
+    assert assembler.label_addresses["END"] == 0x4 + 0x2 + 200 + 0x3
+    assert assembler.object_code() == {
+        0: bytes.fromhex('1026 00CD 2700') + bytes((0x12,)) * 200 + bytes.fromhex('16 FF2F 39')
+    }
+
+
+def test_relaxation_promotes_branches_pushed_out_of_range_by_other_promotions():
+    asm = AsmDsl()
+    asm         (   BRA,    asm.NEAR                                )
+    asm         (   BNE,    asm.END                                 )
+    asm         (   FILL,   (0x12, 125)                             )
+    asm .NEAR   (   NOP                                             )
+    asm         (   FILL,   (0x12, 200)                             )
+    asm .END    (   RTS                                             )
+    assembler = Assembler(relax=True)
+    assembler.assemble(statements(asm))
+    assert assembler.num_promoted_branches == 2
+    code = assembler.object_code()[0]
+    assert code[:7] == bytes.fromhex('16 0081 1026 0146')
+    assert assembler.label_addresses["NEAR"] == 132
+    assert assembler.label_addresses["END"] == 333
+
+
+def test_relaxation_promotes_branches_in_macros():
+    def far_branch(asm):
+        body = AsmDsl()
+        body    (   NOP                                             )
+        body    (   BRA,    body.FAR                                )
+        return statements(body)
+
+    asm = AsmDsl()
+    asm         (   CALL,   far_branch                              )
+    asm         (   FILL,   (0x12, 200)                             )
+    asm .FAR    (   RTS                                             )
+    assembler = Assembler(relax=True)
+    assembler.assemble(statements(asm))
+    assert assembler.num_promoted_branches == 1
+    assert assembler.object_code()[0][:4] == bytes.fromhex('12 16 00C8')
+
+
+def test_relaxation_leaves_in_range_code_unchanged():
+    asm = AsmDsl()
+    asm .LOOP   (   DECA                                            )
+    asm         (   BNE,    asm.LOOP                                )
+    asm         (   BRA,    asm.END                                 )
+    asm .END    (   RTS                                             )
+    assembler = Assembler(relax=True)
+    assembler.assemble(statements(asm))
+    assert assembler.num_promoted_branches == 0
+    assert assembler.object_code() == assemble(statements(asm))
+
+
+def test_extended_address_within_declared_direct_page_uses_direct_addressing():
+    asm = AsmDsl()
+    asm         (   SETDP,  0x20                                    )
+    asm         (   LDA,    {0x2012}                                )
+    asm         (   STA,    {0x3012}                                )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('96 12 B7 3012')}
+
+
+def test_extended_address_without_setdp_uses_extended_addressing():
+    asm = AsmDsl()
+    asm         (   LDA,    {0x2012}                                )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('B6 2012')}
+
+
+def test_setdp_without_operand_makes_direct_page_unknown():
+    asm = AsmDsl()
+    asm         (   SETDP,  0x20                                    )
+    asm         (   LDA,    {0x2012}                                )
+    asm         (   SETDP                                           )
+    asm         (   LDA,    {0x2012}                                )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('96 12 B6 2012')}
+
+
+def test_explicit_extended_address_in_page_zero_is_not_made_direct():
+    asm = AsmDsl()
+    asm         (   SETDP,  0x00                                    )
+    asm         (   LDA,    {U16(0x0012)}                           )
+    assert assemble(statements(asm)) == {0: bytes.fromhex('B6 0012')}
+
+
+def test_setdp_page_out_of_range_raises_value_error():
+    asm = AsmDsl()
+    asm         (   SETDP,  0x100                                   )
+    with raises(ValueError):
+        assemble(statements(asm))
+
+
+def test_labelled_addresses_within_direct_page_use_direct_addressing():
+    asm = AsmDsl()
+    asm         (   ORG,    0x2000                                  )
+    asm         (   SETDP,  0x20                                    )
+    asm         (   LDA,    {asm.VAR}                               )
+    asm         (   JSR,    {asm.SUB}                               )
+    asm .VAR    (   FCB,    (0,)                                    )
+    asm         (   ORG,    0x3000                                  )
+    asm .SUB    (   STA,    {asm.VAR}                               )
+    asm         (   RTS                                             )
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    assert assembler.label_addresses["VAR"] == 0x2005
+    assert assembler.object_code() == {
+        0x2000: bytes.fromhex('96 05 BD 3000 00'),
+        0x3000: bytes.fromhex('97 05 39'),
+    }
+    assert assembler.stats.num_direct_page_accesses == 2
+    assert assembler.stats.direct_page_bytes_saved == 2
+    assert assembler.stats.direct_page_cycles_saved == 2
+
+
+def test_direct_page_cycles_saved_are_taken_from_the_cycle_tables(monkeypatch):
+    monkeypatch.setitem(asm68.cycles.CYCLES, "ldA", {**asm68.cycles.CYCLES["ldA"], EXT: (7, 4)})
+    asm = AsmDsl()
+    asm         (   SETDP,  0x20                                    )
+    asm         (   LDA,    {0x2010}                                )
+    asm         (   STA,    {0x2011}                                )
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    assert assembler.stats.num_direct_page_accesses == 2
+    assert assembler.stats.direct_page_cycles_saved == 4
+
+
+def test_labelled_address_moving_out_of_direct_page_reverts_to_extended_addressing():
+    asm = AsmDsl()
+    asm         (   ORG,    0x20F0                                  )
+    asm         (   SETDP,  0x20                                    )
+    asm         (   BNE,    asm.FAR                                 )
+    asm         (   LDA,    {asm.VAR}                               )
+    asm         (   FILL,   (0x12, 10)                              )
+    asm .VAR    (   FCB,    (0,)                                    )
+    asm         (   FILL,   (0x12, 200)                             )
+    asm .FAR    (   RTS                                             )
+    assembler = Assembler(relax=True)
+    assembler.assemble(statements(asm))
+    assert assembler.label_addresses["VAR"] == 0x2101
+    assert assembler.object_code()[0x20F0][:7] == bytes.fromhex('1026 00D6 B6 2101')
+    assert assembler.stats.num_direct_page_accesses == 0
+
+
+def test_listing_records_the_address_and_code_of_each_statement_in_the_final_pass():
+    def two_nops(asm):
+        body = AsmDsl()
+        body    (   NOP                                             )
+        body    (   NOP                                             )
+        return statements(body)
+
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   BRA,    asm.END                                 )
+    asm         (   CALL,   two_nops                                )
+    asm         (   RMB,    2                                       )
+    asm .END    (   SWI                                             )
+    assembler = Assembler(listing=True)
+    assembler.assemble(statements(asm))
+    listing = assembler.listing
+    assert [entry.address for entry in listing] == [0x000, 0x100, 0x102, 0x103, 0x104, 0x106]
+    assert [entry.code for entry in listing] == [
+        b'', bytes.fromhex('20 04'), bytes.fromhex('12'), bytes.fromhex('12'), b'', bytes.fromhex('3F'),
+    ]
+    assert [str(entry.statement.mnemonic) for entry in listing] == ["ORG", "BRA", "NOP", "NOP", "RMB", "SWI"]
+
+
+def test_listing_is_none_when_disabled():
+    assembler = Assembler()
+    assembler.assemble(statements(AsmDsl()))
+    assert assembler.listing is None
+
+
+def make_forward_references():
+    asm = AsmDsl()
+    asm         (   ORG,    0x1000                                  )
+    asm .START  (   LDX,    asm.TABLE                               )
+    asm         (   JSR,    {asm.SUB}                               )
+    asm         (   BNE,    asm.SUB                                 )
+    asm         (   LBRA,   asm.END                                 )
+    asm .SUB    (   LDA,    {0:X}                                   )
+    asm         (   BEQ,    asm.START                               )
+    asm         (   RTS                                             )
+    asm .TABLE  (   FDB,    (asm.START, asm.END, 0x1234)            )
+    asm .END    (   SWI                                             )
+    return asm
+
+
+def test_backpatching_assembles_forward_references_in_a_single_pass():
+    asm = make_forward_references()
+    assembler = Assembler(backpatch=True)
+    assembler.assemble(statements(asm))
+    assert assembler.stats.num_passes == 1
+    assert assembler.num_fixups == 5
+    assert assembler.object_code() == {0x1000: assemble(statements(asm))[0x1000]}
+
+
+def test_backpatching_patches_forward_references_in_macros():
+    def forward_jump(asm):
+        body = AsmDsl()
+        body    (   JMP,    {body.END}                              )
+        return statements(body)
+
+    asm = AsmDsl()
+    asm         (   CALL,   forward_jump                            )
+    asm         (   NOP                                             )
+    asm .END    (   RTS                                             )
+    assembler = Assembler(backpatch=True)
+    assembler.assemble(statements(asm))
+    assert assembler.stats.num_passes == 1
+    assert assembler.object_code()[0] == bytes.fromhex('7E 0004 12 39')
+
+
+def test_backpatching_undefined_label_raises_too_many_passes_error():
+    asm = AsmDsl()
+    asm         (   BRA,    asm.NOWHERE                             )
+    with raises(TooManyPassesError) as e:
+        Assembler(backpatch=True).assemble(statements(asm))
+    assert e.value.unresolved_label_names == ["NOWHERE"]
+
+
+def test_backpatching_forward_branch_out_of_range_raises_branch_out_of_range_error():
+    asm = AsmDsl()
+    asm         (   BNE,    asm.FAR                                 )
+    asm         (   FILL,   (0, 200)                                )
+    asm .FAR    (   RTS                                             )
+    with raises(BranchOutOfRangeError):
+        Assembler(backpatch=True).assemble(statements(asm))
+
+
+def test_backpatching_with_relaxation_promotes_forward_branches_out_of_range():
+    asm = AsmDsl()
+    asm         (   BNE,    asm.FAR                                 )
+    asm         (   BEQ,    asm.NEAR                                )
+    asm .NEAR   (   FILL,   (0, 200)                                )
+    asm .FAR    (   RTS                                             )
+    relaxed = Assembler(relax=True)
+    relaxed.assemble(statements(asm))
+    backpatched = Assembler(relax=True, backpatch=True)
+    backpatched.assemble(statements(asm))
+    assert backpatched.num_promoted_branches == 1
+    assert backpatched.object_code() == relaxed.object_code()
+
+
+def test_backpatching_forward_references_into_the_direct_page_use_extended_addressing():
+    asm = AsmDsl()
+    asm         (   ORG,    0x2000                                  )
+    asm         (   SETDP,  0x20                                    )
+    asm .BACK   (   LDA,    {asm.VAR}                               )
+    asm         (   STA,    {asm.BACK}                              )
+    asm .VAR    (   FCB,    (0,)                                    )
+    assembler = Assembler(backpatch=True)
+    assembler.assemble(statements(asm))
+    assert assembler.stats.num_passes == 1
+    assert assembler.object_code() == {0x2000: bytes.fromhex('B6 2005 97 00 00')}
+
+
+def test_unresolved_labels_are_those_referenced_but_not_defined():
+    asm = AsmDsl()
+    asm .UNUSED (   BEQ,    asm.CHBLK                               )
+    assembler = Assembler()
+    with raises(TooManyPassesError):
+        assembler.assemble(statements(asm))
+    assert assembler.unresolved_labels == {"CHBLK"}
+    assert assembler.unreferenced_labels == {"UNUSED"}
+
+
+def test_undefined_label_stops_assembly_once_label_addresses_stop_changing():
+    asm = AsmDsl()
+    asm         (   BEQ,    asm.CHBLK                               )
+    with raises(TooManyPassesError) as exc_info:
+        Assembler(max_passes=10).assemble(statements(asm))
+    assert exc_info.value.num_passes == 2
+    assert not isinstance(exc_info.value, OscillationError)
+
+
+def test_labels_moving_but_only_referenced_after_definition_need_no_further_pass():
+    asm = AsmDsl()
+    asm         (   ORG,    0x2000                                  )
+    asm         (   SETDP,  0x20                                    )
+    asm         (   LDA,    {asm.VAR}                               )
+    asm .LOOP   (   NOP                                             )
+    asm         (   BRA,    asm.LOOP                                )
+    asm         (   ORG,    0x2080                                  )
+    asm .VAR    (   FCB,    (0,)                                    )
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    assert assembler.num_passes == 2
+    assert assembler.label_addresses["LOOP"] == 0x2002
+    assert assembler.object_code() == {
+        0x2000: bytes.fromhex('96 80 12 20 FD'),
+        0x2080: bytes.fromhex('00'),
+    }
+
+
+def test_max_passes_is_configurable():
+    asm = AsmDsl()
+    asm         (   BRA,    asm.END                                 )
+    asm .END    (   NOP                                             )
+    with raises(TooManyPassesError):
+        Assembler(max_passes=1).assemble(statements(asm))
+    assembler = Assembler(max_passes=1)
+    assembler.assemble(statements(asm), max_passes=2)
+    assert assembler.num_passes == 2
+
+
+def test_assembling_again_with_the_same_assembler_starts_afresh():
+    asm = AsmDsl()
+    asm         (   BRA,    asm.END                                 )
+    asm .END    (   NOP                                             )
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    assembler.assemble(statements(asm))
+    assert assembler.num_passes == 2
+    assert assembler.object_code() == {0: bytes.fromhex('20 00 12')}
+
+
+def test_oscillating_label_addresses_raise_oscillation_error():
+    def oscillator(asm):
+        # Emits padding only when END is near, which moves END away, and vice versa
+        body = AsmDsl()
+        end = asm.label_addresses.get("END")
+        if end is None or end < 0x10:
+            body(   FILL,   (0, 0x20)                               )
+        body    (   FDB,    (body.END,)                             )
+        return statements(body)
+
+    asm = AsmDsl()
+    asm         (   CALL,   oscillator                              )
+    asm .END    (   NOP                                             )
+    with raises(OscillationError) as exc_info:
+        Assembler(max_passes=10).assemble(statements(asm))
+    e = exc_info.value
+    assert isinstance(e, TooManyPassesError)
+    assert e.period == 2
+    assert e.oscillating_labels == {"END": (0x02, 0x22)}
+    assert [(index, sizes) for index, _, sizes in e.oscillating_statements] == [(0, (0x02, 0x22))]
+    assert e.oscillating_label_names == ["END"]
+    assert "END" in str(e)
+
+
+def test_listing_includes_backpatched_forward_references():
+    asm = AsmDsl()
+    asm         (   LDX,    asm.DATA                                )
+    asm         (   JMP,    {asm.END}                               )
+    asm .DATA   (   FCB,    (1,)                                    )
+    asm .END    (   RTS                                             )
+    assembler = Assembler(listing=True, backpatch=True)
+    assembler.assemble(statements(asm))
+    assert assembler.num_passes == 1
+    assert [entry.code for entry in assembler.listing] == [
+        bytes.fromhex('8E 0006'), bytes.fromhex('7E 0007'), bytes.fromhex('01'), bytes.fromhex('39'),
+    ]
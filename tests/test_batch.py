@@ -0,0 +1,156 @@
+import io
+import sys
+import textwrap
+
+from click.testing import CliRunner
+from pytest import raises
+
+from asm68 import api
+from asm68.cli import cli
+
+
+SOURCE = textwrap.dedent('''
+    import os
+    import sys
+    from asm68.asmdsl import AsmDsl
+    from asm68.mnemonics import LDA, SWI
+
+    sys.path.insert(0, os.path.dirname(__file__))
+    try:
+        from batch_helper import VALUE
+    finally:
+        del sys.path[0]
+
+    asm = AsmDsl()
+    asm .START  (   LDA,    VALUE   )
+    asm         (   SWI             )
+''')
+
+FAR_BRANCH_SOURCE = textwrap.dedent('''
+    from asm68.asmdsl import AsmDsl
+    from asm68.mnemonics import BRA, FILL, SWI
+
+    asm = AsmDsl()
+    asm .START  (   BRA,    asm.END     )
+    asm         (   FILL,   (0, 200)    )
+    asm .END    (   SWI                 )
+''')
+
+BROKEN_SOURCE = textwrap.dedent('''
+    raise RuntimeError("Broken module")
+''')
+
+
+def write_source(dirpath, name, value):
+    dirpath.mkdir()
+    (dirpath / "batch_helper.py").write_text(f"VALUE = {value}\n")
+    source_filepath = dirpath / f"{name}.py"
+    source_filepath.write_text(SOURCE)
+    return str(source_filepath)
+
+
+def assemble_single(source_filepath, output_format="bin"):
+    output_file = io.BytesIO()
+    api.asm(source_filepath, output_file, output_format, 1)
+    sys.modules.pop("batch_helper", None)
+    return output_file.getvalue()
+
+
+def test_batch_isolates_imports_of_each_module(tmp_path):
+    first = write_source(tmp_path / "a", "first", 0x12)
+    second = write_source(tmp_path / "b", "second", 0x34)
+    results = api.batch([first, second], str(tmp_path / "out"), jobs=1)
+    assert all(result.succeeded for result in results)
+    assert (tmp_path / "out" / "first.bin").read_bytes() == bytes([0x86, 0x12, 0x3F])
+    assert (tmp_path / "out" / "second.bin").read_bytes() == bytes([0x86, 0x34, 0x3F])
+    assert "batch_helper" not in sys.modules
+
+
+def test_batch_in_parallel_matches_single_assembly(tmp_path):
+    source_filepaths = [write_source(tmp_path / f"d{i}", f"module{i}", i) for i in range(4)]
+    results = api.batch(source_filepaths, str(tmp_path / "out"), output_format="srec", jobs=2)
+    assert [result.source_filepath for result in results] == source_filepaths
+    for result in results:
+        assert result.succeeded
+        with open(result.output_filepath, "rb") as output_file:
+            assert output_file.read() == assemble_single(result.source_filepath, "srec")
+
+
+def test_batch_reports_labels(tmp_path):
+    source_filepath = write_source(tmp_path / "a", "first", 1)
+    result, = api.batch([source_filepath], str(tmp_path / "out"))
+    assert result.label_lines[0] == "START 0000 <unreferenced>"
+
+
+def test_batch_reports_errors_and_continues(tmp_path):
+    broken_filepath = tmp_path / "broken.py"
+    broken_filepath.write_text(BROKEN_SOURCE)
+    source_filepath = write_source(tmp_path / "a", "first", 1)
+    broken, working = api.batch([str(broken_filepath), source_filepath], str(tmp_path / "out"), jobs=1)
+    assert not broken.succeeded
+    assert "Broken module" in broken.error
+    assert not (tmp_path / "out" / "broken.bin").exists()
+    assert working.succeeded
+    assert (tmp_path / "out" / "first.bin").exists()
+
+
+def test_batch_relaxes_branches(tmp_path):
+    source_filepath = tmp_path / "far.py"
+    source_filepath.write_text(FAR_BRANCH_SOURCE)
+    strict, = api.batch([str(source_filepath)], str(tmp_path / "strict"))
+    relaxed, = api.batch([str(source_filepath)], str(tmp_path / "relaxed"), relax=True)
+    assert not strict.succeeded
+    assert relaxed.succeeded
+    assert (tmp_path / "relaxed" / "far.bin").read_bytes()[:3] == bytes([0x16, 0x00, 0xC8])
+
+
+def test_batch_rejects_clashing_output_files(tmp_path):
+    first = write_source(tmp_path / "a", "same", 1)
+    second = write_source(tmp_path / "b", "same", 2)
+    with raises(ValueError):
+        api.batch([first, second], str(tmp_path / "out"))
+
+
+def test_batch_srec_output_has_neutral_extension(tmp_path):
+    source_filepath = write_source(tmp_path / "a", "first", 1)
+    result, = api.batch([source_filepath], str(tmp_path / "out"), output_format="srec")
+    assert result.output_filepath == str(tmp_path / "out" / "first.srec")
+
+
+def test_read_manifest(tmp_path):
+    manifest_filepath = tmp_path / "manifest.txt"
+    manifest_filepath.write_text("# ROM modules\nfirst.py\n\n  sub/second.py  \n")
+    assert api.read_manifest(str(manifest_filepath)) == [
+        str(tmp_path / "first.py"),
+        str(tmp_path / "sub" / "second.py"),
+    ]
+
+
+def test_batch_command(tmp_path):
+    source_filepath = write_source(tmp_path / "a", "first", 1)
+    broken_filepath = tmp_path / "broken.py"
+    broken_filepath.write_text(BROKEN_SOURCE)
+    manifest_filepath = tmp_path / "manifest.txt"
+    manifest_filepath.write_text("broken.py\n")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["batch", source_filepath, "--manifest", str(manifest_filepath),
+         "--output-dir", str(tmp_path / "out"), "--jobs", "1"],
+    )
+    assert result.exit_code == 65
+    assert "START 0000 <unreferenced>" in result.output
+    assert "1 of 2 modules failed to assemble" in result.output
+
+
+def test_batch_command_passes_assembly_options(tmp_path):
+    source_filepath = tmp_path / "far.py"
+    source_filepath.write_text(FAR_BRANCH_SOURCE)
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["batch", str(source_filepath), "--output-dir", str(tmp_path / "out"),
+         "--relax", "--backpatch", "--max-passes", "5"],
+    )
+    assert result.exit_code == 0
+    assert (tmp_path / "out" / "far.bin").read_bytes()[:3] == bytes([0x16, 0x00, 0xC8])
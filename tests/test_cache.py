@@ -0,0 +1,149 @@
+import io
+import sys
+import textwrap
+
+from pytest import fixture
+
+from asm68 import api
+from asm68.asmdsl import AsmDsl, statements
+from asm68.assembler import Assembler
+from asm68.cache import AssemblyCache
+from asm68.mnemonics import NOP, BRA, SWI
+
+
+SOURCE = textwrap.dedent('''
+    import pathlib
+    from asm68.asmdsl import AsmDsl
+    from asm68.mnemonics import LDA, SWI
+    from cached_helper import VALUE
+
+    with open(pathlib.Path(__file__).with_name("imports.log"), "a") as log:
+        log.write("imported\\n")
+
+    asm = AsmDsl()
+    asm .START  (   LDA,    VALUE   )
+    asm         (   SWI             )
+''')
+
+
+@fixture
+def source_dir(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "cached_helper", raising=False)
+    yield tmp_path
+    sys.modules.pop("cached_helper", None)
+
+
+def write_source(tmp_path, value):
+    (tmp_path / "cached_helper.py").write_text(f"VALUE = {value}\n")
+    source_filepath = tmp_path / "program.py"
+    source_filepath.write_text(SOURCE)
+    return str(source_filepath)
+
+
+def assemble_source(source_filepath, cache_dir):
+    output_file = io.BytesIO()
+    api.asm(source_filepath, output_file, "bin", 1, cache_dir=cache_dir)
+    return output_file.getvalue()
+
+
+def num_imports(tmp_path):
+    return (tmp_path / "imports.log").read_text().count("imported")
+
+
+def test_store_and_load_round_trips(tmp_path):
+    asm = AsmDsl()
+    asm         (   BRA,    asm.DONE    )
+    asm .DONE   (   NOP                 )
+    asm .UNUSED (   SWI                 )
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    source_filepath = tmp_path / "program.py"
+    source_filepath.write_text("# Source\n")
+
+    cache = AssemblyCache(str(tmp_path / "cache"))
+    cache.store(str(source_filepath), assembler)
+    cached = cache.load(str(source_filepath))
+
+    assert cached.label_addresses == assembler.label_addresses
+    assert cached.unreferenced_labels == {"UNUSED"}
+    assert cached.object_code() == assembler.object_code()
+
+
+def test_load_without_entry_returns_none(tmp_path):
+    source_filepath = tmp_path / "program.py"
+    source_filepath.write_text("# Source\n")
+    cache = AssemblyCache(str(tmp_path / "cache"))
+    assert cache.load(str(source_filepath)) is None
+
+
+def test_entries_are_keyed_by_options(tmp_path):
+    asm = AsmDsl()
+    asm         (   NOP                 )
+    assembler = Assembler()
+    assembler.assemble(statements(asm))
+    source_filepath = tmp_path / "program.py"
+    source_filepath.write_text("# Source\n")
+
+    cache = AssemblyCache(str(tmp_path / "cache"))
+    cache.store(str(source_filepath), assembler, options={"relax": True})
+    assert cache.load(str(source_filepath)) is None
+    assert cache.load(str(source_filepath), {"relax": True}) is not None
+
+
+def test_assemblies_with_different_max_passes_are_cached_separately(source_dir):
+    tmp_path = source_dir
+    source_filepath = write_source(tmp_path, 0x41)
+    cache_dir = str(tmp_path / "cache")
+    api.assemble_file(source_filepath, cache_dir=cache_dir)
+    api.assemble_file(source_filepath, cache_dir=cache_dir, max_passes=api.DEFAULT_MAX_PASSES + 2)
+    api.assemble_file(source_filepath, cache_dir=cache_dir, max_passes=api.DEFAULT_MAX_PASSES)
+    assert num_imports(tmp_path) == 2
+
+
+def test_unchanged_source_is_not_imported_again(source_dir):
+    tmp_path = source_dir
+    source_filepath = write_source(tmp_path, 0x41)
+    cache_dir = str(tmp_path / "cache")
+    first = assemble_source(source_filepath, cache_dir)
+    second = assemble_source(source_filepath, cache_dir)
+    assert first == second == bytes.fromhex('86 41 3F')
+    assert num_imports(tmp_path) == 1
+
+
+def test_changed_dependency_invalidates_cache(source_dir):
+    tmp_path = source_dir
+    source_filepath = write_source(tmp_path, 0x41)
+    cache_dir = str(tmp_path / "cache")
+    assemble_source(source_filepath, cache_dir)
+    del sys.modules["cached_helper"]
+    (tmp_path / "cached_helper.py").write_text("VALUE = 0x42\n")
+    assert assemble_source(source_filepath, cache_dir) == bytes.fromhex('86 42 3F')
+    assert num_imports(tmp_path) == 2
+
+
+INCLUDING_SOURCE = textwrap.dedent('''
+    import pathlib
+    from asm68.asmdsl import AsmDsl
+    from asm68.mnemonics import INCLUDEBIN, SWI
+
+    with open(pathlib.Path(__file__).with_name("imports.log"), "a") as log:
+        log.write("imported\\n")
+
+    asm = AsmDsl()
+    asm         (   INCLUDEBIN, pathlib.Path(__file__).with_name("font.bin")    )
+    asm         (   SWI                                                         )
+''')
+
+
+def test_changed_included_file_invalidates_cache(tmp_path):
+    (tmp_path / "font.bin").write_bytes(bytes.fromhex('0102'))
+    source_filepath = tmp_path / "program.py"
+    source_filepath.write_text(INCLUDING_SOURCE)
+    cache_dir = str(tmp_path / "cache")
+    assert assemble_source(str(source_filepath), cache_dir) == bytes.fromhex('0102 3F')
+    assert assemble_source(str(source_filepath), cache_dir) == bytes.fromhex('0102 3F')
+    assert num_imports(tmp_path) == 1
+    (tmp_path / "font.bin").write_bytes(bytes.fromhex('0304'))
+    assert assemble_source(str(source_filepath), cache_dir) == bytes.fromhex('0304 3F')
+    assert num_imports(tmp_path) == 2
@@ -0,0 +1,98 @@
+import textwrap
+
+from click.testing import CliRunner
+from pytest import mark, raises
+
+from asm68 import api
+from asm68.cli import cli
+
+
+SOURCE = textwrap.dedent('''
+    from asm68.asmdsl import AsmDsl
+    from asm68.mnemonics import SWI
+
+    asm = AsmDsl()
+    asm .START  (   SWI             )
+''')
+
+FAR_BRANCH_SOURCE = textwrap.dedent('''
+    from asm68.asmdsl import AsmDsl
+    from asm68.mnemonics import BRA, FILL, SWI
+
+    asm = AsmDsl()
+    asm .START  (   BRA,    asm.END     )
+    asm         (   FILL,   (0, 200)    )
+    asm .END    (   SWI                 )
+''')
+
+
+def write_source(tmp_path):
+    source_filepath = tmp_path / "source.py"
+    source_filepath.write_text(SOURCE)
+    return str(source_filepath)
+
+
+@mark.parametrize("option", [["--entry", "START"], ["--record-length", "8"]])
+def test_asm_command_rejects_record_options_with_bin_format(tmp_path, option):
+    source_filepath = write_source(tmp_path)
+    output_filepath = tmp_path / "out.bin"
+    output_filepath.write_bytes(b"existing")
+    result = CliRunner().invoke(cli, ["asm", source_filepath, "--output", str(output_filepath)] + option)
+    assert result.exit_code == 2
+    assert "not supported for bin output" in result.output
+    assert output_filepath.read_bytes() == b"existing"
+
+
+@mark.parametrize("option", [["--entry", "START"], ["--record-length", "8"]])
+def test_batch_command_rejects_record_options_with_bin_format(tmp_path, option):
+    source_filepath = write_source(tmp_path)
+    result = CliRunner().invoke(cli, ["batch", source_filepath, "--output-dir", str(tmp_path / "out")] + option)
+    assert result.exit_code == 2
+    assert "not supported for bin output" in result.output
+    assert not (tmp_path / "out").exists()
+
+
+def test_batch_rejects_entry_with_bin_format(tmp_path):
+    source_filepath = write_source(tmp_path)
+    with raises(ValueError):
+        api.batch([source_filepath], str(tmp_path / "out"), entry="START")
+
+
+@mark.parametrize("format", ["hex", "srec"])
+def test_asm_command_rejects_repeat_with_record_format(tmp_path, format):
+    source_filepath = write_source(tmp_path)
+    result = CliRunner().invoke(
+        cli,
+        ["asm", source_filepath, "--output", str(tmp_path / "out"), "--format", format, "--repeat", "2"],
+    )
+    assert result.exit_code == 2
+    assert f"Repeat 2 is not supported for {format} output" in result.output
+
+
+@mark.parametrize("format", ["hex", "srec"])
+def test_asm_command_reports_unknown_entry_label(tmp_path, format):
+    source_filepath = write_source(tmp_path)
+    result = CliRunner().invoke(
+        cli,
+        ["asm", source_filepath, "--output", str(tmp_path / "out"), "--format", format, "--entry", "MISSING"],
+    )
+    assert result.exit_code == 64
+    assert "MISSING" in result.output
+
+
+def test_asm_command_rejects_repeat_less_than_one(tmp_path):
+    source_filepath = write_source(tmp_path)
+    result = CliRunner().invoke(cli, ["asm", source_filepath, "--output", str(tmp_path / "out.bin"), "--repeat", "0"])
+    assert result.exit_code == 2
+    assert "Repeat 0 is less than one" in result.output
+
+
+def test_asm_command_does_not_report_assembly_errors_as_usage_errors(tmp_path):
+    source_filepath = tmp_path / "far.py"
+    source_filepath.write_text(FAR_BRANCH_SOURCE)
+    result = CliRunner().invoke(
+        cli,
+        ["asm", str(source_filepath), "--output", str(tmp_path / "out.hex"), "--format", "hex", "--entry", "START"],
+    )
+    assert result.exit_code != 64
+    assert isinstance(result.exception, ValueError)
@@ -1,3 +1,5 @@
+import io
+
 from pytest import raises
 
 from asm68.contiguous_bytes import ContiguousBytes
@@ -236,3 +238,51 @@ def test_keys_repr():
     cb = ContiguousBytes(blocks)
     assert repr(cb.keys()) == "RangeSet(start=5, stop=20)"
 
+
+
+def test_to_bytes_respects_default_and_explicit_range():
+    blocks = {
+        5: b'Hello',
+        12: b", World!"
+    }
+    cb = ContiguousBytes(blocks, start=3, stop=22, default=0xFF)
+    assert cb.to_bytes() == b'\xff\xffHello\xff\xff, World!\xff\xff'
+
+
+def test_to_bytes_matches_values():
+    blocks = {
+        5: b'Hello',
+        12: b", World!"
+    }
+    cb = ContiguousBytes(blocks, default=0x20)
+    assert cb.to_bytes() == bytes(cb.values())
+
+
+def test_to_bytes_of_empty_contiguous_bytes_is_empty():
+    cb = ContiguousBytes()
+    assert cb.to_bytes() == b''
+
+
+def test_bytes_conversion():
+    blocks = {5: b'Hello'}
+    cb = ContiguousBytes(blocks)
+    assert bytes(cb) == b'Hello'
+
+
+def test_view_is_read_only():
+    blocks = {5: b'Hello'}
+    cb = ContiguousBytes(blocks)
+    view = cb.view()
+    assert view.readonly
+    assert view == b'Hello'
+
+
+def test_write_to_writes_whole_range():
+    blocks = {
+        5: b'Hello',
+        12: b", World!"
+    }
+    cb = ContiguousBytes(blocks)
+    f = io.BytesIO()
+    assert cb.write_to(f) == 15
+    assert f.getvalue() == b'Hello\x00\x00, World!'
@@ -0,0 +1,185 @@
+from pytest import mark, raises
+
+from asm68.addrmodecodes import DIR, EXT
+from asm68.api import format_cycles
+from asm68.asmdsl import AsmDsl, statements
+from asm68.assembler import Assembler
+from asm68.cycles import (
+    CYCLES,
+    CycleReport,
+    HD6309,
+    MC6809,
+    direct_cycles_saved,
+    indexed_cycles,
+    stack_cycles,
+)
+from asm68.mnemonics import *
+from asm68.opcodes import OPCODES
+from asm68.registers import X, Y, A, B, D
+
+
+def cycle_report(asm, cpu=MC6809, **kwargs):
+    assembler = Assembler(listing=True, **kwargs)
+    assembler.assemble(statements(asm))
+    return CycleReport(assembler.listing, assembler.label_addresses, cpu)
+
+
+def statement_cycles(asm, cpu=MC6809, **kwargs):
+    return [cycles for _, cycles in cycle_report(asm, cpu, **kwargs).statements]
+
+
+def test_cycles_has_the_opcodes_and_addressing_modes_of_every_instruction():
+    assert CYCLES.keys() == OPCODES.keys()
+    for key, modes in OPCODES.items():
+        assert CYCLES[key].keys() == modes.keys(), key
+
+
+@mark.parametrize("post_byte, cycles_6809, cycles_6309", [
+    (0x1F, 1, 1),   # -1,X
+    (0x84, 0, 0),   # ,X
+    (0x80, 2, 1),   # ,X+
+    (0xA1, 3, 2),   # ,Y++
+    (0x86, 1, 1),   # A,X
+    (0x8B, 4, 2),   # D,X
+    (0x88, 1, 1),   # n8,X
+    (0x89, 4, 3),   # n16,X
+    (0x94, 3, 3),   # [,X]
+    (0x9F, 5, 4),   # [n16]
+])
+def test_indexed_cycles(post_byte, cycles_6809, cycles_6309):
+    assert indexed_cycles(post_byte, MC6809) == cycles_6809
+    assert indexed_cycles(post_byte, HD6309) == cycles_6309
+
+
+@mark.parametrize("post_byte", [0x87, 0x8E, 0x8F, 0x90, 0x92])
+def test_indexed_cycles_of_6309_modes_on_6809_raises_value_error(post_byte):
+    with raises(ValueError):
+        indexed_cycles(post_byte, MC6809)
+
+
+def test_indexed_cycles_of_unknown_cpu_raises_value_error():
+    with raises(ValueError):
+        indexed_cycles(0x84, "6800")
+
+
+def test_stack_cycles_counts_bytes_pushed():
+    assert stack_cycles(0x00) == 0
+    assert stack_cycles(0x06) == 2  # A, B
+    assert stack_cycles(0xFF) == 12
+
+
+def test_direct_cycles_saved_is_the_difference_between_extended_and_direct_cycles(monkeypatch):
+    monkeypatch.setitem(CYCLES, "ldA", {**CYCLES["ldA"], EXT: (7, 6)})
+    assert direct_cycles_saved("ldA") == 3
+
+
+def test_direct_cycles_saved_of_6309_instruction_is_counted_on_6309():
+    assert direct_cycles_saved("ldE") == CYCLES["ldE"][EXT][1] - CYCLES["ldE"][DIR][1]
+
+
+def test_cycles_of_each_addressing_mode():
+    asm = AsmDsl()
+    asm         (   NOP                                             )
+    asm         (   LDA,    0x42                                    )
+    asm         (   LDA,    {0x1234}                                )
+    asm         (   LDA,    {0:X}                                   )
+    asm         (   LDA,    {1000:X}                                )
+    asm         (   LDA,    {D:Y}                                   )
+    asm         (   TFR,    (A, B)                                  )
+    asm         (   PSHS,   0x16                                    )
+    asm         (   SWI                                             )
+    assert statement_cycles(asm, MC6809) == [2, 2, 5, 4, 8, 8, 6, 9, 19]
+    assert statement_cycles(asm, HD6309) == [1, 2, 4, 4, 7, 6, 4, 8, 21]
+
+
+def test_directives_take_no_cycles():
+    asm = AsmDsl()
+    asm         (   ORG,    0x100                                   )
+    asm         (   FCB,    (1, 2, 3)                               )
+    asm         (   FDB,    (0x1234,)                               )
+    asm         (   RMB,    4                                       )
+    assert statement_cycles(asm) == [0, 0, 0, 0]
+
+
+def test_cycles_of_direct_page_form_of_extended_addresses():
+    asm = AsmDsl()
+    asm         (   SETDP,  0x12                                    )
+    asm         (   LDA,    {0x1234}                                )
+    asm         (   LDA,    {0x4321}                                )
+    assert statement_cycles(asm) == [0, 4, 5]
+
+
+def test_cycles_of_relaxed_branches_are_those_of_long_branches():
+    asm = AsmDsl()
+    asm .START  (   BNE,    asm.END                                 )
+    asm         (   FILL,   (0, 200)                                )
+    asm .END    (   BNE,    asm.START                               )
+    assert statement_cycles(asm, relax=True) == [6, 0, 6]
+
+
+def test_6309_instruction_on_6809_raises_value_error():
+    asm = AsmDsl()
+    asm         (   INCW                                            )
+    assert statement_cycles(asm, HD6309) == [2]
+    with raises(ValueError):
+        statement_cycles(asm, MC6809)
+
+
+def make_routines():
+    asm = AsmDsl()
+    asm .START  (   LDX,    0x400                                   )  # 3
+    asm         (   LDB,    16                                      )  # 2
+    asm .LOOP   (   LDA,    {0:X}                                   )  # 4
+    asm         (   STA,    {0x10:Y}                                )  # 5
+    asm         (   DECB                                            )  # 2
+    asm         (   BNE,    asm.LOOP                                )  # 3
+    asm         (   BSR,    asm.SUB                                 )  # 7
+    asm         (   BRA,    asm.START                               )  # 3
+    asm .SUB    (   NOP                                             )  # 2
+    asm         (   RTS                                             )  # 5
+    return asm
+
+
+def test_routines_are_delimited_by_labels():
+    report = cycle_report(make_routines())
+    assert [(r.name, r.address, r.cycles) for r in report.routines] == [
+        ("START", 0x0000, 5),
+        ("LOOP", 0x0005, 24),
+        ("SUB", 0x0011, 7),
+    ]
+    assert report.total_cycles == 36
+
+
+def test_loops_extend_from_a_label_to_a_branch_back_to_it():
+    report = cycle_report(make_routines())
+    assert [(loop.name, loop.start, loop.end, loop.cycles) for loop in report.loops] == [
+        ("LOOP", 0x0005, 0x000B, 14),
+        ("START", 0x0000, 0x000F, 29),
+    ]
+
+
+def test_forward_branches_and_subroutine_calls_are_not_loops():
+    asm = AsmDsl()
+    asm .HERE   (   BSR,    asm.HERE                                )
+    asm         (   BEQ,    asm.THERE                               )
+    asm .THERE  (   RTS                                             )
+    assert cycle_report(asm).loops == ()
+
+
+def test_jumps_back_to_a_label_are_loops():
+    asm = AsmDsl()
+    asm .LOOP   (   NOP                                             )
+    asm         (   JMP,    {asm.LOOP}                              )
+    report = cycle_report(asm)
+    assert [(loop.name, loop.cycles) for loop in report.loops] == [("LOOP", 6)]
+
+
+def test_format_cycles():
+    lines = format_cycles(cycle_report(make_routines()))
+    assert lines[0].startswith("Address")
+    assert lines[1].split() == ["0000", "8E", "04", "00", "3", "START:", "LDX", "Immediate(1024,", "None)"]
+    assert "Routine  Address  Cycles" in lines
+    assert lines[-2:] == [
+        "START  0000  000F      29",
+        "LOOP   0005  000B      14",
+    ]
@@ -0,0 +1,59 @@
+import io
+import os
+
+from pytest import raises, mark
+
+from asm68.fileutil import (
+    write_repeated,
+    _write_repeated_mmap,
+    _write_repeated_copy_file_range,
+)
+
+
+def test_write_repeated_to_file_object_without_file_descriptor():
+    f = io.BytesIO()
+    assert write_repeated(f, b'Hello', 3) == 15
+    assert f.getvalue() == b'HelloHelloHello'
+
+
+def test_write_repeated_to_regular_file(tmp_path):
+    path = tmp_path / "image.bin"
+    with open(path, 'wb') as f:
+        assert write_repeated(f, b'Hello', 5) == 25
+    assert path.read_bytes() == b'Hello' * 5
+
+
+def test_write_repeated_to_regular_file_after_existing_content(tmp_path):
+    path = tmp_path / "image.bin"
+    with open(path, 'wb') as f:
+        f.write(b'Header')
+        write_repeated(f, b'Hello', 3)
+        f.write(b'Trailer')
+    assert path.read_bytes() == b'Header' + b'Hello' * 3 + b'Trailer'
+
+
+def test_write_repeated_once(tmp_path):
+    path = tmp_path / "image.bin"
+    with open(path, 'wb') as f:
+        write_repeated(f, b'Hello', 1)
+    assert path.read_bytes() == b'Hello'
+
+
+def test_write_repeated_multiplicity_less_than_one_raises_value_error():
+    with raises(ValueError):
+        write_repeated(io.BytesIO(), b'Hello', 0)
+
+
+def test_write_repeated_mmap(tmp_path):
+    path = tmp_path / "image.bin"
+    path.write_bytes(b'AB')
+    assert _write_repeated_mmap(path, 2, memoryview(b'xyz'), 7) == 23
+    assert path.read_bytes() == b'AB' + b'xyz' * 7
+
+
+@mark.skipif(not hasattr(os, "copy_file_range"), reason="os.copy_file_range is not available")
+def test_write_repeated_copy_file_range(tmp_path):
+    path = tmp_path / "image.bin"
+    path.write_bytes(b'AB')
+    assert _write_repeated_copy_file_range(path, 2, memoryview(b'xyz'), 7) == 23
+    assert path.read_bytes() == b'AB' + b'xyz' * 7
@@ -0,0 +1,89 @@
+import io
+
+from pytest import raises
+
+from asm68.api import export_hex
+from asm68.intel_hex import intel_hex_records, record, DATA, SEGMENT
+
+
+def test_data_record():
+    data = bytes.fromhex('214601360121470136007EFE09D21901')
+    assert record(DATA, 0x0100, data) == ':10010000214601360121470136007EFE09D2190140'
+
+
+def test_empty_code_blocks_yields_only_end_of_file_record():
+    assert list(intel_hex_records({})) == [':00000001FF']
+
+
+def test_block_is_split_into_records_of_record_length():
+    records = list(intel_hex_records({0xC000: bytes(range(5))}, record_length=2))
+    assert records == [
+        ':02C0000000013D',
+        ':02C00200020337',
+        ':01C004000437',
+        ':00000001FF',
+    ]
+
+
+def test_gaps_between_blocks_are_not_filled():
+    records = list(intel_hex_records({0x0000: b'\x12', 0xFFFF: b'\x3F'}))
+    assert records == [
+        ':0100000012ED',
+        ':01FFFF003FC2',
+        ':00000001FF',
+    ]
+
+
+def test_blocks_are_output_in_address_order():
+    records = list(intel_hex_records({0x0010: b'\x3F', 0x0000: b'\x12'}))
+    assert records[0] == ':0100000012ED'
+
+
+def test_linear_start_address_record():
+    records = list(intel_hex_records({}, start_address=0x000000CD))
+    assert records == [':04000005000000CD2A', ':00000001FF']
+
+
+def test_segment_start_address_record():
+    records = list(intel_hex_records({}, start_address=0xC000, address_mode=SEGMENT))
+    assert records == [':040000030000C00039', ':00000001FF']
+
+
+def test_extended_linear_address_record_precedes_data_beyond_64k():
+    records = list(intel_hex_records({0xFFFF: b'\x01\x02'}))
+    assert records == [
+        ':01FFFF000100',
+        ':020000040001F9',
+        ':0100000002FD',
+        ':00000001FF',
+    ]
+
+
+def test_extended_segment_address_record_precedes_data_beyond_64k():
+    records = list(intel_hex_records({0x10000: b'\x01'}, address_mode=SEGMENT))
+    assert records[0] == ':020000021000EC'
+
+
+def test_record_length_out_of_range_raises_value_error():
+    with raises(ValueError):
+        list(intel_hex_records({}, record_length=256))
+
+
+def test_unknown_address_mode_raises_value_error():
+    with raises(ValueError):
+        list(intel_hex_records({}, address_mode="flat"))
+
+
+def test_export_hex_writes_lines():
+    output_file = io.BytesIO()
+    export_hex(output_file, {0x0000: b'\x12'}, start_address=0)
+    assert output_file.getvalue() == (
+        b':0100000012ED\n'
+        b':0400000500000000F7\n'
+        b':00000001FF\n'
+    )
+
+
+def test_export_hex_with_multiplicity_raises_value_error():
+    with raises(ValueError):
+        export_hex(io.BytesIO(), {0x0000: b'\x12'}, 2)
@@ -48,3 +48,6 @@ def test_label_inequality(name_a, name_b):
     assume(name_a != name_b)
     assert Label(name_a) != Label(name_b)
 
+
+def test_label_has_no_instance_dict():
+    assert not hasattr(Label('START'), '__dict__')
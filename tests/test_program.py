@@ -0,0 +1,95 @@
+import pickle
+
+from pytest import raises
+
+from asm68.asmdsl import AsmDsl, statements
+from asm68.assembler import assemble
+from asm68.label import Label
+from asm68.mnemonics import NOP, LDA, BRA, SWI, TFR
+from asm68.program import Program
+from asm68.registers import A, B
+
+
+def make_dsl():
+    asm = AsmDsl()
+    asm .START  (   NOP                 )
+    for _ in range(10):
+        asm     (   LDA,    0x42        )
+        asm     (   NOP                 )
+    asm .LOOP   (   BRA,    asm.START   )
+    asm         (   TFR,    (A, B)      )
+    asm .END    (   SWI                 )
+    return asm
+
+
+def test_program_contains_statements_in_order():
+    asm = make_dsl()
+    assert tuple(asm.program) == statements(asm)
+
+
+def test_repeated_statements_are_stored_once():
+    asm = make_dsl()
+    # NOP, LDA #$42, and each of the four labelled statements
+    assert asm.program.num_distinct_statements == 6
+
+
+def test_indexing():
+    asm = make_dsl()
+    program = asm.program
+    s = statements(asm)
+    assert len(program) == len(s) == 24
+    assert program[0] == s[0]
+    assert program[-1] == s[-1]
+    assert program[5] == s[5]
+
+
+def test_index_out_of_range_raises_index_error():
+    with raises(IndexError):
+        Program()[0]
+
+
+def test_statement_index():
+    program = make_dsl().program
+    assert program.statement_index("START") == 0
+    assert program.statement_index("LOOP") == 21
+    assert program.statement_index("END") == 23
+
+
+def test_missing_statement_index_raises_key_error():
+    with raises(KeyError):
+        make_dsl().program.statement_index("MISSING")
+
+
+def test_slice_is_a_program_with_rebased_labels():
+    asm = make_dsl()
+    program = asm.program[20:]
+    assert isinstance(program, Program)
+    assert tuple(program) == statements(asm)[20:]
+    assert set(program.label_names) == {"LOOP", "END"}
+    assert program.statement_index("LOOP") == 1
+
+
+def test_extending_a_slice_does_not_affect_the_original():
+    asm = make_dsl()
+    program = asm.program[:2]
+    program.extend(asm.program[2:4])
+    assert len(program) == 4
+    assert len(asm.program) == 24
+
+
+def test_programs_built_from_the_same_statements_are_equal():
+    asm = make_dsl()
+    assert Program(statements(asm)) == asm.program
+
+
+def test_pickle_round_trip_replaces_labellers_with_labels():
+    asm = make_dsl()
+    program = pickle.loads(pickle.dumps(asm.program))
+    assert program == asm.program
+    assert type(program[0].label) is Label
+    assert program.statement_index("END") == 23
+
+
+def test_assembling_a_program_matches_assembling_statements():
+    asm = make_dsl()
+    assert assemble(asm.program) == assemble(statements(asm))
@@ -263,3 +263,8 @@ def test_6309_status_register_set():
 
 def test_6309_register_set():
     assert REGISTERS == {X, Y, U, S, A, B, E, F, D, W, Q, DP, CC, MD, PC, V, Z}
+
+
+def test_registers_have_no_instance_dict():
+    assert not hasattr(X, '__dict__')
+    assert not hasattr(X + 1, '__dict__')
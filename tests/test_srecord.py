@@ -0,0 +1,96 @@
+import io
+
+from pytest import mark, raises
+
+from asm68.api import export_srec
+from asm68.srecord import srecords, record
+
+
+def test_header_record():
+    assert record(0, 0, 2, b'HDR') == 'S00600004844521B'
+
+
+def test_data_record():
+    data = bytes.fromhex('0A0A0D00000000000000000000000000')
+    assert record(1, 0x7AF0, 2, data) == 'S1137AF00A0A0D0000000000000000000000000061'
+
+
+def test_empty_code_blocks():
+    assert list(srecords({})) == [
+        'S0030000FC',
+        'S5030000FC',
+        'S9030000FC',
+    ]
+
+
+def test_block_is_split_into_records_of_record_length():
+    records = list(srecords({0xC000: bytes(range(5))}, record_length=2))
+    assert records == [
+        'S0030000FC',
+        'S105C000000139',
+        'S105C002020333',
+        'S104C0040433',
+        'S5030003F9',
+        'S9030000FC',
+    ]
+
+
+def test_gaps_between_blocks_are_not_filled():
+    records = list(srecords({0x0000: b'\x12', 0xFFFF: b'\x3F'}))
+    assert records[1:3] == [
+        'S104000012E9',
+        'S104FFFF3FBE',
+    ]
+
+
+def test_termination_record_contains_start_address():
+    records = list(srecords({0xC000: b'\x12'}, start_address=0xC000))
+    assert records[-1] == 'S903C0003C'
+
+
+def test_address_size_chosen_from_highest_address():
+    records = list(srecords({0x10000: b'\x12'}))
+    assert records[1].startswith('S2')
+    assert records[-1].startswith('S8')
+
+
+def test_explicit_address_size():
+    records = list(srecords({0x0000: b'\x12'}, address_size=4))
+    assert records[1] == 'S3060000000012E7'
+    assert records[-1].startswith('S7')
+
+
+def test_address_beyond_address_size_raises_value_error():
+    with raises(ValueError):
+        list(srecords({0x10000: b'\x12'}, address_size=2))
+
+
+def test_record_length_out_of_range_raises_value_error():
+    with raises(ValueError):
+        list(srecords({}, record_length=0))
+
+
+@mark.parametrize("address_size, max_record_length", [(2, 252), (3, 251), (4, 250)])
+def test_maximum_record_length_for_address_size(address_size, max_record_length):
+    block = bytes(max_record_length)
+    records = list(srecords({0: block}, record_length=max_record_length, address_size=address_size))
+    assert records[1][2:4] == 'FF'
+    assert len(records[1]) == 4 + 2 * 0xFF
+    with raises(ValueError):
+        list(srecords({0: block}, record_length=max_record_length + 1, address_size=address_size))
+
+
+def test_export_srec_writes_lines():
+    output_file = io.BytesIO()
+    export_srec(output_file, {0x0000: b'\x12'})
+    assert output_file.getvalue() == (
+        b'S0030000FC\n'
+        b'S104000012E9\n'
+        b'S5030001FB\n'
+        b'S9030000FC\n'
+    )
+
+
+def test_export_srec_with_multiplicity_raises_value_error():
+    with raises(ValueError):
+        export_srec(io.BytesIO(), {0x0000: b'\x12'}, 2)
@@ -97,3 +97,8 @@ def test_statement_str():
     abx = Statement.from_mnemonic(ABX)
     s = str(abx)
     assert s == 'AbX(operand=Inherent(), label=None)'
+
+
+def test_instruction_statements_have_no_instance_dict():
+    abx = Statement.from_mnemonic(ABX)
+    assert not hasattr(abx, '__dict__')